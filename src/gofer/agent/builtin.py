@@ -18,6 +18,7 @@ from gofer import collation
 from gofer.agent.decorator import Actions
 from gofer.agent.reporting import loaded
 from gofer.decorators import options
+from gofer.rmi.context import Context
 from gofer.rmi.tracker import Tracker
 from gofer.rmi.criteria import Builder
 from gofer.rmi.dispatcher import Dispatcher
@@ -40,33 +41,67 @@ class Admin(object):
     container = None
 
     @remote
-    def cancel(self, sn=None, criteria=None):
+    def cancel(self, sn=None, criteria=None, progress=0):
         """
         Cancel by serial number or user defined property.
-        :param sn: An RMI serial number.
-        :type sn: str
-        :param criteria: The criteria used to match the
-            *data* property on an RMI request.
-        :type criteria: dict
-        :return: The list of cancelled serial numbers.
-        :rtype: list
+        Lists of serial numbers and criteria are cancelled in one
+        tracker pass and serial numbers not found are ignored.
+        :param sn: An RMI serial number or list of serial numbers.
+        :type sn: (str|list)
+        :param criteria: The criteria (or list of criteria) used to match
+            the *data* property on an RMI request.
+        :type criteria: (dict|list)
+        :param progress: When > 0, the cancelled serial numbers are sent
+            in progress reports containing up to (n) serial numbers.
+        :type progress: int
+        :return: The list of cancelled serial numbers.  When reported
+            using progress, the number of cancelled serial numbers.
+        :rtype: (list|int)
         :raise Exception, on (sn) not found.
         :see: gofer.rmi.criteria
         """
-        sn_list = []
-        cancelled = []
         tracker = Tracker()
-        if sn:
-            sn_list = [sn]
-        if criteria:
-            b = Builder()
-            criteria = b.build(criteria)
-            sn_list = tracker.find(criteria)
-        for sn in sn_list:
+        if isinstance(sn, str) and not criteria:
             _sn = tracker.cancel(sn)
-            if _sn:
-                cancelled.append(_sn)
-        return cancelled
+            cancelled = [_sn] if _sn else []
+        else:
+            sn_list = []
+            if isinstance(sn, str):
+                sn_list.append(sn)
+            elif sn:
+                sn_list.extend(sn)
+            if isinstance(criteria, dict):
+                criteria = [criteria]
+            if criteria:
+                b = Builder()
+                sn_list.extend(tracker.find_all([b.compile(c) for c in criteria]))
+            cancelled = tracker.cancel_all(sn_list)
+        if progress > 0:
+            self.report(cancelled, progress)
+            return len(cancelled)
+        else:
+            return cancelled
+
+    @staticmethod
+    def report(cancelled, size):
+        """
+        Send the cancelled serial numbers in progress reports.
+        Reports are sent directly (not throttled) so that none are coalesced.
+        :param cancelled: The list of cancelled serial numbers.
+        :type cancelled: list
+        :param size: The maximum number of serial numbers in each report.
+        :type size: int
+        """
+        context = Context.current()
+        if context is None or context.progress is None:
+            return
+        progress = context.progress
+        progress.total = len(cancelled)
+        for n in range(0, len(cancelled), size):
+            chunk = cancelled[n:n + size]
+            progress.completed = n + len(chunk)
+            progress.details = dict(cancelled=chunk)
+            progress.send()
 
     @remote
     def echo(self, text):
@@ -137,6 +172,14 @@ class Builtin(object):
     def authenticator(self):
         return self.plugin.authenticator
 
+    @property
+    def accounting(self):
+        return self.plugin.accounting
+
+    @property
+    def throttle(self):
+        return self.plugin.throttle
+
     def provides(self, name):
         """
         Get whether the plugin provides the name.
@@ -34,6 +34,11 @@ from gofer.config import REQUIRED, OPTIONAL, ANY, BOOL, NUMBER, FLOAT
 #      The 'root' package can be used to set the logging level for all
 #      packages.  Eg: root=error.
 #
+# [memory]
+#   freeze
+#      Freeze (gc) the memory layout after plugins are loaded and
+#      disable the cyclic GC in forked processes (0|1).
+#
 
 AGENT_SCHEMA = (
     ('management', REQUIRED,
@@ -46,6 +51,11 @@ AGENT_SCHEMA = (
     ('logging', REQUIRED,
         []
     ),
+    ('memory', OPTIONAL,
+        (
+            ('freeze', OPTIONAL, BOOL),
+        )
+    ),
 )
 
 #
@@ -63,6 +73,17 @@ AGENT_SCHEMA = (
 #      Accept forwarding from.  A comma (,) separated list of plugin names (,=none|*=all).
 #   forward
 #      Forward to.  A comma (,) separated list of plugin names (,=none|*=all).
+#   requires
+#      The (optional) comma (,) separated list of plugin names loaded and started first.
+#   lazy
+#      The (optional) import of the plugin module is deferred until the first request (0|1).
+#      Requires the manifest written when last imported.  Recurring actions do not
+#      run until the first request.  Default: 0.
+#   index
+#      The (optional) comma (,) separated list of RMI request data fields indexed
+#      by the request tracker.
+#   accounting
+#      The (optional) resource usage of forked calls is included in the reply (0|1).
 #
 # [messaging]
 #
@@ -76,6 +97,32 @@ AGENT_SCHEMA = (
 #      The (optional) flag indicates SSL host validation should be performed.
 #   authenticator
 #      The (optional) fully qualified Authenticator to be loaded from the PYTHON path.
+#   keys
+#      The (optional) path to the key file used by the HMAC authenticator.
+#   auth_cache
+#      The (optional) number of validated signatures cached by the authenticator.
+#      Default: 0 (disabled).
+#   prefetch
+#      The (optional) maximum number of unacknowledged messages delivered to the
+#      consumer.  Default: 0 (adapter default).
+#   ack_batch
+#      The (optional) number of messages acknowledged together.  Default: 0 (disabled).
+#   ack_latency
+#      The (optional) maximum time (seconds) a batched message may remain unacknowledged.
+#      Default: 0.5
+#   concurrency
+#      The (optional) number of threads dispatching received requests.  Default: 1.
+#   reconnect_delay
+#      The (optional) base delay (seconds) between connect attempts.  Default: 10.
+#   reconnect_max_delay
+#      The (optional) maximum delay (seconds) between connect attempts.  Default: 90.
+#   compression_level
+#      The (optional) level used to compress replies.  Default: the compressor default.
+#   compression_threshold
+#      The (optional) size (bytes) of the smallest reply compressed.  Default: 65536.
+#   decompression_limit
+#      The (optional) largest size (bytes) of a decompressed request.  Larger requests
+#      are rejected.  0 = unlimited.  Default: 16777216.
 #
 # [model]
 #
@@ -90,6 +137,13 @@ AGENT_SCHEMA = (
 #   expiration
 #      The (optional) auto-deleted queue expiration (seconds).
 #
+# [progress]
+#
+#   interval
+#      The (optional) minimum interval (seconds) between progress reports.  Default: 0 (none).
+#   rate
+#      The (optional) maximum number of progress reports per second.  Default: 10 (0=unlimited).
+#
 
 PLUGIN_SCHEMA = (
     ('main', REQUIRED,
@@ -101,6 +155,10 @@ PLUGIN_SCHEMA = (
             ('latency', OPTIONAL, FLOAT),
             ('accept', OPTIONAL, ANY),
             ('forward', OPTIONAL, ANY),
+            ('requires', OPTIONAL, ANY),
+            ('lazy', OPTIONAL, BOOL),
+            ('index', OPTIONAL, ANY),
+            ('accounting', OPTIONAL, BOOL),
         )
     ),
     ('messaging', REQUIRED,
@@ -111,7 +169,18 @@ PLUGIN_SCHEMA = (
             ('clientkey', OPTIONAL, ANY),
             ('host_validation', OPTIONAL, BOOL),
             ('authenticator', OPTIONAL, ANY),
+            ('keys', OPTIONAL, ANY),
+            ('auth_cache', OPTIONAL, NUMBER),
             ('heartbeat', OPTIONAL, NUMBER),
+            ('prefetch', OPTIONAL, NUMBER),
+            ('ack_batch', OPTIONAL, NUMBER),
+            ('ack_latency', OPTIONAL, FLOAT),
+            ('concurrency', OPTIONAL, NUMBER),
+            ('reconnect_delay', OPTIONAL, FLOAT),
+            ('reconnect_max_delay', OPTIONAL, FLOAT),
+            ('compression_level', OPTIONAL, NUMBER),
+            ('compression_threshold', OPTIONAL, NUMBER),
+            ('decompression_limit', OPTIONAL, NUMBER),
         )
     ),
     ('model', OPTIONAL,
@@ -121,6 +190,12 @@ PLUGIN_SCHEMA = (
             ('expiration', OPTIONAL, NUMBER)
         )
     ),
+    ('progress', OPTIONAL,
+        (
+            ('interval', OPTIONAL, FLOAT),
+            ('rate', OPTIONAL, NUMBER),
+        )
+    ),
 )
 
 
@@ -132,6 +207,9 @@ AGENT_DEFAULTS = {
     },
     'logging': {
     },
+    'memory': {
+        'freeze': '0',
+    },
 }
 
 
@@ -141,13 +219,28 @@ PLUGIN_DEFAULTS = {
         'threads': '1',
         'latency': '0',
         'accept': ',',
-        'forward': ','
+        'forward': ',',
+        'accounting': '0',
+        'lazy': '0'
     },
     'messaging': {
-        'heartbeat': '10'
+        'auth_cache': '0',
+        'heartbeat': '10',
+        'prefetch': '0',
+        'ack_batch': '0',
+        'ack_latency': '0.5',
+        'concurrency': '1',
+        'reconnect_delay': '10',
+        'reconnect_max_delay': '90',
+        'compression_threshold': '65536',
+        'decompression_limit': '16777216'
     },
     'model': {
         'managed': '2'
+    },
+    'progress': {
+        'interval': '0',
+        'rate': '10'
     }
 }
 
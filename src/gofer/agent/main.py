@@ -15,8 +15,10 @@
 
 import sys
 import os
+import socket
 import logging
 
+from threading import Event
 from time import sleep
 from getopt import getopt, GetoptError
 
@@ -24,10 +26,12 @@ from gofer.agent.logutil import LogHandler
 
 LogHandler.install()
 
-from gofer import NAME
+from gofer import NAME, ENCODING
 from gofer.common import Thread, released
 from gofer.config import get_bool
-from gofer.agent.plugin import Plugin, PluginLoader
+from gofer.metrics import Timer
+from gofer.mp import freeze
+from gofer.agent.plugin import Plugin, PluginLoader, Parallel
 from gofer.agent.manager import Manager
 from gofer.agent.lock import Lock, LockFailed
 from gofer.agent.config import AgentConfig
@@ -56,27 +60,70 @@ class ActionThread(Thread):
             sleep(10)
 
 
+def notify(state):
+    """
+    Notify systemd of the agent state.
+    Sent (sd_notify) only when started as a *notify* service.
+    :param state: The state.  Eg: READY=1
+    :type state: str
+    """
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return
+    if address.startswith('@'):
+        address = '\0' + address[1:]
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.connect(address)
+        sock.sendall(state.encode(ENCODING))
+    except socket.error:
+        log.exception(address)
+    finally:
+        sock.close()
+
+
 class Agent(object):
     """
     Gofer (main) agent.
     Starts (2) threads.  A thread to run actions and
     another to monitor/update plugin sessions on the bus.
+    :cvar ATTACH: Seconds to wait for each plugin to attach
+        before the agent is ready.
+    :type ATTACH: float
+    :ivar ready: Set when the plugins have been started (and attached).
+    :type ready: Event
     """
 
     WAIT = None
+    ATTACH = 60
 
     def __init__(self):
         cfg = AgentConfig()
+        self.ready = Event()
+
+    @staticmethod
+    def _start(plugin):
+        """
+        Start the plugin and wait for it to attach.
+        :param plugin: A plugin.
+        :type plugin: Plugin
+        """
+        plugin.start()
+        if not plugin.ready.wait(Agent.ATTACH):
+            log.warning('plugin:%s, not attached in: %d (seconds)', plugin.name, Agent.ATTACH)
 
     def start(self, block=True):
         """
         Start the agent.
+        The manager and actions are started first.  Plugins are started
+        in parallel after the plugins they require.  The agent is ready
+        once all plugins have attached (or timed out).
         :param block: block on spawned threads.
         :type block: bool
         """
         cfg = AgentConfig()
-        for plugin in Plugin.all():
-            plugin.start()
+        timer = Timer()
+        timer.start()
         if get_bool(cfg.management.enabled):
             host = cfg.management.host
             port = int(cfg.management.port)
@@ -84,7 +131,14 @@ class Agent(object):
             manager.start()
         actions = ActionThread()
         actions.start()
-        log.info('agent started.')
+        parallel = Parallel(Plugin.all())
+        parallel(self._start)
+        for name, started in sorted(parallel.timers.items()):
+            log.info('plugin:%s, started in: %s', name, started)
+        timer.stop()
+        self.ready.set()
+        notify('READY=1')
+        log.info('agent started in: %s', timer)
         if block:
             actions.join(self.WAIT)
 
@@ -119,6 +173,9 @@ def start(daemon=True):
         start_daemon(lock)
     try:
         PluginLoader.load_all()
+        cfg = AgentConfig()
+        if get_bool(cfg.memory.freeze):
+            freeze()
         agent = Agent()
         agent.start()
     finally:
@@ -22,22 +22,30 @@ import os
 import sys
 
 from logging import getLogger
-from threading import RLock
+from threading import RLock, Event, Thread
 
 from gofer import Singleton, synchronized, NAME
 from gofer.agent.config import PLUGIN_SCHEMA, PLUGIN_DEFAULTS
 from gofer.agent.decorator import Actions
 from gofer.agent.decorator import Delegate
+from gofer.agent.deplist import DepList
 from gofer.agent.rmi import Scheduler, Task
 from gofer.agent.whiteboard import Whiteboard
 from gofer.common import nvl, mkdir
 from gofer.common import released
+from gofer.compat import json
 from gofer.config import Config, Graph, FileReader, get_bool, get_integer
 from gofer.messaging import Document, Connector, Node, Queue, Exchange
 from gofer.messaging import NotFound
+from gofer.messaging.auth import Hmac, Cache
+from gofer.messaging.consumer import Batch, Pipeline
+from gofer.metrics import Timer
 from gofer.rmi.consumer import RequestConsumer
+from gofer.rmi.context import Throttle
 from gofer.rmi.decorator import Remote
-from gofer.rmi.dispatcher import Dispatcher
+from gofer.rmi.dispatcher import Dispatcher, Return
+from gofer.rmi.model.worker import Worker
+from gofer.rmi.tracker import Tracker
 from gofer.threadpool import ThreadPool
 
 
@@ -47,8 +55,11 @@ log = getLogger(__name__)
 def attach(fn):
     def _fn(plugin):
         def call():
-            if plugin.url and plugin.node:
-                fn(plugin)
+            try:
+                if plugin.url and plugin.node:
+                    fn(plugin)
+            finally:
+                plugin.ready.set()
         plugin.pool.run(call)
     return _fn
 
@@ -188,6 +199,11 @@ class Plugin(object):
     :type authenticator: gofer.messaging.auth.Authenticator
     :ivar consumer: An AMQP request consumer.
     :type consumer: gofer.rmi.consumer.RequestConsumer.
+    :ivar ready: Set when the plugin has been started and attach has completed.
+    :type ready: Event
+    :ivar manifest: The manifest providing the plugin namespaces
+        when the import has been deferred (lazy).
+    :type manifest: Manifest
     """
 
     container = Container()
@@ -245,6 +261,7 @@ class Plugin(object):
         :type path: str
         """
         self.__mutex = RLock()
+        self.__activation = RLock()
         self.path = path
         self.descriptor = descriptor
         self.pool = ThreadPool(int(descriptor.main.threads or 1))
@@ -256,6 +273,8 @@ class Plugin(object):
         self.delegate = Delegate()
         self.authenticator = None
         self.consumer = None
+        self.ready = Event()
+        self.manifest = None
 
     @property
     def name(self):
@@ -273,6 +292,14 @@ class Plugin(object):
     def enabled(self):
         return get_bool(self.cfg.main.enabled)
 
+    @property
+    def lazy(self):
+        return get_bool(self.cfg.main.lazy)
+
+    @property
+    def deferred(self):
+        return self.impl is None and self.manifest is not None
+
     @property
     def connector(self):
         return Connector(self.url)
@@ -294,6 +321,18 @@ class Plugin(object):
         _list = [p.strip() for p in _list.split(',')]
         return set(_list)
 
+    @property
+    def requires(self):
+        _list = self.cfg.main.requires or ''
+        _list = [p.strip() for p in _list.split(',')]
+        return [p for p in _list if p]
+
+    @property
+    def index(self):
+        _list = self.cfg.main.index or ''
+        _list = [p.strip() for p in _list.split(',')]
+        return [p for p in _list if p]
+
     @property
     def is_started(self):
         return self.scheduler.isAlive()
@@ -302,6 +341,40 @@ class Plugin(object):
     def latency(self):
         return float(self.cfg.main.latency)
 
+    @property
+    def accounting(self):
+        return get_bool(self.cfg.main.accounting)
+
+    @property
+    def prefetch(self):
+        return get_integer(self.cfg.messaging.prefetch)
+
+    @property
+    def batch(self):
+        messaging = self.cfg.messaging
+        return Batch(int(messaging.ack_batch), float(messaging.ack_latency))
+
+    @property
+    def pipeline(self):
+        return Pipeline(int(self.cfg.messaging.concurrency))
+
+    @property
+    def compression_level(self):
+        return get_integer(self.cfg.messaging.compression_level)
+
+    @property
+    def compression_threshold(self):
+        return int(self.cfg.messaging.compression_threshold)
+
+    @property
+    def decompression_limit(self):
+        return int(self.cfg.messaging.decompression_limit)
+
+    @property
+    def throttle(self):
+        progress = self.cfg.progress
+        return Throttle(float(progress.interval), int(progress.rate))
+
     @synchronized
     def start(self):
         """
@@ -324,6 +397,7 @@ class Plugin(object):
         - limit messaging repairing
         - shutdown the thread pool.
         - shutdown the scheduler.
+        - stop the worker process.
         :param teardown: Teardown the broker model.
         :type teardown: bool
         :param hard: Abort threads in the pool.
@@ -340,6 +414,7 @@ class Plugin(object):
         pending = self.pool.shutdown(hard=hard)
         self.scheduler.shutdown()
         self.scheduler.join()
+        Worker.release(self)
         return pending
 
     @synchronized
@@ -354,6 +429,8 @@ class Plugin(object):
         connector.ssl.client_key = messaging.clientkey
         connector.ssl.client_certificate = messaging.clientcert
         connector.ssl.host_validation = messaging.host_validation
+        connector.reconnect.delay = float(messaging.reconnect_delay)
+        connector.reconnect.max_delay = float(messaging.reconnect_max_delay)
         connector.add()
 
     @attach
@@ -369,6 +446,10 @@ class Plugin(object):
         node = Node(model.queue)
         consumer = RequestConsumer(node, self)
         consumer.authenticator = self.authenticator
+        consumer.decompression_limit = self.decompression_limit
+        consumer.prefetch = self.prefetch
+        consumer.batch = self.batch
+        consumer.pipeline = self.pipeline
         consumer.start()
         self.consumer = consumer
         log.info('plugin:%s, attached => %s', self.name, self.node)
@@ -380,6 +461,7 @@ class Plugin(object):
         :param teardown: Teardown the broker model.
         :type teardown: bool
         """
+        self.ready.clear()
         if not self.consumer:
             # not attached
             return
@@ -399,16 +481,32 @@ class Plugin(object):
         :return: True if provides.
         :raise: bool
         """
+        if self.deferred:
+            return name in self.manifest
         return self.dispatcher.provides(name)
 
+    def activate(self):
+        """
+        Import the plugin module when the import has been deferred.
+        Serialized using the activation lock rather than the plugin mutex
+        because shutdown() joins the pool threads while holding the mutex.
+        """
+        with self.__activation:
+            if not self.deferred:
+                return
+            PluginLoader.import_(self)
+            self.manifest = None
+            self.delegate.loaded()
+
     def dispatch(self, request):
         """
         Dispatch (invoke) the specified RMI request.
+        The (deferred) plugin module is imported on the first request.
         :param request: An RMI request
         :type request: gofer.Document
         :return: The RMI returned.
         """
-        dispatcher = self.dispatcher
+        target = self
         call = Document(request.request)
         if not self.provides(call.classname):
             for plugin in Plugin.all():
@@ -429,9 +527,14 @@ class Plugin(object):
                 if not valid.intersection(plugin.accept):
                     # (accept) not approved
                     continue
-                dispatcher = plugin.dispatcher
+                target = plugin
                 break
-        return dispatcher.dispatch(request)
+        try:
+            target.activate()
+        except Exception:
+            log.exception('plugin:%s, import failed', target.name)
+            return Return.exception()
+        return target.dispatcher.dispatch(request)
 
     @synchronized
     def load(self):
@@ -439,6 +542,9 @@ class Plugin(object):
         Load the plugin.
         """
         self.delegate.loaded()
+        index = self.index
+        if index:
+            Tracker().index(*index)
         path = self.cfg.messaging.authenticator
         if not path:
             # not configured
@@ -446,7 +552,13 @@ class Plugin(object):
         path = path.split('.')
         mod = '.'.join(path[:-1])
         mod = __import__(mod, {}, {}, [path[-1]])
-        self.authenticator = mod.Authenticator()
+        self.authenticator = getattr(mod, path[-1])()
+        keys = self.cfg.messaging.keys
+        if keys and isinstance(self.authenticator, Hmac):
+            self.authenticator.load(keys)
+        capacity = int(self.cfg.messaging.auth_cache)
+        if capacity > 0:
+            self.authenticator.cache = Cache(capacity)
 
     @synchronized
     def unload(self):
@@ -490,6 +602,93 @@ class Plugin(object):
         return plugin
 
 
+class Parallel(object):
+    """
+    Call a function for each plugin in parallel.
+    The function is called for a plugin after it has returned
+    for the plugins named in the plugin *requires* property.
+    Circular requirements are ignored.
+    :ivar plugins: The plugins sorted by requirements.
+    :type plugins: list
+    :ivar requires: The required plugins by plugin.
+    :type requires: dict
+    :ivar timers: The call timers by plugin name.
+    :type timers: dict
+    """
+
+    def __init__(self, plugins):
+        """
+        :param plugins: A list of plugins.
+        :type plugins: list
+        """
+        index = {p.name: p for p in plugins}
+        deplist = DepList()
+        self.requires = {}
+        for plugin in plugins:
+            required = []
+            for name in plugin.requires:
+                if name in index:
+                    required.append(index[name])
+                else:
+                    log.warning('plugin:%s, requires: %s not-found', plugin.name, name)
+            self.requires[plugin] = required
+            deplist.add((plugin, tuple(required)))
+        self.plugins = [item[0] for item in deplist.sort()]
+        self.timers = {}
+
+    def __call__(self, fn):
+        """
+        Call the function for each plugin.
+        :param fn: A function called with the plugin.
+        :type fn: callable
+        :return: The returned values in sorted order.  None when raised.
+        :rtype: list
+        """
+        threads = []
+        finished = {}
+        returned = {}
+        for plugin in self.plugins:
+            required = [finished[p] for p in self.requires[plugin] if p in finished]
+            finished[plugin] = Event()
+            thread = Thread(
+                target=self.call,
+                name='plugin:%s' % plugin.name,
+                args=(fn, plugin, required, finished[plugin], returned))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        return [returned.get(p) for p in self.plugins]
+
+    def call(self, fn, plugin, required, finished, returned):
+        """
+        Call the function after it has returned for the required plugins.
+        :param fn: A function called with the plugin.
+        :type fn: callable
+        :param plugin: A plugin.
+        :type plugin: Plugin
+        :param required: Events set when returned for the required plugins.
+        :type required: list
+        :param finished: Set when returned.
+        :type finished: Event
+        :param returned: The returned values by plugin.
+        :type returned: dict
+        """
+        try:
+            for event in required:
+                event.wait()
+            timer = Timer()
+            timer.start()
+            returned[plugin] = fn(plugin)
+            timer.stop()
+            self.timers[plugin.name] = timer
+        except Exception:
+            log.exception('plugin:%s', plugin.name)
+        finally:
+            finished.set()
+
+
 class BrokerModel(object):
     """
     Provides AMQP broker model management.
@@ -588,6 +787,83 @@ class PluginDescriptor(Graph):
     ROOT = '/etc/%s/plugins' % NAME
     
 
+class Manifest(object):
+    """
+    The plugin manifest.
+    Written when the plugin module has been imported and used to provide
+    the plugin namespaces when the import is deferred (lazy).  The manifest
+    is valid while the plugin module has not been modified.
+    :cvar PATH: The directory containing manifests.
+    :type PATH: str
+    :ivar path: The manifest path.
+    :type path: str
+    :ivar plugin: The (optional) module configured in the descriptor.
+    :type plugin: str
+    :ivar module: The path of the imported plugin module.
+    :type module: str
+    :ivar mtime: The modification time of the imported plugin module.
+    :type mtime: float
+    :ivar namespaces: The member names by class (and module) name.
+    :type namespaces: dict
+    """
+
+    PATH = '/var/lib/%s/manifests' % NAME
+
+    def __init__(self, plugin):
+        """
+        :param plugin: A plugin.
+        :type plugin: Plugin
+        """
+        self.path = os.path.join(Manifest.PATH, '%s.json' % plugin.name)
+        self.plugin = plugin.descriptor.main.plugin or ''
+        self.module = None
+        self.mtime = 0
+        self.namespaces = {}
+
+    def load(self):
+        """
+        Load the manifest.
+        :return: True when loaded and valid.
+        :rtype: bool
+        """
+        try:
+            with open(self.path) as fp:
+                manifest = json.load(fp)
+            if manifest['plugin'] != self.plugin:
+                return False
+            self.module = manifest['module']
+            self.mtime = manifest['mtime']
+            self.namespaces = manifest['namespaces']
+            return os.path.getmtime(self.module) == self.mtime
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def update(self, plugin):
+        """
+        Update the manifest using the imported plugin.
+        :param plugin: An imported plugin.
+        :type plugin: Plugin
+        """
+        self.module = plugin.impl.__file__
+        self.mtime = os.path.getmtime(self.module)
+        self.namespaces = {
+            name: sorted(m.name for m in ns) for name, ns in plugin.dispatcher.catalog.items()
+        }
+        manifest = dict(
+            plugin=self.plugin,
+            module=self.module,
+            mtime=self.mtime,
+            namespaces=self.namespaces)
+        mkdir(Manifest.PATH)
+        path = '.'.join((self.path, 'tmp'))
+        with open(path, 'w') as fp:
+            json.dump(manifest, fp, sort_keys=True)
+        os.rename(path, self.path)
+
+    def __contains__(self, name):
+        return name in self.namespaces
+
+
 class PluginLoader:
     """
     Agent plugins loader.
@@ -600,14 +876,17 @@ class PluginLoader:
         '/opt/%s/plugins' % NAME,
     ]
 
+    __lock = RLock()
+
     @staticmethod
     def load_all():
         """
         Load all plugins.
+        Plugins are loaded in parallel after the plugins they require.
         :return: A list of loaded plugins.
         :rtype: list
         """
-        loaded = []
+        plugins = []
         root = PluginDescriptor.ROOT
         mkdir(root)
         paths = [os.path.join(root, fn) for fn in os.listdir(root)]
@@ -617,9 +896,15 @@ class PluginLoader:
                 continue
             if os.path.isdir(path):
                 continue
-            plugin = PluginLoader.load(path)
+            plugin = PluginLoader.create(path)
             if plugin:
-                loaded.append(plugin)
+                plugins.append(plugin)
+        timer = Timer()
+        timer.start()
+        loaded = Parallel(plugins)(PluginLoader._load)
+        loaded = [p for p in loaded if p]
+        timer.stop()
+        log.info('plugins: %d loaded in: %s', len(loaded), timer)
         return loaded
 
     @staticmethod
@@ -631,6 +916,20 @@ class PluginLoader:
         :return: The loaded plugin.
         :rtype: Plugin
         """
+        plugin = PluginLoader.create(path)
+        if plugin:
+            plugin = PluginLoader._load(plugin)
+        return plugin
+
+    @staticmethod
+    def create(path):
+        """
+        Create the specified plugin using the descriptor.
+        :param path: A plugin descriptor path.
+        :type path: str
+        :return: The plugin or None when disabled.
+        :rtype: Plugin
+        """
         fn = os.path.basename(path)
         name, _ = os.path.splitext(fn)
         default = dict(main=dict(name=name))
@@ -641,8 +940,6 @@ class PluginLoader:
         if not plugin.enabled:
             log.warning('plugin:%s, DISABLED', plugin.name)
             plugin = None
-        else:
-            plugin = PluginLoader._load(plugin)
         return plugin
 
     @staticmethod
@@ -666,34 +963,74 @@ class PluginLoader:
     @staticmethod
     def _load(plugin):
         """
-        Import a module by file name.
+        Load the plugin.
+        When lazy and the manifest is valid, the import is deferred.
         :param plugin: A plugin to load.
         :type plugin: Plugin
         :return: The loaded plugin.
         :rtype: Plugin
         """
-        Remote.clear()
-        Actions.clear()
         Plugin.add(plugin)
+        timer = Timer()
+        timer.start()
         try:
+            manifest = Manifest(plugin)
+            if plugin.lazy and manifest.load():
+                path = plugin.descriptor.main.plugin
+                if path:
+                    Plugin.add(plugin, path)
+                plugin.manifest = manifest
+                log.info('plugin:%s import deferred using: %s', plugin.name, manifest.path)
+            else:
+                PluginLoader.import_(plugin)
+            plugin.load()
+            timer.stop()
+            log.info('plugin:%s loaded in: %s', plugin.name, timer)
+            return plugin
+        except Exception:
+            log.exception('plugin:%s, import failed', plugin.name)
+            Plugin.delete(plugin)
+
+    @staticmethod
+    def import_(plugin):
+        """
+        Import the plugin module.
+        The decorated functions are collected in (global) collections
+        during import so importing and collating is serialized.
+        The manifest is updated when the plugin is lazy.
+        :param plugin: A plugin to import.
+        :type plugin: Plugin
+        """
+        timer = Timer()
+        timer.start()
+        with PluginLoader.__lock:
+            Remote.clear()
+            Actions.clear()
             path = plugin.descriptor.main.plugin
             if path:
                 Plugin.add(plugin, path)
-                plugin.impl = __import__(path, {}, {}, [path.split('.')[-1]])
+                impl = __import__(path, {}, {}, [path.split('.')[-1]])
             else:
                 path = PluginLoader._find(plugin.name)
-                plugin.impl = imp.load_source(plugin.name, path)
+                impl = imp.load_source(plugin.name, path)
 
-            log.info('plugin:%s loaded using: %s', plugin.name, path)
-
-            for fn in Remote.find(plugin.impl.__name__):
+            for fn in Remote.find(impl.__name__):
                 fn.gofer.plugin = plugin
 
+            functions = len(Remote.functions)
             plugin.dispatcher += Remote.collated()
             plugin.actions = Actions.collated()
             plugin.delegate = Delegate()
-            plugin.load()
-            return plugin
-        except Exception:
-            log.exception('plugin:%s, import failed', plugin.name)
-            Plugin.delete(plugin)
+            plugin.impl = impl
+        timer.stop()
+        log.info(
+            'plugin:%s imported using: %s in: %s, remote functions: %d',
+            plugin.name,
+            path,
+            timer,
+            functions)
+        if plugin.lazy:
+            try:
+                Manifest(plugin).update(plugin)
+            except (IOError, OSError):
+                log.exception('plugin:%s, manifest not written', plugin.name)
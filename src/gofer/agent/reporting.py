@@ -50,6 +50,13 @@ def loaded(container, actions):
             continue
         s.append('')
         s.append(indent('<plugin> {}', 2, p.name))
+        if p.deferred:
+            s.append(indent('Deferred:', 4))
+            for name, members in sorted(p.manifest.namespaces.items()):
+                s.append(indent('<namespace> {}', 6, name))
+                for member in members:
+                    s.append(indent(member, 8))
+            continue
         s.append(indent('Classes:', 4))
         for name, thing in sorted(p.dispatcher.catalog.items()):
             if isinstance(thing, Module):
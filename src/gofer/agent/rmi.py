@@ -20,8 +20,9 @@ from gofer.agent.builtin import Builtin
 from gofer.common import Thread, released
 from gofer.messaging import Document, Producer
 from gofer.metrics import Timer, timestamp
-from gofer.rmi.context import Cancelled, Context, Progress
+from gofer.rmi.context import Context, Progress
 from gofer.rmi.store import Pending, Empty
+from gofer.rmi.tracker import Tracker
 
 
 log = getLogger(__name__)
@@ -37,16 +38,23 @@ class Task(object):
     """
 
     @staticmethod
-    def _producer(plugin):
+    def _producer(plugin, request):
         """
         Get a configured producer.
+        Replies are sent using the codec and compressor of the request.
         :param plugin: A plugin.
         :type plugin: gofer.agent.plugin.Plugin
+        :param request: The received request.
+        :type request: Document
         :return: A producer.
         :rtype: Producer
         """
         producer = Producer(plugin.url)
         producer.authenticator = plugin.authenticator
+        producer.codec = request.codec
+        producer.compression = request.compression
+        producer.compression_level = plugin.compression_level
+        producer.compression_threshold = plugin.compression_threshold
         return producer
 
     def __init__(self, transaction):
@@ -70,25 +78,42 @@ class Task(object):
     def __call__(self):
         """
         Dispatch received request.
+        The request is no longer tracked once dispatched or discarded.
         """
         request = self.request
-        cancelled = Cancelled(request.sn)
+        tracker = Tracker()
+        try:
+            self.dispatch(request, tracker.token(request.sn))
+        finally:
+            tracker.remove(request.sn)
+
+    def dispatch(self, request, cancelled):
+        """
+        Dispatch the request.
+        :param request: The received request.
+        :type request: Document
+        :param cancelled: The request cancellation token.
+        :type cancelled: gofer.rmi.tracker.Token
+        """
         latency = self.plugin.latency
         if latency:
             sleep(latency)
         if not self.plugin.url or cancelled():
             self.discard()
             return
-        producer = self._producer(self.plugin)
-        progress = Progress(request, producer)
+        producer = self._producer(self.plugin, request)
+        progress = Progress(request, producer, self.plugin.throttle)
         context = Context(request.sn, progress, cancelled)
         Context.set(context)
         producer.open()
         try:
             self.producer = producer
             self.send_started(request)
-            result = self.plugin.dispatch(request)
-            self.send_reply(request, result)
+            try:
+                result = self.plugin.dispatch(request)
+            finally:
+                progress.flush()
+            self.send_reply(request, result, context.usage)
             self.commit()
         finally:
             producer.close()
@@ -127,13 +152,16 @@ class Task(object):
         except Exception:
             log.exception('Send: started, failed')
 
-    def send_reply(self, request, result):
+    def send_reply(self, request, result, usage=None):
         """
         Send the reply if requested.
+        The resource usage is included when accounting is enabled.
         :param request: The received request.
         :type request: Document
         :param result: The request result.
         :type result: object
+        :param usage: The (optional) resource usage.
+        :type usage: gofer.metrics.Usage
         """
         sn = request.sn
         data = request.data
@@ -144,13 +172,17 @@ class Task(object):
         log.info('Request: %s processed in: %s', sn, duration)
         if not address:
             return
+        details = {}
+        if usage is not None and self.plugin.accounting:
+            details['usage'] = usage.dict()
         try:
             self.producer.send(
                 address,
                 sn=sn,
                 data=data,
                 result=result,
-                timestamp=timestamp())
+                timestamp=timestamp(),
+                **details)
         except Exception:
             log.exception('Send: reply, failed: %s', result)
 
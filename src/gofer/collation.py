@@ -17,7 +17,11 @@
 Provides decorator collator classes.
 """
 
-from gofer import NAME, inspection
+from collections import OrderedDict
+from threading import RLock
+
+from gofer import NAME, inspection, synchronized
+from gofer.compat import json
 
 
 class Collator:
@@ -27,11 +31,14 @@ class Collator:
     Attributes:
         classes (dict): Dictionary {class: [(function, options)]}
         functions (dict): Dictionary {module: [(function, options)]}
+        methods (dict): Index of the methods of the classes in each
+            module: {module: {function: class}}.  Built on demand.
     """
 
     def __init__(self):
         self.classes = {}
         self.functions = {}
+        self.methods = {}
 
     def __call__(self, functions):
         """
@@ -43,16 +50,15 @@ class Collator:
         Returns:
             tuple: of ([Class], [Module])
         """
-        classes = []
         self.classes.clear()
         self.functions.clear()
+        self.methods.clear()
         for fn, options in functions.items():
             mod = inspection.module(fn)
-            classes.extend(inspection.classes(mod))
-            self._bind(classes, fn, options)
+            self._bind(mod, fn, options)
         return list(self.classes.values()), list(self.functions.values())
 
-    def _bind(self, classes, fn, options):
+    def _bind(self, mod, fn, options):
         """
         Bind the function (fn) to its class when part of a method
         for to it's module for unbound function.
@@ -60,19 +66,47 @@ class Collator:
         This populates the self.classes and self.functions dictionaries.
 
         Args:
-            classes (list): A list of know classes.
+            mod (module): The module containing the function.
             fn (function): A function to bind.
             options (dict): Options associated with a decorated function.
         """
-        for name, cls in classes:
-            for _, function_ in inspection.methods(cls):
-                if function_ == fn:
-                    container = self.classes.setdefault(cls.__name__, Class(cls))
-                    container += Method(fn, options)
-                    return
-        mod = inspection.module(fn)
-        container = self.functions.setdefault(mod.__name__, Module(mod))
-        container += Function(fn, options)
+        cls = self._find(mod, fn)
+        if cls is not None:
+            container = self.classes.setdefault(cls.__name__, Class(cls))
+            container += Method(fn, options)
+        else:
+            container = self.functions.setdefault(mod.__name__, Module(mod))
+            container += Function(fn, options)
+
+    def _find(self, mod, fn):
+        """
+        Find the class defining the function (fn).
+        The class is resolved in the module using the function
+        qualified name.  Otherwise, the methods of the classes in the
+        module are indexed (once) and searched.
+
+        Args:
+            mod (module): The module containing the function.
+            fn (function): A function.
+
+        Returns:
+            class: The class or None when not a method.
+        """
+        path = getattr(fn, '__qualname__', fn.__name__).split('.')
+        cls = mod
+        for name in path[:-1]:
+            cls = getattr(cls, name, None)
+        if inspection.is_class(cls) and getattr(cls, path[-1], None) is fn:
+            return cls
+        try:
+            methods = self.methods[mod]
+        except KeyError:
+            methods = {}
+            for _, cls in reversed(inspection.classes(mod)):
+                for _, function_ in inspection.methods(cls):
+                    methods[function_] = cls
+            self.methods[mod] = methods
+        return methods.get(fn)
 
 
 class Member(object):
@@ -114,6 +148,18 @@ class Member(object):
     def __call__(self, *args, **kwargs):
         return self.impl(*args, **kwargs)
 
+    def bind(self, inst):
+        """
+        Get the member bound to an instance of its container.
+
+        Args:
+            inst (object): The instance.
+
+        Returns:
+            Member: The bound member.
+        """
+        return self
+
     def __hash__(self):
         return hash(self.impl)
 
@@ -160,6 +206,10 @@ class Method(Member):
     def class_(self):
         return self.container
 
+    @property
+    def inst(self):
+        return self.container.inst
+
     @property
     def signature(self):
         return inspection.signature(self.impl)
@@ -168,7 +218,35 @@ class Method(Member):
         return '{}{}'.format(self.name, self.signature)
 
     def __call__(self, *args, **kwargs):
-        return self.impl(self.container.inst, *args, **kwargs)
+        return self.impl(self.inst, *args, **kwargs)
+
+    def bind(self, inst):
+        return Bound(self, inst)
+
+
+class Bound(Method):
+    """
+    A method bound to an instance.
+    Unlike the container *inst*, the instance is not shared
+    by concurrent calls.
+
+    Attributes:
+        inst (object): The instance.
+    """
+
+    def __init__(self, method, inst):
+        """
+        Args:
+            method (Method): The method.
+            inst (object): The instance.
+        """
+        super(Bound, self).__init__(method.impl, method.options)
+        self.container = method.container
+        self._inst = inst
+
+    @property
+    def inst(self):
+        return self._inst
 
 
 class MemberNotFound(Exception):
@@ -239,6 +317,15 @@ class Container(object):
         self.inst = self.impl
         return self
 
+    def construct(self, *args, **kwargs):
+        """
+        Construct the instance used to invoke members.
+
+        Returns:
+            object: The instance.
+        """
+        return self.impl
+
     def call(self, name, *args, **kwargs):
         member = self[name]
         return member(*args, **kwargs)
@@ -273,6 +360,7 @@ class Class(Container):
     Attributes:
         methods (dict): Dictionary of methods.
         impl (module): A real module.
+        instances (Instances): Constructed instances (opt-in) or None.
     """
 
     def __init__(self, impl, methods=None):
@@ -282,6 +370,12 @@ class Class(Container):
             impl (module): A real module.
         """
         super(Class, self).__init__(impl, methods)
+        opt = getattr(impl, NAME, None)
+        capacity = getattr(opt, 'cached', None)
+        if capacity:
+            self.instances = Instances(capacity)
+        else:
+            self.instances = None
 
     @property
     def methods(self):
@@ -291,6 +385,87 @@ class Class(Container):
         self.inst = self.impl(*args, **kwargs)
         return self
 
+    def construct(self, *args, **kwargs):
+        """
+        Construct an instance of the class.
+        When cached, instances are shared by calls with the same
+        constructor arguments.
+
+        Returns:
+            object: The instance.
+        """
+        if self.instances is None:
+            return self.impl(*args, **kwargs)
+        else:
+            return self.instances.get(self.impl, args, kwargs)
+
     def call(self, name, *args, **kwargs):
         member = self[name]
         return member(*args, **kwargs)
+
+
+class Instances(object):
+    """
+    Constructed instances of a class cached (LRU) by constructor arguments.
+
+    Attributes:
+        capacity (int): The maximum number of instances.
+        entries (OrderedDict): Instances by constructor arguments.
+    """
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): The maximum number of instances.
+        """
+        self.__mutex = RLock()
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def key(args, kwargs):
+        """
+        Get the key for constructor arguments.
+
+        Args:
+            args (list): The constructor arguments.
+            kwargs (dict): The constructor keyword arguments.
+
+        Returns:
+            str: The key (canonical JSON) or None when not JSON serializable.
+        """
+        try:
+            return json.dumps([args, kwargs], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+    @synchronized
+    def get(self, impl, args, kwargs):
+        """
+        Get (or construct) an instance.
+        Instances are constructed while holding the mutex so each is constructed once.
+
+        Args:
+            impl (class): The class.
+            args (list): The constructor arguments.
+            kwargs (dict): The constructor keyword arguments.
+
+        Returns:
+            object: The instance.
+        """
+        key = self.key(args, kwargs)
+        if key is None:
+            return impl(*args, **kwargs)
+        try:
+            inst = self.entries[key]
+            self.entries.move_to_end(key)
+            return inst
+        except KeyError:
+            inst = impl(*args, **kwargs)
+            self.entries[key] = inst
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+            return inst
+
+    def __len__(self):
+        return len(self.entries)
@@ -16,7 +16,7 @@
 from gofer import NAME, Options
 from gofer import inspection
 from gofer.rmi.decorator import Remote
-from gofer.rmi.model import DIRECT, FORK, valid_model
+from gofer.rmi.model import DIRECT, FORK, WORKER, valid_model
 from gofer.agent.decorator import Actions
 from gofer.agent.decorator import Delegate
 
@@ -44,7 +44,7 @@ def remote(fx=None, model=DIRECT):
     Used to expose function/methods as RMI targets.
     :param fx: The function being decorated when called without params.
     :type fx: function
-    :param model: The RMI call model (direct|forked)
+    :param model: The RMI call model (direct|fork|worker)
     :type model: str
     :return: The decorated function.
     """
@@ -83,6 +83,40 @@ def fork(fn):
     return fn
 
 
+def worker(fn):
+    """
+    The *worker* decorator used to specify the *worker* model.
+    :param fn: The function being decorated.
+    :type fn: function
+    :return: The decorated function.
+    """
+    opt = options(fn)
+    opt.call.model = valid_model(WORKER)
+    return fn
+
+
+def cached(fx=None, size=100):
+    """
+    The *cached* decorator.
+    Used to designate that instances of a plugin class constructed
+    for RMI calls may be cached and shared by calls with the same
+    constructor arguments.  The class must be thread-safe.
+    :param fx: The class being decorated when called without params.
+    :type fx: class
+    :param size: The maximum number of cached instances.
+    :type size: int
+    :return: The decorated class.
+    """
+    def inner(cls):
+        opt = options(cls)
+        opt.cached = int(size)
+        return cls
+    if inspection.is_class(fx):
+        return inner(fx)
+    else:
+        return inner
+
+
 def action(fx=None, **interval):
     """
     The *action* decorator.
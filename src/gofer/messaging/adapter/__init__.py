@@ -23,6 +23,7 @@ from .factory import \
 
 from .model import \
     SSL, \
+    Reconnect, \
     Connector, \
     Broker, \
     Domain, \
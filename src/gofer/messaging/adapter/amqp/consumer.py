@@ -16,7 +16,7 @@ from queue import Empty, Queue as Inbox
 
 from amqp.spec import Basic
 
-from gofer.messaging.adapter.model import BaseReader, Message
+from gofer.messaging.adapter.model import BaseReader, Message, COMPRESSION
 from gofer.messaging.adapter.amqp.connection import Connection
 from gofer.messaging.adapter.amqp.reliability import reliable
 
@@ -108,18 +108,27 @@ class Reader(BaseReader):
         """
         try:
             impl = self.receiver.fetch(timeout or NO_DELAY)
-            return Message(self, impl, impl.body)
+            properties = impl.properties
+            headers = properties.get('application_headers') or {}
+            return Message(
+                self,
+                impl,
+                impl.body,
+                properties.get('content_type'),
+                headers.get(COMPRESSION))
         except Empty:
             pass
 
     @reliable
-    def ack(self, message):
+    def ack(self, message, multiple=False):
         """
         Ack the specified message.
         :param message: The message to acknowledge.
         :type message: amqp.Message
+        :param multiple: Ack all messages received up to and including this message.
+        :type multiple: bool
         """
-        self.channel.basic_ack(message.delivery_info[DELIVERY_TAG])
+        self.channel.basic_ack(message.delivery_info[DELIVERY_TAG], multiple)
 
     @reliable
     def reject(self, message, requeue=True):
@@ -140,31 +149,15 @@ class Receiver(object):
     :type reader: Reader
     :ivar inbox: The message inbox.
     :type inbox: Inbox
+    :ivar poller: The connection socket poller.
+        Created on open() and rebuilt when the connection socket is replaced.
+    :type poller: select.epoll
+    :ivar sock: The socket registered with the poller.
+    :type sock: socket.socket
+    :ivar fd: The file descriptor registered with the poller.
+    :type fd: int
     """
 
-    @staticmethod
-    def _wait(fd, channel, timeout):
-        """
-        Wait on channel.
-        :param fd: The connection file descriptor.
-        :type fd: int
-        :param channel: The channel.
-        :type: amqp.channel.Channel
-        :param timeout: The read timeout in seconds.
-        :type timeout: int
-        """
-        if len(channel.method_queue):
-            channel.wait(Basic.Deliver)
-            return
-        epoll = select.epoll()
-        epoll.register(fd, select.EPOLLIN)
-        try:
-            if epoll.poll(timeout):
-                channel.wait(Basic.Deliver)
-        finally:
-            epoll.unregister(fd)
-            epoll.close()
-
     def __init__(self, reader):
         """
         :param reader: A message reader.
@@ -173,6 +166,9 @@ class Receiver(object):
         self.reader = reader
         self.inbox = Inbox()
         self.tag = None
+        self.poller = None
+        self.sock = None
+        self.fd = None
 
     def channel(self):
         """
@@ -190,18 +186,71 @@ class Receiver(object):
         fn = self.inbox.put
         channel = self.channel()
         address = self.reader.node.address
+        prefetch = self.reader.prefetch
+        if prefetch:
+            channel.basic_qos(0, prefetch, False)
         self.tag = channel.basic_consume(address, callback=fn)
+        self.register(channel)
         return self
 
+    def register(self, channel):
+        """
+        Register the connection socket with the poller.
+        The connection is shared by the thread and may be repaired by another
+        messenger.  The poller is rebuilt when the socket has been replaced
+        because the closed socket is silently dropped by epoll.
+        :param channel: The channel.
+        :type: amqp.channel.Channel
+        :raise AttributeError: When the connection is closed (no socket).
+        """
+        sock = channel.connection.sock
+        fd = sock.fileno()
+        if self.poller is not None and sock is self.sock and fd == self.fd:
+            return
+        poller = select.epoll()
+        try:
+            poller.register(fd, select.EPOLLIN)
+        except Exception:
+            poller.close()
+            raise
+        if self.poller is not None:
+            self.poller.close()
+        self.poller = poller
+        self.sock = sock
+        self.fd = fd
+
     def close(self):
         """
         Close the receiver.
         """
+        poller = self.poller
+        self.poller = None
+        self.sock = None
+        self.fd = None
         try:
             channel = self.channel()
             channel.basic_cancel(self.tag)
         except Exception as e:
             log.debug(str(e))
+        try:
+            poller.close()
+        except Exception:
+            pass
+
+    def _wait(self, channel, timeout):
+        """
+        Wait on channel.
+        :param channel: The channel.
+        :type: amqp.channel.Channel
+        :param timeout: The read timeout in seconds.
+        :type timeout: int
+        """
+        if len(channel.method_queue):
+            channel.wait(Basic.Deliver)
+            return
+        self.register(channel)
+        if self.poller.poll(timeout):
+            channel.wait(Basic.Deliver)
 
     def fetch(self, timeout=None):
         """
@@ -214,7 +263,5 @@ class Receiver(object):
         """
         inbox = self.inbox
         if inbox.empty():
-            channel = self.channel()
-            fd = channel.connection.sock.fileno()
-            self._wait(fd, channel, timeout)
+            self._wait(self.channel(), timeout)
         return inbox.get(block=False)
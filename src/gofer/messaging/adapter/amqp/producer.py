@@ -13,7 +13,7 @@ from logging import getLogger
 
 from amqp import Message
 
-from gofer.messaging.adapter.model import BaseSender
+from gofer.messaging.adapter.model import BaseSender, COMPRESSION
 from gofer.messaging.adapter.amqp.connection import Connection
 from gofer.messaging.adapter.amqp.reliability import reliable
 
@@ -21,7 +21,7 @@ from gofer.messaging.adapter.amqp.reliability import reliable
 log = getLogger(__name__)
 
 
-def build_message(body, ttl, durable):
+def build_message(body, ttl, durable, content_type=None, compression=None):
     """
     Construct a message object.
     :param body: The message body.
@@ -29,11 +29,21 @@ def build_message(body, ttl, durable):
     :type ttl: float
     :param durable: The message is durable.
     :type durable: bool
+    :param content_type: The (optional) content (MIME) type.
+    :type content_type: str
+    :param compression: The (optional) name of the compressor.
+    :type compression: str
     :return: The message.
     :rtype: Message
     """
     properties = {}
 
+    if content_type:
+        properties.update(content_type=content_type)
+
+    if compression:
+        properties.update(application_headers={COMPRESSION: compression})
+
     if ttl:
         ms = ttl * 1000  # milliseconds
         properties.update(expiration=str(ms))
@@ -100,7 +110,7 @@ class Sender(BaseSender):
             pass
 
     @reliable
-    def send(self, address, content, ttl=None):
+    def send(self, address, content, ttl=None, content_type=None, compression=None):
         """
         Send a message.
         :param address: An AMQP address.
@@ -109,6 +119,10 @@ class Sender(BaseSender):
         :type content: buf
         :param ttl: Time to Live (seconds)
         :type ttl: float
+        :param content_type: The (optional) content (MIME) type.
+        :type content_type: str
+        :param compression: The (optional) name of the compressor.
+        :type compression: str
         """
         parts = address.split('/')
         if len(parts) > 1:
@@ -116,6 +130,6 @@ class Sender(BaseSender):
         else:
             exchange = ''
         key = parts[-1]
-        message = build_message(content, ttl, self.durable)
+        message = build_message(content, ttl, self.durable, content_type, compression)
         self.channel.basic_publish(message, mandatory=True, exchange=exchange, routing_key=key)
         log.debug('sent (%s)', address)
@@ -1,19 +1,234 @@
-from time import sleep
+from random import uniform
+from threading import RLock
+from time import sleep, time
 from logging import getLogger
 
-from gofer import Thread
+from gofer import Thread, synchronized
+from gofer.messaging.adapter.model import Connector
 from gofer.messaging.adapter.reliability import YEAR
 
 
 DELAY = 10
 MAX_DELAY = 90
 RETRIES = YEAR / MAX_DELAY
-DELAY_MULTIPLIER = 1.2
 
 
 log = getLogger(__name__)
 
 
+class Backoff(object):
+    """
+    Exponential backoff with decorrelated jitter.
+    Each delay is chosen at random between the base delay
+    and 3 times the previous delay, not to exceed the maximum.
+    :ivar base: The base delay (seconds).
+    :type base: float
+    :ivar cap: The maximum delay (seconds).
+    :type cap: float
+    :ivar delay: The last delay (seconds).
+    :type delay: float
+    """
+
+    def __init__(self, base=DELAY, cap=MAX_DELAY):
+        """
+        :param base: The base delay (seconds).
+        :type base: float
+        :param cap: The maximum delay (seconds).
+        :type cap: float
+        """
+        self.base = base
+        self.cap = cap
+        self.delay = base
+
+    def next(self):
+        """
+        Get the next delay.
+        :return: The delay (seconds).
+        :rtype: float
+        """
+        self.delay = min(self.cap, uniform(self.base, self.delay * 3))
+        return self.delay
+
+    def reset(self):
+        """
+        Reset the delay to the base.
+        """
+        self.delay = self.base
+
+
+class Breaker(object):
+    """
+    A circuit breaker shared by all messengers connecting to the same URL.
+    The breaker is opened (tripped) after THRESHOLD consecutive failed connect
+    attempts and remains open for the delay reported by the failed attempt.
+    While open, connect attempts are rejected (fail fast).  Once the delay has
+    elapsed (half-open), a single attempt is permitted to probe the broker.
+    A successful connect closes the breaker.
+    :cvar THRESHOLD: The number of consecutive failures that trips the breaker.
+    :type THRESHOLD: int
+    :cvar breakers: Breakers by URL.
+    :type breakers: dict
+    :ivar url: The broker URL.
+    :type url: str
+    :ivar failures: The number of consecutive failed attempts.
+    :type failures: int
+    :ivar until: The breaker is open until this time.
+    :type until: float
+    :ivar probing: A half-open probe is in progress.
+    :type probing: bool
+    :ivar prober: The thread performing the half-open probe.
+    :type prober: threading.Thread
+    :ivar error: The last connect exception.
+    :type error: Exception
+    :ivar attempts: The total number of connect attempts.
+    :type attempts: int
+    :ivar failed: The total number of failed connect attempts.
+    :type failed: int
+    :ivar rejected: The total number of rejected (fast failed) attempts.
+    :type rejected: int
+    :ivar tripped: The number of times the breaker has been opened.
+    :type tripped: int
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    THRESHOLD = 3
+
+    __lock = RLock()
+    breakers = {}
+
+    @staticmethod
+    def find(url):
+        """
+        Find (or create) the breaker for the specified URL.
+        :param url: The broker URL.
+        :type url: str
+        :return: The breaker.
+        :rtype: Breaker
+        """
+        with Breaker.__lock:
+            breaker = Breaker.breakers.get(url)
+            if breaker is None:
+                breaker = Breaker(url)
+                Breaker.breakers[url] = breaker
+            return breaker
+
+    def __init__(self, url):
+        """
+        :param url: The broker URL.
+        :type url: str
+        """
+        self.__mutex = RLock()
+        self.url = url
+        self.failures = 0
+        self.until = 0
+        self.probing = False
+        self.prober = None
+        self.error = None
+        self.attempts = 0
+        self.failed = 0
+        self.rejected = 0
+        self.tripped = 0
+
+    @property
+    def state(self):
+        """
+        Get the breaker state.
+        :return: CLOSED|OPEN|HALF_OPEN
+        :rtype: str
+        """
+        if self.failures < self.THRESHOLD:
+            return self.CLOSED
+        if time() < self.until:
+            return self.OPEN
+        else:
+            return self.HALF_OPEN
+
+    @property
+    def remaining(self):
+        """
+        Get the time remaining until the breaker is half-open.
+        :return: The remaining time (seconds).
+        :rtype: float
+        """
+        return max(0, self.until - time())
+
+    @synchronized
+    def allow(self):
+        """
+        Get whether a connect attempt is permitted.
+        :return: True if permitted.
+        :rtype: bool
+        """
+        state = self.state
+        if state == self.CLOSED or (state == self.HALF_OPEN and not self.probing):
+            self.probing = (state == self.HALF_OPEN)
+            self.prober = Thread.current() if self.probing else None
+            self.attempts += 1
+            return True
+        else:
+            self.rejected += 1
+            return False
+
+    @synchronized
+    def succeeded(self):
+        """
+        A connect attempt succeeded.
+        """
+        if self.failures >= self.THRESHOLD:
+            log.info('breaker: %s, closed %s', self.url, self.stats())
+        self.failures = 0
+        self.probing = False
+        self.prober = None
+        self.error = None
+
+    @synchronized
+    def release(self):
+        """
+        A connect attempt raised an unexpected exception.
+        The half-open probe is released when performed by the calling thread.
+        """
+        if self.prober is Thread.current():
+            self.probing = False
+            self.prober = None
+
+    @synchronized
+    def fail(self, error, delay):
+        """
+        A connect attempt failed.
+        :param error: The raised exception.
+        :type error: Exception
+        :param delay: The time (seconds) the breaker remains open once tripped.
+        :type delay: float
+        """
+        self.failures += 1
+        self.failed += 1
+        self.probing = False
+        self.prober = None
+        self.error = error
+        if self.failures < self.THRESHOLD:
+            return
+        self.until = time() + delay
+        if self.failures == self.THRESHOLD:
+            self.tripped += 1
+            log.warning('breaker: %s, opened %s', self.url, self.stats())
+
+    def stats(self):
+        """
+        Get the breaker metrics.
+        :rtype: dict
+        """
+        return dict(
+            state=self.state,
+            failures=self.failures,
+            attempts=self.attempts,
+            failed=self.failed,
+            rejected=self.rejected,
+            tripped=self.tripped)
+
+
 def retry(*exception):
     def _fn(fn):
         def inner(connection):
@@ -21,23 +236,38 @@ def retry(*exception):
                 retries = RETRIES
             else:
                 retries = 0
-            delay = DELAY
             url = connection.url
+            policy = Connector.find(url).reconnect
+            backoff = Backoff(policy.delay, policy.max_delay)
+            breaker = Breaker.find(url)
             while not Thread.aborted():
+                if not breaker.allow():
+                    if retries > 0:
+                        delay = max(breaker.remaining, backoff.next())
+                        log.debug('connect: %s, breaker open, retry in %d seconds', url, delay)
+                        sleep(delay)
+                        retries -= 1
+                        continue
+                    else:
+                        raise breaker.error
                 try:
                     log.info('connecting: %s', url)
                     impl = fn(connection)
+                    breaker.succeeded()
                     log.info('connected: %s', url)
                     return impl
                 except exception as e:
                     log.error('connect: %s, failed: %s', url, e)
+                    delay = backoff.next()
+                    breaker.fail(e, delay)
                     if retries > 0:
                         log.info('retry in %d seconds', delay)
                         sleep(delay)
-                        if delay < MAX_DELAY:
-                            delay *= DELAY_MULTIPLIER
                         retries -= 1
                     else:
                         raise
+                except BaseException:
+                    breaker.release()
+                    raise
         return inner
     return _fn
@@ -19,6 +19,8 @@ from uuid import uuid4
 
 from gofer.common import Thread, valid_path
 from gofer.messaging.model import VERSION, Document
+from gofer.messaging.codec import Codec
+from gofer.messaging.compression import Compressor, THRESHOLD, LIMIT
 from gofer.messaging.adapter.url import URL
 from gofer.messaging.adapter.factory import Adapter
 from gofer.messaging.model import ModelError, validate
@@ -30,6 +32,9 @@ DIRECT = 'direct'
 TOPIC = 'topic'
 DEFAULT_URL = 'amqp://localhost'
 
+# message property: the name of the compressor
+COMPRESSION = 'compression'
+
 log = getLogger(__name__)
 
 
@@ -456,19 +461,29 @@ class Message(Model):
     :ivar _impl: The *real* message.
     :ivar _body: The *real* message body.
     :type _body: str
+    :ivar _content_type: The message content (MIME) type.
+    :type _content_type: str
+    :ivar _compression: The name of the compressor used to compress the body.
+    :type _compression: str
     """
 
-    def __init__(self, reader, impl, body):
+    def __init__(self, reader, impl, body, content_type=None, compression=None):
         """
         :ivar reader: The reader that read the message.
         :type reader: BaseReader
         :ivar impl: The *real* message.
         :ivar body: The *real* message body.
         :type body: str
+        :ivar content_type: The message content (MIME) type.
+        :type content_type: str
+        :ivar compression: The name of the compressor used to compress the body.
+        :type compression: str
         """
         self._reader = reader
         self._impl = impl
         self._body = body
+        self._content_type = content_type
+        self._compression = compression
 
     @property
     def body(self):
@@ -479,13 +494,33 @@ class Message(Model):
         """
         return self._body
 
+    @property
+    def content_type(self):
+        """
+        Get the message content type.
+        :return: The content (MIME) type.
+        :rtype: str
+        """
+        return self._content_type
+
+    @property
+    def compression(self):
+        """
+        Get the name of the compressor used to compress the body.
+        :return: The compressor name or None when not compressed.
+        :rtype: str
+        """
+        return self._compression
+
     @model
-    def ack(self):
+    def ack(self, multiple=False):
         """
         Ack this message.
+        :param multiple: Ack all messages received up to and including this message.
+        :type multiple: bool
         :raise: ModelError
         """
-        self._reader.ack(self._impl)
+        self._reader.ack(self._impl, multiple)
 
     @model
     def reject(self, requeue=True):
@@ -506,6 +541,9 @@ class BaseReader(Messenger):
     An AMQP message reader.
     :ivar node: The AMQP node to read.
     :type node: Node
+    :ivar prefetch: The maximum number of unacknowledged messages
+        delivered to the reader.  0 = the adapter default.
+    :type prefetch: int
     """
 
     def __init__(self, node, url):
@@ -517,6 +555,7 @@ class BaseReader(Messenger):
         """
         Messenger.__init__(self, url)
         self.node = node
+        self.prefetch = 0
 
     def get(self, timeout=None):
         """
@@ -528,10 +567,12 @@ class BaseReader(Messenger):
         """
         raise NotImplementedError()
 
-    def ack(self, message):
+    def ack(self, message, multiple=False):
         """
         Ack the specified message.
         :param message: The message to acknowledge.
+        :param multiple: Ack all messages received up to and including this message.
+        :type multiple: bool
         """
         raise NotImplementedError()
 
@@ -550,6 +591,8 @@ class Reader(BaseReader):
     An AMQP queue reader.
     :ivar authenticator: A message authenticator.
     :type authenticator: gofer.messaging.auth.Authenticator
+    :ivar decompression_limit: The largest (bytes) decompressed message body.
+    :type decompression_limit: int
     """
 
     def __init__(self, node, url=None):
@@ -564,6 +607,7 @@ class Reader(BaseReader):
         adapter = Adapter.find(url)
         self._impl = adapter.Reader(node, url)
         self.authenticator = None
+        self.decompression_limit = LIMIT
 
     @model
     def is_open(self):
@@ -580,6 +624,7 @@ class Reader(BaseReader):
         Open the reader.
         :raise: NotFound
         """
+        self._impl.prefetch = self.prefetch
         self._impl.open()
 
     @model
@@ -588,6 +633,7 @@ class Reader(BaseReader):
         Repair the reader.
         :raise: NotFound
         """
+        self._impl.prefetch = self.prefetch
         self._impl.repair()
 
     @model
@@ -610,14 +656,16 @@ class Reader(BaseReader):
         return self._impl.get(timeout)
 
     @model
-    def ack(self, message):
+    def ack(self, message, multiple=False):
         """
         Ack the specified message.
         :param message: The message to acknowledge.
         :type message: Message
+        :param multiple: Ack all messages received up to and including this message.
+        :type multiple: bool
         :raise: ModelError
         """
-        message.ack()
+        message.ack(multiple)
 
     @model
     def reject(self, message, requeue=True):
@@ -644,7 +692,14 @@ class Reader(BaseReader):
         message = self.get(timeout)
         if message:
             try:
-                document = auth.validate(self.authenticator, message.body)
+                body = message.body
+                if message.compression:
+                    body = Compressor.decompress(
+                        message.compression,
+                        body,
+                        self.decompression_limit)
+                codec = Codec.find(message.content_type)
+                document = auth.validate(self.authenticator, body, codec)
                 validate(document)
             except ModelError:
                 message.ack()
@@ -694,7 +749,7 @@ class BaseSender(Messenger):
         Messenger.__init__(self, url)
         self.durable = True
 
-    def send(self, address, content, ttl):
+    def send(self, address, content, ttl, content_type=None, compression=None):
         """
         Send a message with content.
         :param address: An AMQP address.
@@ -702,6 +757,10 @@ class BaseSender(Messenger):
         :param content: The message content
         :param ttl: Time to Live (seconds)
         :type ttl: float
+        :param content_type: The (optional) content (MIME) type.
+        :type content_type: str
+        :param compression: The (optional) name of the compressor.
+        :type compression: str
         :return: The message ID.
         :rtype: str
         """
@@ -753,7 +812,7 @@ class Sender(BaseSender):
         self._impl.close()
 
     @model
-    def send(self, address, content, ttl=None):
+    def send(self, address, content, ttl=None, content_type=None, compression=None):
         """
         Send a message with content.
         :param address: An AMQP address.
@@ -761,9 +820,13 @@ class Sender(BaseSender):
         :param content: The message content
         :param ttl: Time to Live (seconds)
         :type ttl: float
+        :param content_type: The (optional) content (MIME) type.
+        :type content_type: str
+        :param compression: The (optional) name of the compressor.
+        :type compression: str
         """
         self._impl.durable = self.durable
-        self._impl.send(address, content, ttl)
+        self._impl.send(address, content, ttl, content_type, compression)
 
 
 class Producer(Messenger):
@@ -771,6 +834,16 @@ class Producer(Messenger):
     An AMQP message producer.
     :ivar authenticator: A message authenticator.
     :type authenticator: gofer.messaging.auth.Authenticator
+    :ivar codec: The content (MIME) type of the codec used to encode
+        documents.  Default: JSON.
+    :type codec: str
+    :ivar compression: The name of the compressor used to compress
+        messages.  Default: None (not compressed).
+    :type compression: str
+    :ivar compression_level: The compression level.  None = compressor default.
+    :type compression_level: int
+    :ivar compression_threshold: Messages smaller (bytes) are not compressed.
+    :type compression_threshold: int
     """
 
     def __init__(self, url=None):
@@ -782,6 +855,10 @@ class Producer(Messenger):
         adapter = Adapter.find(url)
         self._impl = adapter.Sender(url)
         self.authenticator = None
+        self.codec = None
+        self.compression = None
+        self.compression_level = None
+        self.compression_threshold = THRESHOLD
 
     @model
     def is_open(self):
@@ -831,11 +908,25 @@ class Producer(Messenger):
         """
         sn = str(uuid4())
         routing = (None, address)
+        codec = Codec.find(self.codec)
+        compressor = Compressor.find(self.compression)
         document = Document(sn=sn, version=VERSION, routing=routing)
         document += body
-        unsigned = document.dump()
-        signed = auth.sign(self.authenticator, unsigned)
-        self._impl.send(address, signed, ttl)
+        if codec.DEFAULT:
+            content_type = None
+        else:
+            content_type = codec.CONTENT_TYPE
+            document.codec = content_type
+        if compressor:
+            document.compression = compressor.NAME
+        unsigned = document.dump(codec=codec)
+        signed = auth.sign(self.authenticator, unsigned, codec)
+        if compressor and len(signed) >= self.compression_threshold:
+            signed = compressor.compress(signed, self.compression_level)
+            compression = compressor.NAME
+        else:
+            compression = None
+        self._impl.send(address, signed, ttl, content_type, compression)
         return sn
 
 
@@ -982,6 +1073,27 @@ class SSL(Model):
         )
 
 
+class Reconnect(Model):
+    """
+    Reconnect policy.
+    The delay between connect attempts grows using decorrelated jitter.
+    :ivar delay: The base delay (seconds) between connect attempts.
+    :type delay: float
+    :ivar max_delay: The maximum delay (seconds) between connect attempts.
+    :type max_delay: float
+    """
+
+    def __init__(self):
+        self.delay = 10
+        self.max_delay = 90
+
+    def __str__(self):
+        return 'delay: {}|max-delay: {}'.format(
+            str(self.delay),
+            str(self.max_delay)
+        )
+
+
 class Connector(Model):
     """
     Represents an AMQP connector.
@@ -991,6 +1103,8 @@ class Connector(Model):
     :type heartbeat: int|None
     :ivar ssl: The SSL configuration.
     :type ssl: SSL
+    :ivar reconnect: The reconnect policy.
+    :type reconnect: Reconnect
     """
 
     @staticmethod
@@ -1017,6 +1131,7 @@ class Connector(Model):
         self.url = URL(url or DEFAULT_URL)
         self.heartbeat = None
         self.ssl = SSL()
+        self.reconnect = Reconnect()
 
     @property
     def domain_id(self):
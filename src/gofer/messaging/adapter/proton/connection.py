@@ -100,13 +100,15 @@ class Connection(BaseConnection, metaclass=ThreadSingleton):
         name = str(uuid4())
         return self._impl.create_sender(address, name=name)
 
-    def receiver(self, address=None, dynamic=False):
+    def receiver(self, address=None, dynamic=False, credit=0):
         """
         Get a message receiver for the specified address.
         :param address: An AMQP address.
         :type address: str
         :param dynamic: Indicates link address is dynamically assigned.
         :type dynamic: bool
+        :param credit: The link credit (prefetch).  0 = the default.
+        :type credit: int
         :return: A receiver.
         :rtype: proton.utils.BlockingReceiver
         """
@@ -116,7 +118,12 @@ class Connection(BaseConnection, metaclass=ThreadSingleton):
             # needed by dispatch router
             options = DynamicNodeProperties({'x-opt-qd.address': str(address)})
             address = None
-        return self._impl.create_receiver(address, name=name, dynamic=dynamic, options=options)
+        return self._impl.create_receiver(
+            address,
+            credit=credit or None,
+            name=name,
+            dynamic=dynamic,
+            options=options)
 
     def close(self):
         """
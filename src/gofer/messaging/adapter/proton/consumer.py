@@ -17,11 +17,12 @@
 Provides AMQP message consumer classes.
 """
 
+from collections import deque
 from logging import getLogger
 
-from proton import Timeout
+from proton import Timeout, Delivery
 
-from gofer.messaging.adapter.model import BaseReader, Message
+from gofer.messaging.adapter.model import BaseReader, Message, COMPRESSION
 from gofer.messaging.adapter.proton.connection import Connection
 from gofer.messaging.adapter.proton.reliability import reliable
 
@@ -39,6 +40,10 @@ class Reader(BaseReader):
     :type connection: Connection
     :ivar receiver: An AMQP receiver to read.
     :type receiver: proton.utils.BlockingReceiver
+    :ivar unsettled: Messages received and not yet settled: (message, delivery).
+        Each delivery is taken from the receiver and settled directly because
+        the receiver settles deliveries in the order received.
+    :type unsettled: deque
     """
 
     def __init__(self, node, url):
@@ -52,6 +57,7 @@ class Reader(BaseReader):
         BaseReader.__init__(self, node, url)
         self.connection = Connection(url)
         self.receiver = None
+        self.unsettled = deque()
 
     def is_open(self):
         """
@@ -70,7 +76,7 @@ class Reader(BaseReader):
             # already open
             return
         self.connection.open()
-        self.receiver = self.connection.receiver(self.node.address)
+        self.receiver = self.connection.receiver(self.node.address, credit=self.prefetch)
 
     def repair(self):
         """
@@ -79,7 +85,7 @@ class Reader(BaseReader):
         self.close()
         self.connection.close()
         self.connection.open()
-        self.receiver = self.connection.receiver(self.node.address)
+        self.receiver = self.connection.receiver(self.node.address, credit=self.prefetch)
 
     def close(self):
         """
@@ -88,6 +94,7 @@ class Reader(BaseReader):
         """
         receiver = self.receiver
         self.receiver = None
+        self.unsettled.clear()
         try:
             receiver.close()
         except Exception:
@@ -104,18 +111,41 @@ class Reader(BaseReader):
         """
         try:
             impl = self.receiver.receive(timeout or NO_DELAY)
-            return Message(self, impl, impl.body)
+            fetcher = self.receiver.fetcher
+            if fetcher.unsettled:
+                delivery = fetcher.unsettled.pop()
+            else:
+                delivery = None
+            self.unsettled.append((impl, delivery))
+            properties = impl.properties or {}
+            return Message(
+                self,
+                impl,
+                impl.body,
+                impl.content_type,
+                properties.get(COMPRESSION))
         except Timeout:
             pass
 
     @reliable
-    def ack(self, message):
+    def ack(self, message, multiple=False):
         """
-        Acknowledge all messages received on the session.
+        Acknowledge the specified message.
         :param message: The message to acknowledge.
         :type message: proton.Message
+        :param multiple: Ack all messages received up to and including this message.
+        :type multiple: bool
         """
-        self.receiver.accept()
+        if not multiple:
+            self.settle(message, Delivery.ACCEPTED)
+            return
+        received = [m for m, _ in self.unsettled]
+        if not any(m is message for m in received):
+            return
+        for settled in received:
+            self.settle(settled, Delivery.ACCEPTED)
+            if settled is message:
+                break
 
     @reliable
     def reject(self, message, requeue=True):
@@ -127,6 +157,29 @@ class Reader(BaseReader):
         :type requeue: bool
         """
         if requeue:
-            self.receiver.release()
+            self.settle(message, Delivery.MODIFIED)
+        else:
+            self.settle(message, Delivery.REJECTED)
+
+    def settle(self, message, state):
+        """
+        Settle the delivery of the specified message.
+        Messages not received (or already settled) are ignored.
+        :param message: A received message.
+        :type message: proton.Message
+        :param state: The delivery state.
+        :type state: int
+        """
+        for n, entry in enumerate(self.unsettled):
+            if entry[0] is message:
+                del self.unsettled[n]
+                delivery = entry[1]
+                break
         else:
-            self.receiver.reject()
+            log.debug('message: %s, not unsettled', message)
+            return
+        if delivery is None:
+            # pre-settled
+            return
+        delivery.update(state)
+        delivery.settle()
@@ -13,7 +13,7 @@ from logging import getLogger
 
 from proton import Message
 
-from gofer.messaging.adapter.model import BaseSender
+from gofer.messaging.adapter.model import BaseSender, COMPRESSION
 from gofer.messaging.adapter.proton.connection import Connection
 from gofer.messaging.adapter.proton.reliability import reliable
 
@@ -21,7 +21,7 @@ from gofer.messaging.adapter.proton.reliability import reliable
 log = getLogger(__name__)
 
 
-def build_message(body, ttl, durable):
+def build_message(body, ttl, durable, content_type=None, compression=None):
     """
     Construct a message object.
     :param body: The message body.
@@ -29,13 +29,21 @@ def build_message(body, ttl, durable):
     :type ttl: float
     :param durable: The message is durable.
     :type durable: bool
+    :param content_type: The (optional) content (MIME) type.
+    :type content_type: str
+    :param compression: The (optional) name of the compressor.
+    :type compression: str
     :return: The message.
     :rtype: Message
     """
+    properties = dict(body=body, durable=durable)
     if ttl:
-        return Message(body=body, durable=durable, ttl=ttl)
-    else:
-        return Message(body=body, durable=durable)
+        properties.update(ttl=ttl)
+    if content_type:
+        properties.update(content_type=content_type)
+    if compression:
+        properties.update(properties={COMPRESSION: compression})
+    return Message(**properties)
 
 
 class Sender(BaseSender):
@@ -86,7 +94,7 @@ class Sender(BaseSender):
         pass
 
     @reliable
-    def send(self, address, content, ttl=None):
+    def send(self, address, content, ttl=None, content_type=None, compression=None):
         """
         Send a message.
         :param address: An AMQP address.
@@ -95,10 +103,14 @@ class Sender(BaseSender):
         :type content: buf
         :param ttl: Time to Live (seconds)
         :type ttl: float
+        :param content_type: The (optional) content (MIME) type.
+        :type content_type: str
+        :param compression: The (optional) name of the compressor.
+        :type compression: str
         """
         sender = self.connection.sender(address)
         try:
-            message = build_message(content, ttl, self.durable)
+            message = build_message(content, ttl, self.durable, content_type, compression)
             sender.send(message)
             log.debug('sent (%s)', address)
         finally:
@@ -17,11 +17,13 @@ Defined Qpid broker objects.
 """
 
 from logging import getLogger
+from threading import RLock
 
 from qpid.messaging import Connection as RealConnection
 from qpid.messaging.transports import TRANSPORTS
 from qpid.messaging import ConnectionError
 
+from gofer import synchronized
 from gofer.common import ThreadSingleton
 from gofer.messaging.adapter.model import Connector, BaseConnection
 from gofer.messaging.adapter.connect import retry
@@ -36,9 +38,120 @@ TCP = 'tcp'
 SSL = 'ssl'
 
 
+class Shared(object):
+    """
+    A qpid connection shared (multiplexed) by all threads using the same URL.
+    The qpid.messaging connection is thread-safe and each user opens its own
+    sessions on it.  The connection is closed when the last user has detached.
+    A failed connection is replaced by the first user to attach after the failure.
+    Other users find their sessions failed, repair and attach to the replacement.
+    :cvar connections: Shared connections by URL.
+    :type connections: dict
+    :ivar url: The broker url.
+    :type url: str
+    :ivar impl: The *real* connection.
+    :type impl: qpid.messaging.Connection
+    :ivar users: The number of attached users.
+    :type users: int
+    """
+
+    __lock = RLock()
+    connections = {}
+
+    @staticmethod
+    def find(url):
+        """
+        Find (or create) the shared connection for the specified URL.
+        :param url: The broker url.
+        :type url: str
+        :return: The shared connection.
+        :rtype: Shared
+        """
+        with Shared.__lock:
+            shared = Shared.connections.get(url)
+            if shared is None:
+                shared = Shared(url)
+                Shared.connections[url] = shared
+            return shared
+
+    def __init__(self, url):
+        """
+        :param url: The broker url.
+        :type url: str
+        """
+        self.__mutex = RLock()
+        self.url = url
+        self.impl = None
+        self.users = 0
+
+    @property
+    def healthy(self):
+        """
+        Get whether the connection is open and has not failed.
+        :rtype: bool
+        """
+        if self.impl is None:
+            return False
+        try:
+            self.impl.check_error()
+            return self.impl.opened()
+        except Exception:
+            return False
+
+    @synchronized
+    def attach(self, connection):
+        """
+        Attach a user.
+        The *real* connection is (re)opened as needed.
+        :param connection: The user connection.
+        :type connection: Connection
+        :return: The *real* connection.
+        :rtype: qpid.messaging.Connection
+        """
+        if not self.healthy:
+            self.close()
+            self.impl = connection.connect()
+        self.users += 1
+        return self.impl
+
+    @synchronized
+    def detach(self, impl):
+        """
+        Detach a user.
+        The *real* connection is closed when no longer used.
+        :param impl: The *real* connection used.
+        :type impl: qpid.messaging.Connection
+        """
+        if impl is not self.impl:
+            # replaced
+            return
+        self.users -= 1
+        if self.users > 0:
+            return
+        self.close()
+
+    @synchronized
+    def close(self):
+        """
+        Close the *real* connection.
+        """
+        impl = self.impl
+        self.impl = None
+        self.users = 0
+        if impl is None:
+            return
+        try:
+            impl.close()
+            log.info('closed: %s', self.url)
+        except Exception as pe:
+            log.debug(str(pe))
+
+
 class Connection(BaseConnection, metaclass=ThreadSingleton):
     """
     Represents a Qpid connection.
+    The *real* connection is shared by all threads.
+    :see: Shared
     """
 
     @staticmethod
@@ -89,14 +202,24 @@ class Connection(BaseConnection, metaclass=ThreadSingleton):
         """
         return self._impl is not None
 
-    @retry(ConnectionError)
     def open(self):
         """
         Open a connection to the broker.
+        Attach to the shared connection.
         """
         if self.is_open():
             # already open
             return
+        shared = Shared.find(self.url)
+        self._impl = shared.attach(self)
+
+    @retry(ConnectionError)
+    def connect(self):
+        """
+        Open the *real* connection to the broker.
+        :return: The opened connection.
+        :rtype: qpid.messaging.Connection
+        """
         connector = Connector.find(self.url)
         Connection.add_transports()
         domain = self.ssl_domain(connector)
@@ -111,8 +234,8 @@ class Connection(BaseConnection, metaclass=ThreadSingleton):
             heartbeat=connector.heartbeat,
             **domain)
         impl.open()
-        self._impl = impl
         log.info('opened: %s', self.url)
+        return impl
 
     def session(self):
         """
@@ -125,11 +248,11 @@ class Connection(BaseConnection, metaclass=ThreadSingleton):
     def close(self):
         """
         Close the connection.
+        Detach from the shared connection.
         """
         connection = self._impl
         self._impl = None
-        try:
-            connection.close()
-            log.info('closed: %s', self.url)
-        except Exception as pe:
-            log.debug(str(pe))
+        if connection is None:
+            return
+        shared = Shared.find(self.url)
+        shared.detach(connection)
@@ -18,12 +18,13 @@
 Provides AMQP message consumer classes.
 """
 
+from collections import deque
 from logging import getLogger
 
 from qpid.messaging import Empty
 from qpid.messaging import Disposition, RELEASED, REJECTED
 
-from gofer.messaging.adapter.model import BaseReader, Message
+from gofer.messaging.adapter.model import BaseReader, Message, COMPRESSION
 from gofer.messaging.adapter.qpid.reliability import reliable
 from gofer.messaging.adapter.qpid.connection import Connection
 
@@ -39,6 +40,9 @@ class Reader(BaseReader):
     An AMQP message reader.
     :ivar receiver: An AMQP receiver to read.
     :type receiver: qpid.messaging.Receiver
+    :ivar unacked: Messages received and not yet acknowledged.
+        The session acknowledges all received messages by default.
+    :type unacked: deque
     """
 
     def __init__(self, node, url):
@@ -53,6 +57,7 @@ class Reader(BaseReader):
         self.connection = Connection(url)
         self.session = None
         self.receiver = None
+        self.unacked = deque()
 
     def is_open(self):
         """
@@ -74,6 +79,8 @@ class Reader(BaseReader):
         self.connection.open()
         self.session = self.connection.session()
         self.receiver = self.session.receiver(self.node.address)
+        if self.prefetch:
+            self.receiver.capacity = self.prefetch
 
     def repair(self):
         """
@@ -85,6 +92,8 @@ class Reader(BaseReader):
         self.connection.open()
         self.session = self.connection.session()
         self.receiver = self.session.receiver(self.node.address)
+        if self.prefetch:
+            self.receiver.capacity = self.prefetch
     
     def close(self):
         """
@@ -94,6 +103,7 @@ class Reader(BaseReader):
         self.receiver = None
         session = self.session
         self.session = None
+        self.unacked.clear()
         try:
             receiver.close()
         except Exception:
@@ -114,18 +124,35 @@ class Reader(BaseReader):
         """
         try:
             impl = self.receiver.fetch(timeout or NO_DELAY)
-            return Message(self, impl, impl.content)
+            self.unacked.append(impl)
+            return Message(
+                self,
+                impl,
+                impl.content,
+                impl.content_type,
+                impl.properties.get(COMPRESSION))
         except Empty:
             pass
 
     @reliable
-    def ack(self, message):
+    def ack(self, message, multiple=False):
         """
-        Acknowledge all messages received on the session.
+        Acknowledge the specified message.
         :param message: The message to acknowledge.
         :type message: qpid.messaging.Message
+        :param multiple: Ack all messages received up to and including this message.
+        :type multiple: bool
         """
-        self.session.acknowledge(message=message)
+        if not multiple or not self.received(message):
+            self.forget(message)
+            self.session.acknowledge(message=message)
+            return
+        while self.unacked:
+            acked = self.unacked[0]
+            self.session.acknowledge(message=acked, sync=(acked is message))
+            self.unacked.popleft()
+            if acked is message:
+                break
 
     @reliable
     def reject(self, message, requeue=True):
@@ -140,4 +167,27 @@ class Reader(BaseReader):
             disposition = Disposition(RELEASED)
         else:
             disposition = Disposition(REJECTED)
+        self.forget(message)
         self.session.acknowledge(message=message, disposition=disposition)
+
+    def received(self, message):
+        """
+        Get whether the message has been received and not acknowledged.
+        :param message: A received message.
+        :type message: qpid.messaging.Message
+        :return: True if not acknowledged.
+        :rtype: bool
+        """
+        return any(m is message for m in self.unacked)
+
+    def forget(self, message):
+        """
+        Stop tracking the specified message.
+        Messages not received (or already acknowledged) are ignored.
+        :param message: A received message.
+        :type message: qpid.messaging.Message
+        """
+        for n, m in enumerate(self.unacked):
+            if m is message:
+                del self.unacked[n]
+                break
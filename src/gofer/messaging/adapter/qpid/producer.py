@@ -21,7 +21,7 @@ from logging import getLogger
 
 from qpid.messaging import Message
 
-from gofer.messaging.adapter.model import BaseSender
+from gofer.messaging.adapter.model import BaseSender, COMPRESSION
 from gofer.messaging.adapter.qpid.reliability import reliable
 from gofer.messaging.adapter.qpid.connection import Connection
 
@@ -83,7 +83,7 @@ class Sender(BaseSender):
             pass
 
     @reliable
-    def send(self, address, content, ttl=None):
+    def send(self, address, content, ttl=None, content_type=None, compression=None):
         """
         Send a message.
         :param address: An AMQP address.
@@ -92,10 +92,23 @@ class Sender(BaseSender):
         :type content: buf
         :param ttl: Time to Live (seconds)
         :type ttl: float
+        :param content_type: The (optional) content (MIME) type.
+        :type content_type: str
+        :param compression: The (optional) name of the compressor.
+        :type compression: str
         """
         sender = self.session.sender(address)
         try:
-            message = Message(content=content, durable=self.durable, ttl=ttl)
+            if compression:
+                properties = {COMPRESSION: compression}
+            else:
+                properties = None
+            message = Message(
+                content=content,
+                content_type=content_type,
+                properties=properties,
+                durable=self.durable,
+                ttl=ttl)
             sender.send(message)
             log.debug('sent (%s)', address)
         finally:
@@ -16,11 +16,17 @@
 Message authentication plumbing.
 """
 
+import os
+import hmac
+
 from base64 import b64encode, b64decode
+from collections import OrderedDict
 from hashlib import sha256
 from logging import getLogger
+from threading import RLock
 
-from gofer import ENCODING
+from gofer import ENCODING, synchronized
+from gofer.config import Config
 from gofer.messaging.model import Document, DocumentError
 
 
@@ -50,11 +56,88 @@ class ValidationFailed(DocumentError):
             details)
 
 
+class Cache(object):
+    """
+    A bounded cache of validated signatures.
+    Entries are keyed by (digest, signature) and the least recently
+    used entry is discarded when the capacity is exceeded.  Failed
+    validations are never cached.
+    :ivar capacity: The maximum number of entries.
+    :type capacity: int
+    :ivar entries: The cached (digest, signature) keys.
+    :type entries: OrderedDict
+    :ivar hits: The number of cache hits.
+    :type hits: int
+    :ivar misses: The number of cache misses.
+    :type misses: int
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        :param capacity: The maximum number of entries.
+        :type capacity: int
+        """
+        self.__mutex = RLock()
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @synchronized
+    def add(self, digest, signature):
+        """
+        Add a validated signature.
+        :param digest: An AMQP message digest.
+        :type digest: str
+        :param signature: A message signature.
+        :type signature: str
+        """
+        self.entries[(digest, signature)] = True
+        self.entries.move_to_end((digest, signature))
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    @synchronized
+    def validated(self, digest, signature):
+        """
+        Get whether the signature has been validated.
+        :param digest: An AMQP message digest.
+        :type digest: str
+        :param signature: A message signature.
+        :type signature: str
+        :return: True if cached.
+        :rtype: bool
+        """
+        key = (digest, signature)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+        else:
+            self.misses += 1
+            return False
+
+    @synchronized
+    def clear(self):
+        """
+        Discard all entries.
+        """
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
 class Authenticator(object):
     """
     Document the message authenticator API.
+    :cvar cache: An (optional) cache of validated signatures.
+        Assign a Cache to skip validation of signatures already validated.
+    :type cache: Cache
     """
 
+    cache = None
+
     def sign(self, digest):
         """
         Sign the specified message.
@@ -78,8 +161,139 @@ class Authenticator(object):
         """
         raise NotImplementedError()
 
+    def validate_all(self, signed):
+        """
+        Validate a batch of messages and signatures.
+        Override to check many signatures per call.
+        :param signed: A list of: (document, digest, signature).
+        :type signed: list
+        :return: A list containing (for each message): None when valid
+            or the ValidationFailed exception.
+        :rtype: list
+        """
+        failed = []
+        for document, digest, signature in signed:
+            try:
+                self.validate(document, digest, signature)
+                failed.append(None)
+            except ValidationFailed as de:
+                failed.append(de)
+            except Exception as e:
+                failed.append(ValidationFailed(str(e), document))
+        return failed
+
+
+class Hmac(Authenticator):
+    """
+    A symmetric HMAC-SHA256 message authenticator.
+    Signatures have the format: <key-id>:<hex-encoded HMAC> so that keys
+    may be rotated.  Messages are signed using the *signing* key and
+    validated using the key identified in the signature.  To rotate keys,
+    add the new key to all agents and clients, change the signing key and
+    then remove the old key.
+    The key file (INI) format:
+      [main]
+      key = <signing key id>
+      [keys]
+      <key id> = <secret>
+    :cvar PATH: The default key file path.
+    :type PATH: str
+    :ivar keys: The secrets by key id.
+    :type keys: dict
+    :ivar key_id: The signing key id.
+    :type key_id: str
+    """
+
+    PATH = '/etc/gofer/hmac.conf'
+
+    def __init__(self, keys=None, key_id=None):
+        """
+        :param keys: The secrets by key id.  Default: loaded from PATH (when found).
+        :type keys: dict
+        :param key_id: The signing key id.
+        :type key_id: str
+        """
+        self.keys = {}
+        self.key_id = key_id
+        if keys is not None:
+            for _id, secret in keys.items():
+                self.add(_id, secret)
+            return
+        if os.path.exists(self.PATH):
+            self.load(self.PATH)
+
+    def add(self, key_id, secret):
+        """
+        Add a key.
+        :param key_id: The key id.
+        :type key_id: str
+        :param secret: The shared secret.
+        :type secret: (str|bytes)
+        """
+        if isinstance(secret, str):
+            secret = secret.encode(ENCODING)
+        self.keys[str(key_id)] = secret
+
+    def load(self, path):
+        """
+        Load keys from the key file.
+        :param path: The path to a key (.conf) file.
+        :type path: str
+        """
+        cfg = Config(path)
+        main = cfg.get('main', {})
+        self.keys = {}
+        for _id, secret in cfg.get('keys', {}).items():
+            self.add(_id, secret)
+        self.key_id = main.get('key', self.key_id)
+        log.info('hmac: %d keys loaded from: %s', len(self.keys), path)
+
+    def sign(self, digest):
+        """
+        Sign the specified message using the signing key.
+        :param digest: An AMQP message digest.
+        :type digest: str
+        :return: The message signature.
+        :rtype: str
+        :raise KeyError: The signing key is not found.
+        """
+        key = self.keys[str(self.key_id)]
+        return ':'.join((str(self.key_id), self.hmac(key, digest)))
+
+    def validate(self, document, digest, signature):
+        """
+        Validate the specified message and signature.
+        :param document: The original signed document.
+        :type document: Document
+        :param digest: An AMQP message digest.
+        :type digest: str
+        :param signature: A message signature.
+        :type signature: str
+        :raises ValidationFailed: when message is not valid.
+        """
+        key_id, _, signature = signature.rpartition(':')
+        try:
+            key = self.keys[key_id]
+        except KeyError:
+            raise ValidationFailed('key: "%s" not found' % key_id, document)
+        if not hmac.compare_digest(self.hmac(key, digest), signature):
+            raise ValidationFailed('key: "%s" signature not matched' % key_id, document)
 
-def sign(authenticator, message):
+    @staticmethod
+    def hmac(key, digest):
+        """
+        Get the HMAC for the digest.
+        :param key: The shared secret.
+        :type key: bytes
+        :param digest: An AMQP message digest.
+        :type digest: str
+        :return: The hex encoded HMAC.
+        :rtype: str
+        """
+        return hmac.new(key, digest.encode(ENCODING), sha256).hexdigest()
+
+
+def sign(authenticator, message, codec=None):
     """
     Sign the message using the specified validator.
     signed document:
@@ -89,25 +303,24 @@ def sign(authenticator, message):
       }
     :param authenticator: A message authenticator.
     :type authenticator: Authenticator
-    :param message: A (signed) json encoded AMQP message.
-    :rtype message: str
+    :param message: A (signed) encoded AMQP message.
+    :rtype message: (str|bytes)
+    :param codec: The (optional) codec used to encode the signed document.
+    :type codec: gofer.messaging.codec.Codec
     """
     if not authenticator:
         return message
     try:
-        h = sha256()
-        h.update(message.encode(ENCODING))
-        digest = h.hexdigest()
-        signature = authenticator.sign(digest)
+        signature = authenticator.sign(digest(message))
         signed = Document(message=message, signature=encode(signature))
-        message = signed.dump()
+        message = signed.dump(codec=codec)
     except Exception as e:
         log.info(str(e))
         log.debug(message, exc_info=True)
     return message
 
 
-def validate(authenticator, message):
+def validate(authenticator, message, codec=None):
     """
     Validate the document using the specified validator.
     signed document:
@@ -117,19 +330,25 @@ def validate(authenticator, message):
       }
     :param authenticator: A message authenticator.
     :type authenticator: Authenticator
-    :param message: A json encoded AMQP message.
-    :rtype message: str
+    :param message: An encoded AMQP message.
+    :rtype message: (str|bytes|memoryview)
+    :param codec: The (optional) codec used to decode the message.
+    :type codec: gofer.messaging.codec.Codec
     :return: The authenticated document.
     :rtype: Document
     :raises ValidationFailed: when message is not valid.
     """
-    document, original, signature = peal(message)
+    document, original, signature = peal(message, codec)
     try:
         if authenticator:
-            h = sha256()
-            h.update(original.encode(ENCODING))
-            digest = h.hexdigest()
-            authenticator.validate(document, digest, decode(signature))
+            _digest = digest(original)
+            _signature = decode(signature)
+            cache = _cache(authenticator)
+            if cache is not None and cache.validated(_digest, _signature):
+                return document
+            authenticator.validate(document, _digest, _signature)
+            if cache is not None:
+                cache.add(_digest, _signature)
         return document
     except ValidationFailed as de:
         de.document = document
@@ -143,7 +362,73 @@ def validate(authenticator, message):
         raise de
 
 
-def peal(message):
+def validate_all(authenticator, messages, codec=None):
+    """
+    Validate a batch of messages using the specified validator.
+    Signatures not found in the authenticator cache are validated
+    using a single call to Authenticator.validate_all().
+    :param authenticator: A message authenticator.
+    :type authenticator: Authenticator
+    :param messages: A list of encoded AMQP messages.
+    :type messages: list
+    :param codec: The (optional) codec used to decode the messages.
+    :type codec: gofer.messaging.codec.Codec
+    :return: A list containing (for each message): the authenticated
+        document or the ValidationFailed exception.
+    :rtype: list
+    """
+    validated = []
+    pending = []
+    cache = _cache(authenticator)
+    for message in messages:
+        document, original, signature = peal(message, codec)
+        validated.append(document)
+        if not authenticator:
+            continue
+        _digest = digest(original)
+        _signature = decode(signature)
+        if cache is not None and cache.validated(_digest, _signature):
+            continue
+        pending.append((len(validated) - 1, (document, _digest, _signature)))
+    if not pending:
+        return validated
+    signed = [p[1] for p in pending]
+    try:
+        if isinstance(authenticator, Authenticator):
+            failed = authenticator.validate_all(signed)
+        else:
+            failed = Authenticator.validate_all(authenticator, signed)
+    except Exception as e:
+        log.debug(str(e), exc_info=True)
+        failed = [ValidationFailed(str(e)) for _ in signed]
+    if len(failed) != len(signed):
+        details = 'validate_all(): %d results for %d documents' % (len(failed), len(signed))
+        failed = [ValidationFailed(details) for _ in signed]
+    for (index, (document, _digest, _signature)), de in zip(pending, failed):
+        if de is None:
+            if cache is not None:
+                cache.add(_digest, _signature)
+            continue
+        de.document = document
+        log.info(str(de))
+        validated[index] = de
+    return validated
+
+
+def _cache(authenticator):
+    """
+    Get the signature cache assigned to the authenticator.
+    :param authenticator: A message authenticator.
+    :type authenticator: Authenticator
+    :return: The cache or None.
+    :rtype: Cache
+    """
+    cache = getattr(authenticator, 'cache', None)
+    if isinstance(cache, Cache):
+        return cache
+
+
+def peal(message, codec=None):
     """
     Peal the incoming message. The message one of:
      - A signed document:
@@ -156,38 +441,62 @@ def peal(message):
     - The document to be passed along.
     - The original (signed) AMQP message to be validated.
     - The signature.
-    :param message: A json encoded AMQP message.
-    :type message: str
+    The message is decoded (using the codec) into a document.  When the
+    document is a signed envelope, the embedded message is decoded separately
+    to produce the returned document.  Otherwise, the decoded document is
+    returned and the message itself is the original.
+    :param message: An encoded AMQP message.
+    :type message: (str|bytes|memoryview)
+    :param codec: The (optional) codec used to decode the message.
+    :type codec: gofer.messaging.codec.Codec
     :return: tuple of: (document, original, signature)
     :rtype: tuple
     """
-    document = load(message)
+    document = load(message, codec)
     signature = document.signature
     original = document.message
     if original:
-        document = load(original)
+        document = load(original, codec)
     else:
         original = message
     return document, original, signature
 
 
-def load(json):
+def load(encoded, codec=None):
     """
-    Load the json document.
+    Load the encoded document.
     Decoding errors are intentionally ignored.
-    :param json: A json string.
-    :type json: str
+    :param encoded: An encoded string.
+    :type encoded: (str|bytes|memoryview)
+    :param codec: The (optional) codec.  Default: JSON.
+    :type codec: gofer.messaging.codec.Codec
     :return: The loaded document.
     :rtype: Document
     """
     document = Document()
     try:
-        document.load(json)
+        document.load(encoded, codec)
     except (TypeError, ValueError):
         pass
     return document
 
 
+def digest(message):
+    """
+    Get the digest of the specified message.
+    Encoded messages (bytes) and memory views are digested in place.
+    :param message: An encoded AMQP message.
+    :type message: (str|bytes|memoryview)
+    :return: The hex encoded SHA-256 digest.
+    :rtype: str
+    """
+    h = sha256()
+    if isinstance(message, str):
+        message = message.encode(ENCODING)
+    h.update(message)
+    return h.hexdigest()
+
+
 def encode(signature):
     if signature:
         return str(
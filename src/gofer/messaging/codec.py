@@ -0,0 +1,175 @@
+# Copyright (c) 2026 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public
+# License as published by the Free Software Foundation; either version
+# 2 of the License (GPLv2) or (at your option) any later version.
+# There is NO WARRANTY for this software, express or implied,
+# including the implied warranties of MERCHANTABILITY,
+# NON-INFRINGEMENT, or FITNESS FOR A PARTICULAR PURPOSE. You should
+# have received a copy of GPLv2 along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+
+"""
+Wire codecs.
+Documents are encoded using the codec registered for the content type
+carried in the message properties.  JSON is the default and is used
+when the content type is not specified or not registered.
+"""
+
+from logging import getLogger
+from threading import RLock
+
+from gofer import ENCODING
+from gofer.compat import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+log = getLogger(__name__)
+
+
+class Codec(object):
+    """
+    A wire codec.
+    :cvar CONTENT_TYPE: The content (MIME) type.
+    :type CONTENT_TYPE: str
+    :cvar DEFAULT: The codec is the default.
+    :type DEFAULT: bool
+    :cvar codecs: Registered codecs by content type.
+    :type codecs: dict
+    """
+
+    CONTENT_TYPE = None
+    DEFAULT = False
+
+    __lock = RLock()
+    codecs = {}
+
+    @staticmethod
+    def register(codec):
+        """
+        Register a codec.
+        :param codec: The codec to register.
+        :type codec: Codec
+        """
+        with Codec.__lock:
+            Codec.codecs[codec.CONTENT_TYPE] = codec
+
+    @staticmethod
+    def find(content_type=None):
+        """
+        Find the codec registered for the content type.
+        :param content_type: A content (MIME) type.
+        :type content_type: str
+        :return: The registered codec or the default (JSON)
+            when not specified or not registered.
+        :rtype: Codec
+        """
+        with Codec.__lock:
+            try:
+                return Codec.codecs[content_type]
+            except KeyError:
+                if content_type:
+                    log.debug('codec: %s, not registered', content_type)
+                return JSON
+
+    def encode(self, thing, default=None, sort_keys=False):
+        """
+        Encode the specified object.
+        :param thing: The object to encode.
+        :type thing: object
+        :param default: Called for objects not natively encoded.
+        :type default: callable
+        :param sort_keys: Sort dictionary keys (when supported).
+        :type sort_keys: bool
+        :return: The encoded object.
+        :rtype: (str|bytes)
+        """
+        raise NotImplementedError()
+
+    def decode(self, encoded):
+        """
+        Decode the specified string.
+        :param encoded: An encoded object.
+        :type encoded: (str|bytes|memoryview)
+        :return: The decoded object.
+        :rtype: object
+        :raise ValueError: When not decoded.
+        """
+        raise NotImplementedError()
+
+    def __str__(self):
+        return self.CONTENT_TYPE
+
+
+class Json(Codec):
+    """
+    The JSON (default) codec.
+    Encoded strings (bytes) and memory views are decoded directly
+    without an intermediate copy.
+    """
+
+    CONTENT_TYPE = 'application/json'
+    DEFAULT = True
+
+    def encode(self, thing, default=None, sort_keys=False):
+        return json.dumps(thing, sort_keys=sort_keys, default=default)
+
+    def decode(self, encoded):
+        if not isinstance(encoded, str):
+            encoded = str(encoded, ENCODING)
+        return json.loads(encoded)
+
+
+class Msgpack(Codec):
+    """
+    The MessagePack codec.
+    Requires the *msgpack* package.  Keys are not sorted.
+    """
+
+    CONTENT_TYPE = 'application/msgpack'
+
+    def encode(self, thing, default=None, sort_keys=False):
+        return msgpack.packb(thing, default=default, use_bin_type=True)
+
+    def decode(self, encoded):
+        return msgpack.unpackb(encoded, raw=False)
+
+
+class Cbor(Codec):
+    """
+    The CBOR codec.
+    Requires the *cbor2* package.  Keys are sorted using
+    canonical encoding.
+    """
+
+    CONTENT_TYPE = 'application/cbor'
+
+    def encode(self, thing, default=None, sort_keys=False):
+        def hook(encoder, value):
+            if default is None:
+                raise TypeError('%r is not CBOR serializable' % value)
+            encoder.encode(default(value))
+        return cbor2.dumps(thing, default=hook, canonical=sort_keys)
+
+    def decode(self, encoded):
+        return cbor2.loads(encoded)
+
+
+JSON = Json()
+
+Codec.register(JSON)
+
+if msgpack is not None:
+    Codec.register(Msgpack())
+
+if cbor2 is not None:
+    Codec.register(Cbor())
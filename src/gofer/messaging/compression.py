@@ -0,0 +1,243 @@
+# Copyright (c) 2026 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public
+# License as published by the Free Software Foundation; either version
+# 2 of the License (GPLv2) or (at your option) any later version.
+# There is NO WARRANTY for this software, express or implied,
+# including the implied warranties of MERCHANTABILITY,
+# NON-INFRINGEMENT, or FITNESS FOR A PARTICULAR PURPOSE. You should
+# have received a copy of GPLv2 along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+
+"""
+Message body compression.
+Bodies are compressed by the producer using the registered compressor
+named in the message *compression* property.
+"""
+
+import zlib
+
+from logging import getLogger
+from threading import RLock
+
+from gofer import ENCODING
+from gofer.messaging.model import Document, DocumentError
+
+try:
+    import lz4.frame as lz4
+except ImportError:
+    lz4 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+log = getLogger(__name__)
+
+
+# messages smaller (bytes) are not compressed
+THRESHOLD = 65536
+
+# the largest (bytes) decompressed message body
+LIMIT = 16777216
+
+
+class CompressionError(DocumentError):
+
+    CODE = 'model.compression'
+    DESCRIPTION = 'MODEL: message decompression failed'
+    DETAILS = 'compression:%s, %s'
+
+    def __init__(self, name, reason):
+        """
+        :param name: The compressor name.
+        :type name: str
+        :param reason: The reason decompression failed.
+        :type reason: str
+        """
+        DocumentError.__init__(
+            self,
+            self.CODE,
+            self.DESCRIPTION,
+            Document(),
+            self.DETAILS % (name, reason))
+
+
+class Compressor(object):
+    """
+    A message body compressor.
+    :cvar NAME: The name used in the message *compression* property.
+    :type NAME: str
+    :cvar compressors: Registered compressors by name.
+    :type compressors: dict
+    """
+
+    NAME = None
+
+    __lock = RLock()
+    compressors = {}
+
+    @staticmethod
+    def register(compressor):
+        """
+        Register a compressor.
+        :param compressor: The compressor to register.
+        :type compressor: Compressor
+        """
+        with Compressor.__lock:
+            Compressor.compressors[compressor.NAME] = compressor
+
+    @staticmethod
+    def find(name):
+        """
+        Find the compressor registered by name.
+        :param name: A compressor name.
+        :type name: str
+        :return: The registered compressor or None.
+        :rtype: Compressor
+        """
+        with Compressor.__lock:
+            return Compressor.compressors.get(name)
+
+    @staticmethod
+    def decompress(name, data, limit=LIMIT):
+        """
+        Decompress using the compressor registered by name.
+        Decompression stops once the body exceeds the limit so that
+        a small message cannot inflate into unbounded memory.
+        :param name: A compressor name.
+        :type name: str
+        :param data: The compressed message body.
+        :type data: (bytes|memoryview)
+        :param limit: The largest (bytes) decompressed body.  0 = unlimited.
+        :type limit: int
+        :return: The decompressed body.
+        :rtype: bytes
+        :raise CompressionError: When not registered, decompression failed
+            or the decompressed body exceeds the limit.
+        """
+        compressor = Compressor.find(name)
+        if compressor is None:
+            raise CompressionError(name, 'not supported')
+        try:
+            inflated = compressor.inflate(data, limit + 1 if limit else -1)
+        except Exception as e:
+            raise CompressionError(name, str(e))
+        if limit and len(inflated) > limit:
+            raise CompressionError(name, 'exceeds limit: %d' % limit)
+        return inflated
+
+    def compress(self, data, level=None):
+        """
+        Compress the message body.
+        :param data: The message body.
+        :type data: (str|bytes)
+        :param level: The compression level.  None = the compressor default.
+        :type level: int
+        :return: The compressed body.
+        :rtype: bytes
+        """
+        if isinstance(data, str):
+            data = data.encode(ENCODING)
+        return self.deflate(data, level)
+
+    def deflate(self, data, level):
+        """
+        Compress the encoded message body.
+        :param data: The message body.
+        :type data: bytes
+        :param level: The compression level.  None = the compressor default.
+        :type level: int
+        :return: The compressed body.
+        :rtype: bytes
+        """
+        raise NotImplementedError()
+
+    def inflate(self, data, max_length=-1):
+        """
+        Decompress the message body.
+        :param data: The compressed message body.
+        :type data: (bytes|memoryview)
+        :param max_length: The maximum (bytes) returned.  -1 = unlimited.
+            Decompression stops once reached.
+        :type max_length: int
+        :return: The decompressed body.
+        :rtype: bytes
+        """
+        raise NotImplementedError()
+
+    def __str__(self):
+        return self.NAME
+
+
+class Zlib(Compressor):
+    """
+    The zlib (deflate) compressor.
+    """
+
+    NAME = 'zlib'
+
+    def deflate(self, data, level):
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+        return zlib.compress(data, level)
+
+    def inflate(self, data, max_length=-1):
+        decompressor = zlib.decompressobj()
+        inflated = decompressor.decompress(data, max(max_length, 0))
+        if max_length < 0 or len(inflated) < max_length:
+            if not decompressor.eof:
+                raise ValueError('incomplete or truncated stream')
+        return inflated
+
+
+class Lz4(Compressor):
+    """
+    The LZ4 (frame) compressor.
+    Requires the *lz4* package.
+    """
+
+    NAME = 'lz4'
+
+    def deflate(self, data, level):
+        return lz4.compress(data, compression_level=level or 0)
+
+    def inflate(self, data, max_length=-1):
+        decompressor = lz4.LZ4FrameDecompressor()
+        return decompressor.decompress(data, max_length=max_length)
+
+
+class Zstd(Compressor):
+    """
+    The Zstandard compressor.
+    Requires the *zstandard* package.
+    """
+
+    NAME = 'zstd'
+
+    def deflate(self, data, level):
+        compressor = zstandard.ZstdCompressor(level=level or 3)
+        return compressor.compress(data)
+
+    def inflate(self, data, max_length=-1):
+        decompressor = zstandard.ZstdDecompressor()
+        inflated = bytearray()
+        with decompressor.stream_reader(data) as reader:
+            while max_length < 0 or len(inflated) < max_length:
+                size = max_length - len(inflated) if max_length > 0 else 65536
+                chunk = reader.read(size)
+                if not chunk:
+                    break
+                inflated.extend(chunk)
+        return bytes(inflated)
+
+
+Compressor.register(Zlib())
+
+if lz4 is not None:
+    Compressor.register(Lz4())
+
+if zstandard is not None:
+    Compressor.register(Zstd())
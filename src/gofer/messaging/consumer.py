@@ -9,20 +9,277 @@
 # have received a copy of GPLv2 along with this software; if not, see
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
-from time import sleep
+from collections import deque
+from time import sleep, time
 from logging import getLogger
+from threading import RLock
 
+from gofer import synchronized
 from gofer.common import Thread, released
 from gofer.messaging.model import DocumentError
+from gofer.messaging.compression import LIMIT
+from gofer.messaging.adapter.connect import Backoff
 from gofer.messaging.adapter.model import Reader, NotFound
+from gofer.threadpool import ThreadPool
 
 
 log = getLogger(__name__)
 
 
+# delay (seconds) after unexpected errors
+DELAY = 1
+MAX_DELAY = 30
+
+
+class Batch(object):
+    """
+    Batched (cumulative) message acknowledgement.
+    Messages are acknowledged after (limit) messages have been added
+    or the oldest has been pending for (latency) seconds.
+    Delivery is at-least-once.  Pending messages are redelivered by
+    the broker when the consumer fails before they are acknowledged.
+    :ivar limit: The maximum number of pending messages.  0 = disabled.
+    :type limit: int
+    :ivar latency: The maximum time (seconds) a message may be pending.
+    :type latency: float
+    :ivar last: The last message added.
+    :type last: gofer.messaging.adapter.model.Message
+    :ivar count: The number of pending messages.
+    :type count: int
+    :ivar started: The time the oldest pending message was added.
+    :type started: float
+    """
+
+    def __init__(self, limit=0, latency=0):
+        """
+        :param limit: The maximum number of pending messages.  0 = disabled.
+        :type limit: int
+        :param latency: The maximum time (seconds) a message may be pending.
+        :type latency: float
+        """
+        self.limit = limit
+        self.latency = latency
+        self.last = None
+        self.count = 0
+        self.started = 0
+
+    @property
+    def expired(self):
+        """
+        Get whether the oldest pending message has exceeded the latency.
+        :rtype: bool
+        """
+        return self.count > 0 and time() - self.started >= self.latency
+
+    def wait(self, timeout):
+        """
+        Get the read timeout adjusted so that pending messages
+        are acknowledged within the latency.
+        :param timeout: The requested timeout (seconds).
+        :type timeout: float
+        :return: The adjusted timeout (seconds).
+        :rtype: float
+        """
+        if not self.count:
+            return timeout
+        remaining = self.started + self.latency - time()
+        return max(0, min(timeout, remaining))
+
+    def add(self, message):
+        """
+        Add a processed message.
+        Acknowledged immediately when batching is disabled.
+        :param message: A processed message.
+        :type message: gofer.messaging.adapter.model.Message
+        """
+        if self.limit < 2:
+            message.ack()
+            return
+        if not self.count:
+            self.started = time()
+        self.last = message
+        self.count += 1
+        if self.count >= self.limit or self.expired:
+            self.flush()
+
+    def flush(self):
+        """
+        Acknowledge all pending messages.
+        """
+        message = self.last
+        self.clear()
+        if message is not None:
+            message.ack(True)
+
+    def clear(self):
+        """
+        Discard pending messages.
+        """
+        self.last = None
+        self.count = 0
+        self.started = 0
+
+
+class Tracked(object):
+    """
+    A message tracked by the pipeline.
+    :ivar message: The received message.
+    :type message: gofer.messaging.adapter.model.Message
+    :ivar done: The message has been dispatched.
+    :type done: bool
+    """
+
+    def __init__(self, message):
+        """
+        :param message: The received message.
+        :type message: gofer.messaging.adapter.model.Message
+        """
+        self.message = message
+        self.done = False
+
+
+class Pipeline(object):
+    """
+    Received documents are dispatched by a pool of (concurrency) threads
+    fed by a bounded queue.  Dispatched messages are reported as completed
+    in the order received so they may be acknowledged (by the reader thread)
+    in order.  Documents are dispatched inline when concurrency < 2.
+    :cvar POLL: The read timeout (seconds) used while dispatching.
+    :type POLL: float
+    :ivar concurrency: The number of dispatch threads.
+    :type concurrency: int
+    :ivar pool: The dispatch thread pool.
+    :type pool: ThreadPool
+    :ivar pending: Tracked messages in the order received.
+    :type pending: deque
+    """
+
+    POLL = 0.1
+
+    def __init__(self, concurrency=1):
+        """
+        :param concurrency: The number of dispatch threads.
+        :type concurrency: int
+        """
+        self.__mutex = RLock()
+        self.concurrency = concurrency
+        self.pool = None
+        self.pending = deque()
+
+    @property
+    def busy(self):
+        """
+        Get whether messages are being dispatched by the pool.
+        :rtype: bool
+        """
+        return self.pool is not None and len(self.pending) > 0
+
+    def wait(self, timeout):
+        """
+        Get the read timeout adjusted so that completed messages
+        are acknowledged promptly.
+        :param timeout: The requested timeout (seconds).
+        :type timeout: float
+        :return: The adjusted timeout (seconds).
+        :rtype: float
+        """
+        if self.busy:
+            return min(timeout, self.POLL)
+        else:
+            return timeout
+
+    def start(self):
+        """
+        Start the dispatch threads.
+        """
+        if self.concurrency < 2:
+            return
+        self.pool = ThreadPool(self.concurrency, self.concurrency)
+        self.pool.start()
+
+    def shutdown(self):
+        """
+        Shutdown the dispatch threads.
+        Queued documents are discarded and dispatching completed.
+        """
+        pool = self.pool
+        self.pool = None
+        if pool is not None:
+            pool.shutdown()
+
+    def put(self, dispatch, message, document):
+        """
+        Dispatch a received document.
+        Blocks when the queue is full.
+        :param dispatch: The dispatch function.
+        :type dispatch: callable
+        :param message: The received message.
+        :type message: gofer.messaging.adapter.model.Message
+        :param document: The received document.
+        :type document: gofer.messaging.model.Document
+        """
+        tracked = Tracked(message)
+        self.append(tracked)
+        if self.pool is None:
+            self._dispatch(dispatch, tracked, document)
+        else:
+            self.pool.run(self._dispatch, dispatch, tracked, document)
+
+    @synchronized
+    def append(self, tracked):
+        """
+        Track a received message.
+        :param tracked: A tracked message.
+        :type tracked: Tracked
+        """
+        self.pending.append(tracked)
+
+    @synchronized
+    def completed(self):
+        """
+        Get the dispatched messages received before any still being dispatched.
+        :return: List of completed messages in the order received.
+        :rtype: list
+        """
+        completed = []
+        while self.pending and self.pending[0].done:
+            tracked = self.pending.popleft()
+            completed.append(tracked.message)
+        return completed
+
+    @synchronized
+    def clear(self):
+        """
+        Discard tracked messages.
+        """
+        self.pending.clear()
+
+    @staticmethod
+    def _dispatch(dispatch, tracked, document):
+        """
+        Dispatch the document and mark the message as done.
+        :param dispatch: The dispatch function.
+        :type dispatch: callable
+        :param tracked: A tracked message.
+        :type tracked: Tracked
+        :param document: The received document.
+        :type document: gofer.messaging.model.Document
+        """
+        try:
+            dispatch(document)
+        finally:
+            tracked.done = True
+
+
 class ConsumerThread(Thread):
     """
     An AMQP (abstract) consumer.
+    :ivar batch: Batched message acknowledgement.
+    :type batch: Batch
+    :ivar pipeline: The document dispatch pipeline.
+    :type pipeline: Pipeline
+    :ivar backoff: The delay after unexpected errors.
+    :type backoff: Backoff
     """
 
     def __init__(self, node, url, wait=3):
@@ -39,6 +296,11 @@ class ConsumerThread(Thread):
         self.node = node
         self.wait = wait
         self.authenticator = None
+        self.decompression_limit = LIMIT
+        self.prefetch = 0
+        self.batch = Batch()
+        self.pipeline = Pipeline()
+        self.backoff = Backoff(DELAY, MAX_DELAY)
         self.reader = None
         self.setDaemon(True)
 
@@ -55,11 +317,15 @@ class ConsumerThread(Thread):
         """
         self.reader = Reader(self.node, self.url)
         self.reader.authenticator = self.authenticator
+        self.reader.decompression_limit = self.decompression_limit
+        self.reader.prefetch = self.prefetch
+        self.pipeline.start()
         self.open()
         try:
             while not Thread.aborted():
                 self.read()
         finally:
+            self.pipeline.shutdown()
             self.close()
 
     def open(self):
@@ -69,6 +335,7 @@ class ConsumerThread(Thread):
         while not Thread.aborted():
             try:
                 self.reader.open()
+                self.backoff.reset()
                 break
             except NotFound as le:
                 log.debug(str(le))
@@ -76,12 +343,17 @@ class ConsumerThread(Thread):
                 self.no_route()
             except Exception:
                 log.exception(self.getName())
-                sleep(30)
+                sleep(self.backoff.next())
 
     def close(self):
         """
-        Close the reader.
+        Acknowledge pending messages and close the reader.
         """
+        try:
+            self.acknowledge()
+            self.batch.flush()
+        except Exception:
+            log.exception(self.getName())
         try:
             self.reader.close()
         except Exception:
@@ -92,15 +364,18 @@ class ConsumerThread(Thread):
         Read and process incoming documents.
         """
         try:
-            wait = self.wait
+            wait = self.pipeline.wait(self.batch.wait(self.wait))
             reader = self.reader
             message, document = reader.next(wait)
+            self.backoff.reset()
             if message is None:
                 # wait expired
+                self.acknowledge()
+                self.batch.flush()
                 return
             log.debug('{%s} read: %s', self.getName(), document)
-            self.dispatch(document)
-            message.ack()
+            self.pipeline.put(self.dispatch, message, document)
+            self.acknowledge()
         except DocumentError as de:
             self.rejected(de.code, de.description, de.document, de.details)
         except NotFound as le:
@@ -109,9 +384,16 @@ class ConsumerThread(Thread):
             self.no_route()
         except Exception:
             log.exception(self.getName())
-            sleep(30)
+            sleep(self.backoff.next())
             self.repair()
 
+    def acknowledge(self):
+        """
+        Acknowledge messages completed by the pipeline.
+        """
+        for message in self.pipeline.completed():
+            self.batch.add(message)
+
     def rejected(self, code, description, document, details):
         """
         Called to process the received (invalid) document.
@@ -130,7 +412,10 @@ class ConsumerThread(Thread):
     def repair(self):
         """
         Repair the consumer.
+        Pending messages are discarded and will be redelivered.
         """
+        self.pipeline.clear()
+        self.batch.clear()
         self.close()
         self.open()
 
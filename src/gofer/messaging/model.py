@@ -12,7 +12,7 @@
 from logging import getLogger
 
 from gofer import Options
-from gofer.compat import json
+from gofer.messaging.codec import Codec
 
 
 log = getLogger(__name__)
@@ -99,39 +99,66 @@ def validate(document):
 class Document(Options):
     """
     Extends the dict-like object that also provides
-    JSON serialization.
+    serialization using a wire codec (default: JSON).
     """
 
-    def load(self, s):
+    def load(self, s, codec=None):
         """
-        Load using a json string.
-        :param s: A json encoded string.
-        :type s: str
+        Load using an encoded string.
+        The decoded dictionary is adopted as-is by an empty document.
+        :param s: An encoded string.
+        :type s: (str|bytes|memoryview)
+        :param codec: The (optional) codec.  Default: JSON.
+        :type codec: gofer.messaging.codec.Codec
         """
-        d = json.loads(s)
-        self.__dict__.update(d)
+        codec = codec or Codec.find()
+        d = codec.decode(s)
+        if not isinstance(d, dict):
+            raise ValueError(s)
+        if self.__dict__:
+            self.__dict__.update(d)
+        else:
+            self.__dict__ = d
         return self
 
-    def dump(self):
+    def dump(self, sort_keys=True, codec=None):
         """
-        Dump to a json string.
-        :return: A json encoded string.
-        :rtype: str
+        Dump to an encoded string.
+        Nested documents (Options) are encoded directly by the
+        encoder *default* hook.
+        :param sort_keys: Sort dictionary keys (when supported).
+        :type sort_keys: bool
+        :param codec: The (optional) codec.  Default: JSON.
+        :type codec: gofer.messaging.codec.Codec
+        :return: An encoded string.
+        :rtype: (str|bytes)
         """
-        def fn(thing):
-            if isinstance(thing, Options):
-                thing = dict(thing.__dict__)
-                for k, v in thing.items():
-                    thing[k] = fn(v)
-                return thing
-            if isinstance(thing, dict):
-                thing = dict(thing)
-                for k, v in thing.items():
-                    thing[k] = fn(v)
-                return thing
-            if isinstance(thing, (tuple, list)):
-                thing = [fn(e) for e in thing]
-                return thing
-            return thing
-        d = fn(self)
-        return json.dumps(d, sort_keys=True)
+        codec = codec or Codec.find()
+        return codec.encode(self.__dict__, default=Document._default, sort_keys=sort_keys)
+
+    def validate(self, codec=None):
+        """
+        Validate the document can be dumped.
+        Keys are not sorted and the encoded string is discarded.
+        :param codec: The (optional) codec.  Default: JSON.
+        :type codec: gofer.messaging.codec.Codec
+        :raise TypeError: When the document contains an object
+            that cannot be encoded.
+        :raise ValueError: When a circular reference is detected.
+        """
+        codec = codec or Codec.find()
+        codec.encode(self.__dict__, default=Document._default)
+
+    @staticmethod
+    def _default(thing):
+        """
+        The encoder hook for objects that are not natively encoded.
+        :param thing: An object.
+        :type thing: object
+        :return: The dictionary of documents (Options).
+        :rtype: dict
+        :raise TypeError: When not a document.
+        """
+        if isinstance(thing, Options):
+            return thing.__dict__
+        raise TypeError('%r is not serializable' % thing)
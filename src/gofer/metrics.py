@@ -74,6 +74,57 @@ class Timer(object):
         self.stop()
 
 
+class Usage(object):
+    """
+    Process resource usage.
+    :ivar wall: The elapsed (wall) time in seconds.
+    :type wall: float
+    :ivar utime: The user CPU time in seconds.
+    :type utime: float
+    :ivar stime: The system CPU time in seconds.
+    :type stime: float
+    :ivar maxrss: The maximum resident set size in kilobytes.
+    :type maxrss: int
+    :ivar nvcsw: The number of voluntary context switches.
+    :type nvcsw: int
+    :ivar nivcsw: The number of involuntary context switches.
+    :type nivcsw: int
+    """
+
+    def __init__(self, rusage=None, wall=0):
+        """
+        :param rusage: The resource usage reported by os.wait4().
+        :type rusage: resource.struct_rusage
+        :param wall: The elapsed (wall) time in seconds.
+        :type wall: float
+        """
+        self.wall = wall
+        self.utime = 0.0
+        self.stime = 0.0
+        self.maxrss = 0
+        self.nvcsw = 0
+        self.nivcsw = 0
+        if rusage is not None:
+            self.utime = rusage.ru_utime
+            self.stime = rusage.ru_stime
+            self.maxrss = rusage.ru_maxrss
+            self.nvcsw = rusage.ru_nvcsw
+            self.nivcsw = rusage.ru_nivcsw
+
+    def dict(self):
+        return dict(self.__dict__)
+
+    def __str__(self):
+        return \
+            'wall={:.3f} user={:.3f} sys={:.3f} maxrss={} kB csw={}/{}'.format(
+                self.wall,
+                self.utime,
+                self.stime,
+                self.maxrss,
+                self.nvcsw,
+                self.nivcsw)
+
+
 class Memory(object):
 
     @staticmethod
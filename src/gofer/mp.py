@@ -13,19 +13,40 @@
 # Jeff Ortel <jortel@redhat.com>
 #
 
+import gc
 import os
 import pickle
 import struct
 
 from errno import EPIPE
+from logging import getLogger
 from signal import SIGKILL
 from select import epoll, EPOLLIN, EPOLLHUP
 
 
+log = getLogger(__name__)
+
+
 class PipeBroken(Exception):
     pass
 
 
+def freeze():
+    """
+    Provide a copy-on-write friendly memory layout for forking.
+    Garbage is collected and all surviving objects are moved to the
+    permanent generation (python 3.7+) and ignored by future collections.
+    The cyclic GC is disabled in forked processes so that collections
+    do not touch (and dirty) the inherited pages.
+    """
+    gc.collect()
+    try:
+        gc.freeze()
+    except AttributeError:
+        log.warning('gc.freeze() not supported')
+    Process.collect = False
+
+
 class Process(object):
     """
     Linux Process.
@@ -37,13 +58,20 @@ class Process(object):
     :type kwargs: dict
     :ivar pid: The process ID.
     :type pid: int
+    :ivar rusage: The resource usage collected by wait().
+    :type rusage: resource.struct_rusage
+    :cvar collect: The cyclic GC is enabled in the forked process.
+    :type collect: bool
     """
 
+    collect = True
+
     def __init__(self, main, *args, **kwargs):
         self.main = main
         self.args = args
         self.kwargs = kwargs
         self.pid = 0
+        self.rusage = None
 
     def start(self):
         """
@@ -52,6 +80,8 @@ class Process(object):
         pid = os.fork()
         if pid == 0:
             self.pid = os.getpid()
+            if not self.collect:
+                gc.disable()
             self.run()
         else:
             self.pid = pid
@@ -75,10 +105,14 @@ class Process(object):
     def wait(self):
         """
         Wait for the process to terminate.
+        The resource usage is collected.
         Swallows raised exceptions.
+        :return: tuple of: (pid, status)
+        :rtype: tuple
         """
         try:
-            return os.waitpid(self.pid, 0)
+            pid, status, self.rusage = os.wait4(self.pid, 0)
+            return pid, status
         except OSError:
             pass
 
@@ -203,12 +237,16 @@ class Reader(Endpoint):
         else:
             raise EOFError()
 
-    def poll(self):
+    def poll(self, timeout=-1):
         """
         Blocks until data is available to be read or the
         writing end has been closed.
+        :param timeout: The (optional) timeout (seconds).  -1 = forever.
+        :type timeout: float
+        :return: True when ready.
+        :rtype: bool
         """
-        self.epoll.poll()
+        return len(self.epoll.poll(timeout)) > 0
 
 
 class Writer(Endpoint):
@@ -96,6 +96,8 @@ class RequestConsumer(Consumer):
         try:
             with Producer(self.url) as producer:
                 producer.authenticator = self.authenticator
+                producer.codec = request.codec
+                producer.compression = request.compression
                 producer.send(
                     address,
                     sn=request.sn,
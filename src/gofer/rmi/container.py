@@ -36,6 +36,12 @@ class Container(object):
           (int) Seconds to wait for a synchronous reply (default:90).
       - authenticator
           (Authenticator) A message authenticator.
+      - codec
+          (str) The content type of the wire codec (default: application/json).
+          Replies are sent using the same codec.
+      - compression
+          (str) The name of the compressor (zlib|lz4|zstd) used to compress
+          large messages.  Replies are compressed using the same compressor.
       - progress
           (callable) A progress callback.
       - exchange
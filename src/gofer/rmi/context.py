@@ -12,10 +12,11 @@
 #
 # Jeff Ortel <jortel@redhat.com>
 #
+from collections import deque
 from logging import getLogger
+from time import time
 
 from gofer.common import Local
-from gofer.rmi.tracker import Tracker
 from gofer.messaging import Producer
 
 
@@ -31,7 +32,9 @@ class Context(object):
     :ivar progress: Provides progress reporting.
     :type progress: Progress
     :ivar cancelled: Provides cancellation status.
-    :type cancelled: Cancelled
+    :type cancelled: gofer.rmi.tracker.Token
+    :ivar usage: The resource usage of a forked call.
+    :type usage: gofer.metrics.Usage
     """
 
     _current = Local(sn=None, progress=None, cancelled=None)
@@ -64,11 +67,99 @@ class Context(object):
         :param progress: Provides progress reporting.
         :type  progress: Progress
         :param cancelled: Provides cancellation status.
-        :type  cancelled: Cancelled
+        :type  cancelled: gofer.rmi.tracker.Token
         """
         self.sn = sn
         self.progress = progress
         self.cancelled = cancelled
+        self.usage = None
+
+
+class Throttle(object):
+    """
+    Progress report rate limiting.
+    Reports that exceed the limits are coalesced. Only the latest
+    state is kept (pending) and sent by the next accepted report
+    or by flush().
+    :ivar interval: The minimum interval (seconds) between reports.
+    :type interval: float
+    :ivar rate: The maximum number of reports per second.
+    :type rate: int
+    :ivar sent: The timestamps of reports sent within the last second.
+    :type sent: deque
+    :ivar pending: A report has been coalesced and not yet sent.
+    :type pending: bool
+    """
+
+    def __init__(self, interval=0, rate=0):
+        """
+        :param interval: The minimum interval (seconds) between reports.
+            0 = unlimited.
+        :type interval: float
+        :param rate: The maximum number of reports per second.
+            0 = unlimited.
+        :type rate: int
+        """
+        self.interval = interval
+        self.rate = rate
+        self.sent = deque()
+        self.pending = False
+
+    def accept(self, final=False):
+        """
+        Get whether a report should be sent now.
+        Final reports are always accepted.
+        :param final: The report is final (100%).
+        :type final: bool
+        :return: True if the report should be sent.
+        :rtype: bool
+        """
+        now = time()
+        if final or self._open(now):
+            self._sent(now)
+            return True
+        else:
+            self.pending = True
+            return False
+
+    def flush(self):
+        """
+        Get whether a coalesced report needs to be sent.
+        :return: True if the pending report should be sent.
+        :rtype: bool
+        """
+        if self.pending:
+            self._sent(time())
+            return True
+        else:
+            return False
+
+    def _open(self, now):
+        """
+        Get whether a report sent at the specified time
+        is within the limits.
+        :param now: The current time.
+        :type now: float
+        :rtype: bool
+        """
+        while self.sent and now - self.sent[0] >= 1.0:
+            self.sent.popleft()
+        if self.interval and self.sent:
+            if now - self.sent[-1] < self.interval:
+                return False
+        if self.rate:
+            if len(self.sent) >= self.rate:
+                return False
+        return True
+
+    def _sent(self, now):
+        """
+        Record a sent report.
+        :param now: The current time.
+        :type now: float
+        """
+        self.pending = False
+        self.sent.append(now)
 
 
 class Progress(object):
@@ -78,6 +169,8 @@ class Progress(object):
     :type request: gofer.messaging.Document
     :ivar producer: An open AMQP producer.
     :type producer: gofer.messaging.Producer
+    :ivar throttle: Report rate limiting.
+    :type throttle: Throttle
     :ivar total: The total work units.
     :type total: int
     :ivar completed: The completed work units.
@@ -86,20 +179,42 @@ class Progress(object):
     :type details: object
     """
 
-    def __init__(self, request, producer):
+    def __init__(self, request, producer, throttle=None):
         """
         :param request: The current request.
         :type request: gofer.messaging.Document
         :param producer: An open AMQP producer.
         :type producer: gofer.messaging.Producer
+        :param throttle: Report rate limiting.
+        :type throttle: Throttle
         """
         self.request = request
         self.producer = producer
+        self.throttle = throttle or Throttle()
         self.total = 0
         self.completed = 0
         self.details = {}
 
+    @property
+    def final(self):
+        return 0 < self.total <= self.completed
+
     def report(self):
+        """
+        Send the progress report.
+        The report is coalesced when throttled.
+        """
+        if self.throttle.accept(self.final):
+            self.send()
+
+    def flush(self):
+        """
+        Send the coalesced progress report (if any).
+        """
+        if self.throttle.flush():
+            self.send()
+
+    def send(self):
         """
         Send the progress report.
         """
@@ -120,31 +235,3 @@ class Progress(object):
         except Exception:
             log.exception('Send: progress, failed')
 
-
-class Cancelled(object):
-    """
-    A callable added to the Context and used
-    by plugin methods to check for cancellation.
-    :ivar sn: The current request serial number.
-    :type sn: str
-    :ivar tracker: The cancellation tracker.
-    :type tracker: Tracker
-    """
-
-    def __init__(self, sn):
-        """
-        :param sn: The current request serial number.
-        :type sn: str
-        """
-        self.sn = sn
-        self.tracker = Tracker()
-
-    def __call__(self):
-        return self.tracker.cancelled(self.sn)
-
-    def __del__(self):
-        try:
-            self.tracker.remove(self.sn)
-        except KeyError:
-            # already cleaned up
-            pass
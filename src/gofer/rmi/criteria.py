@@ -9,6 +9,11 @@
 # have received a copy of GPLv2 along with this software; if not, see
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
+from collections import OrderedDict
+from threading import RLock
+
+from gofer.compat import json
+
 
 class InvalidOperator(Exception):
     pass
@@ -35,20 +40,80 @@ class Criteria(object):
         """
         raise NotImplementedError()
 
+    def compile(self):
+        """
+        Compile into a predicate.
+        :return: A function used to match a locator.
+        :rtype: callable
+        """
+        return self.match
+
     def __call__(self, locator):
         return self.match(locator)
 
 
+class Compiled(Criteria):
+    """
+    Compiled criteria.
+    Matched using a (flat) predicate compiled from the criteria object graph.
+    :ivar criteria: The compiled criteria object graph.
+    :type criteria: Criteria
+    """
+
+    def __init__(self, criteria):
+        """
+        :param criteria: The criteria to compile.
+        :type criteria: Criteria
+        """
+        super(Compiled, self).__init__(criteria)
+        # predicate replaces the method
+        self.match = criteria.compile()
+
+    def compile(self):
+        return self.match
+
+
 class Match(Criteria):
+    """
+    Match on locator (dict) fields.  A field value may be a Criteria
+    used to match the value.  Fields not defined in the locator are matched.
+    """
 
     def match(self, locator):
         if not self._valid(locator):
             return False
         for k, v in self.criteria.items():
-            if v != locator.get(k, v):
+            if k not in locator:
+                continue
+            if isinstance(v, Criteria):
+                if not v.match(locator[k]):
+                    return False
+                continue
+            if v != locator[k]:
                 return False
         return True
 
+    def compile(self):
+        if not isinstance(self.criteria, dict) or not self.criteria:
+            return lambda locator: False
+        fields = tuple(
+            (k, v.compile() if isinstance(v, Criteria) else None, v)
+            for k, v in self.criteria.items())
+
+        def match(locator):
+            if not isinstance(locator, dict) or not locator:
+                return False
+            for k, fn, v in fields:
+                if k not in locator:
+                    continue
+                if fn is not None:
+                    if not fn(locator[k]):
+                        return False
+                elif v != locator[k]:
+                    return False
+            return True
+        return match
+
     def _valid(self, locator):
         if not isinstance(self.criteria, dict):
             return False
@@ -66,30 +131,65 @@ class Equal(Criteria):
     def match(self, locator):
         return locator == self.criteria
 
+    def compile(self):
+        criteria = self.criteria
+        return lambda locator: locator == criteria
+
 
 class NotEqual(Criteria):
 
     def match(self, locator):
         return locator != self.criteria
 
+    def compile(self):
+        criteria = self.criteria
+        return lambda locator: locator != criteria
+
 
 class Greater(Criteria):
 
     def match(self, locator):
         return locator > self.criteria
 
+    def compile(self):
+        criteria = self.criteria
+        return lambda locator: locator > criteria
+
 
 class Less(Criteria):
 
     def match(self, locator):
         return locator < self.criteria
 
+    def compile(self):
+        criteria = self.criteria
+        return lambda locator: locator < criteria
+
 
 class In(Criteria):
 
     def match(self, locator):
         return locator in self.criteria
 
+    def compile(self):
+        criteria = self.criteria
+        if isinstance(criteria, (list, tuple, set, frozenset)):
+            try:
+                criteria = frozenset(criteria)
+            except TypeError:
+                # not hashable
+                return self.match
+
+            def match(locator):
+                try:
+                    return locator in criteria
+                except TypeError:
+                    # not hashable
+                    return False
+            return match
+        else:
+            return self.match
+
 
 class And(Criteria):
 
@@ -97,6 +197,16 @@ class And(Criteria):
         left, right = self.criteria
         return left.match(locator) and right.match(locator)
 
+    def compile(self):
+        predicates = tuple(c.compile() for c in flatten(self))
+
+        def match(locator):
+            for fn in predicates:
+                if not fn(locator):
+                    return False
+            return True
+        return match
+
 
 class Or(Criteria):
 
@@ -104,13 +214,42 @@ class Or(Criteria):
         left, right = self.criteria
         return left.match(locator) or right.match(locator)
 
+    def compile(self):
+        predicates = tuple(c.compile() for c in flatten(self))
+
+        def match(locator):
+            for fn in predicates:
+                if fn(locator):
+                    return True
+            return False
+        return match
+
+
+def flatten(criteria):
+    """
+    Flatten nested (And|Or) criteria of the same type.
+    :param criteria: An (And|Or) criteria.
+    :type criteria: Criteria
+    :return: The list of operands.
+    :rtype: list
+    """
+    flat = []
+    for operand in criteria.criteria:
+        if type(operand) is type(criteria):
+            flat.extend(flatten(operand))
+        else:
+            flat.append(operand)
+    return flat
+
 
 class Builder:
     """
     Build a criteria object graph based on dictionary representations.
+    Compiled criteria are cached by the canonical (JSON) representation.
     These representations can be nested.
     Examples:
       {'match':{'id':100}}
+      {'match':{'id':{'in':[100,200]}}}
       {'eq':10}
       {'neq':10}
       {'in':[1,2]}
@@ -119,8 +258,17 @@ class Builder:
       {'and':({'gt':1},{'lt':10})}
       {'or':({'eq':10},{'in':[1,2]})}
       {'or':({'eq':10},{'or':({'eq':1},{'eq':2})}
+    :cvar CACHE: The maximum number of cached compiled criteria.
+    :type CACHE: int
+    :cvar compiled: Compiled criteria by canonical representation.
+    :type compiled: OrderedDict
     """
 
+    CACHE = 1000
+
+    __lock = RLock()
+    compiled = OrderedDict()
+
     METHODS = {
         'match': Match,
         'eq': Equal,
@@ -132,6 +280,37 @@ class Builder:
         'or': Or,
     }
 
+    def compile(self, criteria):
+        """
+        Build and compile a Criteria object based on the specified
+        dict representation.
+        :param criteria: The criteria to compile.
+        :type criteria: dict
+        :return: The compiled criteria or None when empty.
+        :rtype: Compiled
+        :raise Exception, on invalid criteria.
+        """
+        try:
+            key = json.dumps(criteria, sort_keys=True)
+        except (TypeError, ValueError):
+            key = None
+        with Builder.__lock:
+            compiled = Builder.compiled.get(key)
+            if compiled is not None:
+                Builder.compiled.move_to_end(key)
+                return compiled
+        built = self.build(criteria)
+        if built is None:
+            return built
+        compiled = Compiled(built)
+        if key is None:
+            return compiled
+        with Builder.__lock:
+            Builder.compiled[key] = compiled
+            while len(Builder.compiled) > Builder.CACHE:
+                Builder.compiled.popitem(last=False)
+        return compiled
+
     def build(self, criteria):
         """
         Build a Criteria object based on the specified
@@ -145,6 +324,8 @@ class Builder:
             if self._criteria(v):
                 v = self._resolve(v)
             m = self.METHODS.get(k)
+            if m is Match and isinstance(v, dict):
+                return m(dict((f, self._resolve(x)) for f, x in v.items()))
             if m:
                 return m(self._resolve(v))
             else:
@@ -24,6 +24,7 @@ from gofer import NAME, inspection
 from gofer.common import Options, new
 from gofer import collation
 from gofer.messaging import Document
+from gofer.messaging.codec import Codec
 from gofer.rmi.model import ALL
 
 from logging import getLogger
@@ -178,16 +179,18 @@ class Return(Document):
     """
 
     @classmethod
-    def succeed(cls, x):
+    def succeed(cls, x, codec=None):
         """
         Return successful
         :param x: The returned value.
         :type x: any
+        :param codec: The (optional) codec used to validate.
+        :type codec: gofer.messaging.codec.Codec
         :return: A return document.
         :rtype: Return
         """
         inst = Return(retval=x)
-        inst.dump()  # validate
+        inst.validate(codec)
         return inst
 
     @classmethod
@@ -242,7 +245,7 @@ class Return(Document):
                       xclass=xclass.__name__,
                       xstate=state,
                       xargs=args)
-        inst.dump()  # validate
+        inst.validate()
         return inst
 
 
@@ -260,61 +263,89 @@ class RMI(object):
     :type request: Request
     :ivar catalog: A dict of class mappings.
     :type catalog: dict
+    :ivar codec: The codec used to validate the result.
+    :type codec: gofer.messaging.codec.Codec
     """
 
-    def __init__(self, request, catalog):
+    def __init__(self, request, catalog, codec=None, table=None):
         """
         :param request: The request document.
         :type request: Request
         :param catalog: A dict of class mappings.
         :type catalog: dict
+        :param codec: The (optional) codec used to validate the result.
+        :type codec: gofer.messaging.codec.Codec
+        :param table: The (optional) dispatch table.
+        :type table: dict
         """
         self.name = '.'.join((request.classname, request.method))
-        self.target = self.find_target(request, catalog)
+        self.target = self.find_target(request, catalog, table)
         self.request = request
+        self.codec = codec
 
     @staticmethod
-    def find_target(request, catalog):
+    def find_target(request, catalog, table=None):
         """
-        Get an instance of the class or module specified in
+        Get the member of the class or module specified in the request
+        (using the dispatch table or the catalog) bound to an instance.
+        :param request: The request document.
+        :type request: Request
+        :param catalog: A dict of class mappings.
+        :type catalog: dict
+        :param table: The (optional) dispatch table.
+        :type table: dict
+        :return: The bound member.
+        :rtype: gofer.collation.Member
+        """
+        member = None
+        if table is not None:
+            member = table.get('.'.join((request.classname, request.method)))
+        if member is None:
+            member = RMI.find_member(request, catalog)
+        return RMI.construct(request, member)
+
+    @staticmethod
+    def find_member(request, catalog):
+        """
+        Get the member of the class or module specified in
         the request using the catalog.
         :param request: The request document.
         :type request: Request
         :param catalog: A dict of class mappings.
         :type catalog: dict
-        :return: An instance.
-        :rtype: (class|module)
+        :return: The member.
+        :rtype: gofer.collation.Member
         """
         try:
             namespace = catalog[request.classname]
         except KeyError:
             raise NamespaceNotFound(name=request.classname)
 
-        namespace = RMI.construct(request, namespace)
-
         try:
-            target = namespace[request.method]
+            return namespace[request.method]
         except collation.MemberNotFound:
             raise MemberNotFound(
                 ns=request.classname,
                 method=request.method)
 
-        return target
-
     @staticmethod
-    def construct(request, namespace):
+    def construct(request, member):
         """
-        Construct the namespace using the constructor properties
-        in the request.
+        Bind the member to an instance of its class (or module) constructed
+        using the constructor properties in the request.
 
         Args:
             request (Document): A request.
-            namespace (gofer.collation.Container): A class or module.
+            member (gofer.collation.Member): A method or function.
+
+        Returns:
+            gofer.collation.Member: The bound member.
         """
         cntr = request.cntr
         if not cntr:
             cntr = ([], {})
-        return namespace(*cntr[0], **cntr[1])
+        inst = member.container.construct(*cntr[0], **cntr[1])
+        return member.bind(inst)
 
     def __call__(self):
         """
@@ -329,7 +360,7 @@ class RMI(object):
                 *self.request.args or [],
                 **self.request.kwargs or {})
             retval = model()
-            return Return.succeed(retval)
+            return Return.succeed(retval, self.codec)
         except Exception:
             log.exception(str(self.target))
             return Return.exception()
@@ -348,6 +379,9 @@ class Dispatcher:
     The remote invocation dispatcher.
     :ivar catalog: The (catalog) of target classes.
     :type catalog: dict
+    :ivar table: The dispatch table of members by: <class>.<method>.
+        Built when the catalog is updated.
+    :type table: dict
     """
 
     @staticmethod
@@ -366,6 +400,24 @@ class Dispatcher:
         :type classes: list
         """
         self.catalog = dict([(c.__name__, c) for c in classes or []])
+        self.table = self.build(self.catalog)
+
+    @staticmethod
+    def build(catalog):
+        """
+        Build the dispatch table.
+        :param catalog: The (catalog) of target classes and modules.
+        :type catalog: dict
+        :return: The dispatch table of members by: <class>.<method>.
+        :rtype: dict
+        """
+        table = {}
+        for name, container in catalog.items():
+            if not isinstance(container, collation.Container):
+                continue
+            for member in container:
+                table['.'.join((name, member.name))] = member
+        return table
 
     def provides(self, name):
         """
@@ -389,7 +441,7 @@ class Dispatcher:
             self.log(document)
             request = Request(document.request)
             log.debug('request: %s', request)
-            method = RMI(request, self.catalog)
+            method = RMI(request, self.catalog, Codec.find(document.codec), self.table)
             log.debug('method: %s', method)
             return method()
         except Exception:
@@ -399,10 +451,9 @@ class Dispatcher:
     def __iadd__(self, other):
         if isinstance(other, Dispatcher):
             self.catalog.update(other.catalog)
-            return self
         if isinstance(other, list):
             self.catalog.update({c.name: c for c in other})
-            return self
+        self.table = self.build(self.catalog)
         return self
 
     def __getitem__(self, key):
@@ -410,6 +461,7 @@ class Dispatcher:
 
     def __setitem__(self, key, value):
         self.catalog[key] = value
+        self.table = self.build(self.catalog)
 
     def __iter__(self):
         _list = []
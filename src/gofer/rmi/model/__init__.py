@@ -17,15 +17,17 @@
 RMI call models.
 """
 
-from gofer.rmi.model import direct, fork
+from gofer.rmi.model import direct, fork, worker
 
 # call models
 DIRECT = 'direct'
 FORK = 'fork'
+WORKER = 'worker'
 
 ALL = {
     DIRECT: direct.Call,
     FORK: fork.Call,
+    WORKER: worker.Call,
 }
 
 
@@ -21,7 +21,7 @@ from threading import RLock
 from time import sleep
 
 from gofer import Thread, synchronized
-from gofer.rmi.context import Context
+from gofer.rmi.context import Context, Throttle
 from gofer.rmi.model import protocol
 from gofer.mp import PipeBroken, Writer as _Writer
 
@@ -55,8 +55,13 @@ class Call(protocol.Call):
             monitor.start()
             context = Context.current()
             context.cancelled = self._not_cancelled()
-            context.progress = Progress(pipe.writer)
-            result = self.method(*self.args, **self.kwargs)
+            throttle = context.progress.throttle
+            throttle = Throttle(throttle.interval, throttle.rate)
+            context.progress = Progress(pipe.writer, throttle)
+            try:
+                result = self.method(*self.args, **self.kwargs)
+            finally:
+                context.progress.flush()
             reply = protocol.Result(result)
             reply.send(pipe.writer)
         except PipeBroken:
@@ -95,6 +100,8 @@ class Progress(object):
     Provides progress reporting to the parent through the pipe.
     :ivar pipe: A message pipe.
     :type pipe: gofer.mp.Writer
+    :ivar throttle: Report rate limiting.
+    :type throttle: Throttle
     :ivar total: The total work units.
     :type total: int
     :ivar completed: The completed work units.
@@ -103,19 +110,41 @@ class Progress(object):
     :type details: object
     """
 
-    def __init__(self, pipe):
+    def __init__(self, pipe, throttle=None):
         """
         :param pipe: A message pipe.
         :type  pipe: gofer.mp.Writer
+        :param throttle: Report rate limiting.
+        :type throttle: Throttle
         """
         self.pipe = pipe
+        self.throttle = throttle or Throttle()
         self.total = 0
         self.completed = 0
         self.details = {}
 
+    @property
+    def final(self):
+        return 0 < self.total <= self.completed
+
     def report(self):
         """
         Report progress.
+        The report is coalesced when throttled.
+        """
+        if self.throttle.accept(self.final):
+            self.send()
+
+    def flush(self):
+        """
+        Send the coalesced progress report (if any).
+        """
+        if self.throttle.flush():
+            self.send()
+
+    def send(self):
+        """
+        Send the progress report.
         """
         payload = protocol.ProgressPayload(
             total=self.total,
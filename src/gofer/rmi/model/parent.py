@@ -18,6 +18,7 @@ from time import sleep
 
 from gofer.mp import Process, Pipe
 from gofer.common import Thread
+from gofer.metrics import Timer, Usage
 from gofer.rmi.context import Context
 from gofer.rmi.model import protocol
 from gofer.rmi.model.child import Call as Target
@@ -42,13 +43,17 @@ class Call(protocol.Call):
           - Fork
           - Start the monitor.
           - Read and dispatch reply messages.
+          - Collect the resource usage.
         :return: Whatever method returned.
         """
         pipe = Pipe()
         target = Target(self.method, *self.args, **self.kwargs)
         child = Process(target, pipe)
-        monitor = Monitor(Context.current(), child)
+        context = Context.current()
+        monitor = Monitor(context, child)
+        timer = Timer()
         try:
+            timer.start()
             child.start()
             monitor.start()
             pipe.writer.close()
@@ -58,6 +63,22 @@ class Call(protocol.Call):
             pipe.close()
             monitor.stop()
             child.wait()
+            timer.stop()
+            self.account(context, child, timer)
+
+    def account(self, context, child, timer):
+        """
+        Log the resource usage of the child and update the context.
+        :param context: The RMI context.
+        :type context: Context
+        :param child: The (terminated) child process.
+        :type child: Process
+        :param timer: The call timer.
+        :type timer: Timer
+        """
+        usage = Usage(child.rusage, timer.duration())
+        log.info('%s() usage: %s', self.method, usage)
+        context.usage = usage
 
     def read(self, pipe):
         """
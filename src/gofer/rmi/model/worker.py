@@ -0,0 +1,352 @@
+#
+# Copyright (c) 2017 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU Lesser General Public
+# License as published by the Free Software Foundation; either version
+# 2 of the License (LGPLv2) or (at your option) any later version.
+# There is NO WARRANTY for this software, express or implied,
+# including the implied warranties of MERCHANTABILITY,
+# NON-INFRINGEMENT, or FITNESS FOR A PARTICULAR PURPOSE. You should
+# have received a copy of LGPLv2 along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/lgpl-2.0.txt.
+#
+# Jeff Ortel <jortel@redhat.com>
+#
+
+"""
+The worker call model.
+Calls are routed to a long-lived child process (worker) per plugin.
+The worker is forked on the first call and restarted as needed.
+"""
+
+import gc
+import os
+
+from logging import getLogger
+from threading import RLock
+
+from gofer import synchronized
+from gofer.collation import Class
+from gofer.mp import Process, Pipe, PipeBroken
+from gofer.rmi.context import Context, Throttle
+from gofer.rmi.model import protocol
+from gofer.rmi.model.child import Progress
+from gofer.rmi.model.parent import Monitor
+
+
+log = getLogger(__name__)
+
+
+class Call(protocol.Call):
+    """
+    The parent-side of the RMI call invoked in the plugin worker.
+    """
+
+    def __call__(self):
+        """
+        Invoke the RMI as follows:
+          - Find (or start) the plugin worker.
+          - Send the request.
+          - Read and dispatch reply messages.
+        :return: Whatever method returned.
+        """
+        context = Context.current()
+        fninfo = self.method.fninfo
+        worker = Worker.find(fninfo.plugin)
+        request = Request(
+            self.method,
+            context.sn,
+            context.progress.throttle,
+            self.args,
+            self.kwargs)
+        return worker(request)
+
+
+class Request(protocol.Message):
+    """
+    A request sent to the worker.
+    The function is pickled by reference and the constructed
+    instance (if any) by value.
+    :ivar fn: The function to be invoked.
+    :type fn: function
+    :ivar inst: The constructed instance passed as *self*.
+    :type inst: object
+    :ivar bound: The function is a method.
+    :type bound: bool
+    :ivar sn: The request serial number.
+    :type sn: str
+    :ivar interval: The progress throttle interval.
+    :type interval: float
+    :ivar rate: The progress throttle rate.
+    :type rate: int
+    :ivar args: Passed arguments.
+    :type args: tuple
+    :ivar kwargs: Passed keyword arguments.
+    :type kwargs: dict
+    """
+
+    def __init__(self, method, sn, throttle, args, kwargs):
+        """
+        :param method: The method to be invoked.
+        :type method: gofer.collation.Member
+        :param sn: The request serial number.
+        :type sn: str
+        :param throttle: The progress throttle.
+        :type throttle: gofer.rmi.context.Throttle
+        :param args: Passed arguments.
+        :type args: tuple
+        :param kwargs: Passed keyword arguments.
+        :type kwargs: dict
+        """
+        self.fn = method.impl
+        self.bound = isinstance(method.container, Class)
+        self.inst = method.inst if self.bound else None
+        self.sn = sn
+        self.interval = throttle.interval
+        self.rate = throttle.rate
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, pipe):
+        """
+        Perform RMI on the worker-side as follows:
+          - Set the RMI context.
+          - Invoke the method
+          - Send result: retval, progress, raised exception.
+        :param pipe: The reply pipe.
+        :type  pipe: gofer.mp.Writer
+        :raise PipeBroken: When the parent has terminated.
+        """
+        throttle = Throttle(self.interval, self.rate)
+        progress = Progress(pipe, throttle)
+        context = Context(self.sn, progress, Request._not_cancelled)
+        Context.set(context)
+        try:
+            try:
+                if self.bound:
+                    result = self.fn(self.inst, *self.args, **self.kwargs)
+                else:
+                    result = self.fn(*self.args, **self.kwargs)
+            finally:
+                progress.flush()
+            reply = protocol.Result(result)
+            reply.send(pipe)
+        except PipeBroken:
+            raise
+        except Exception as e:
+            log.exception(str(e))
+            reply = protocol.Raised(e)
+            reply.send(pipe)
+        finally:
+            Context.set()
+
+    @staticmethod
+    def _not_cancelled():
+        return False
+
+
+class Main(object):
+    """
+    The worker process main.
+    Read and invoke requests until the parent closes the request pipe.
+    :ivar worker: The (parent) worker object.
+    :type worker: Worker
+    """
+
+    def __init__(self, worker):
+        """
+        :param worker: The (parent) worker object.
+        :type worker: Worker
+        """
+        self.worker = worker
+
+    def __call__(self, requests, replies):
+        """
+        The worker main loop.
+        The cyclic GC is (re)enabled because the worker is long-lived.
+        :param requests: The request pipe.
+        :type requests: gofer.mp.Pipe
+        :param replies: The reply pipe.
+        :type replies: gofer.mp.Pipe
+        """
+        gc.enable()
+        requests.writer.close()
+        replies.reader.close()
+        Worker.detach(self.worker)
+        while True:
+            try:
+                request = Request.read(requests.reader)
+                request(replies.writer)
+            except protocol.End:
+                log.debug('Parent closed.')
+                break
+            except PipeBroken:
+                log.debug('Pipe broken.')
+                break
+
+
+class Worker(object):
+    """
+    A long-lived child process used to invoke RMI calls.
+    Calls are serialized.  The process is (re)started as needed.
+    :cvar POLL: The health check interval (seconds).
+    :type POLL: float
+    :cvar workers: Workers by plugin.
+    :type workers: dict
+    :ivar plugin: The plugin for which calls are invoked.
+    :type plugin: gofer.agent.plugin.Plugin
+    :ivar process: The worker process.
+    :type process: Process
+    :ivar requests: The request pipe.
+    :type requests: Pipe
+    :ivar replies: The reply pipe.
+    :type replies: Pipe
+    """
+
+    POLL = 1.0
+
+    __lock = RLock()
+    workers = {}
+
+    @staticmethod
+    def find(plugin):
+        """
+        Find (or create) the worker for the specified plugin.
+        :param plugin: A plugin.
+        :type plugin: gofer.agent.plugin.Plugin
+        :return: The worker.
+        :rtype: Worker
+        """
+        with Worker.__lock:
+            worker = Worker.workers.get(plugin)
+            if worker is None:
+                worker = Worker(plugin)
+                Worker.workers[plugin] = worker
+            return worker
+
+    @staticmethod
+    def release(plugin):
+        """
+        Stop and discard the worker for the specified plugin.
+        :param plugin: A plugin.
+        :type plugin: gofer.agent.plugin.Plugin
+        """
+        with Worker.__lock:
+            worker = Worker.workers.pop(plugin, None)
+        if worker is not None:
+            worker.stop()
+
+    @staticmethod
+    def detach(worker):
+        """
+        Called in the worker process to close the endpoints
+        inherited from the other workers.
+        :param worker: The worker running in this process.
+        :type worker: Worker
+        """
+        for w in list(Worker.workers.values()):
+            if w is worker or w.process is None:
+                continue
+            w.requests.writer.close()
+            w.replies.reader.close()
+
+    def __init__(self, plugin):
+        """
+        :param plugin: A plugin.
+        :type plugin: gofer.agent.plugin.Plugin
+        """
+        self.__mutex = RLock()
+        self.plugin = plugin
+        self.process = None
+        self.requests = None
+        self.replies = None
+
+    @property
+    def alive(self):
+        """
+        Health check.
+        :return: True if the worker process is running.
+        :rtype: bool
+        """
+        if self.process is None:
+            return False
+        try:
+            pid, _ = os.waitpid(self.process.pid, os.WNOHANG)
+            return pid == 0
+        except OSError:
+            return False
+
+    @synchronized
+    def start(self):
+        """
+        Start (fork) the worker process.
+        """
+        with Worker.__lock:
+            self.requests = Pipe()
+            self.replies = Pipe()
+            self.process = Process(Main(self), self.requests, self.replies)
+            self.process.start()
+            self.requests.reader.close()
+            self.replies.writer.close()
+        log.info('worker:%d, started for: %s', self.process.pid, self.plugin)
+
+    @synchronized
+    def stop(self):
+        """
+        Stop the worker process.
+        """
+        if self.process is None:
+            return
+        self.requests.writer.close()
+        self.replies.reader.close()
+        if self.alive:
+            self.process.terminate()
+            self.process.wait()
+        log.info('worker:%d, stopped', self.process.pid)
+        self.process = None
+
+    @synchronized
+    def restart(self):
+        """
+        Restart the worker process.
+        """
+        self.stop()
+        self.start()
+
+    @synchronized
+    def __call__(self, request):
+        """
+        Send the request to the worker and process replies.
+        The worker is (re)started as needed.
+        :param request: A request.
+        :type request: Request
+        :return: Whatever method returned.
+        """
+        if not self.alive:
+            self.restart()
+        monitor = Monitor(Context.current(), self.process)
+        try:
+            monitor.start()
+            request.send(self.requests.writer)
+            return self.read()
+        finally:
+            monitor.stop()
+
+    def read(self):
+        """
+        Read the reply pipe and dispatch messages until *End* is raised.
+        The worker health is checked while waiting.
+        :return: Whatever method returned.
+        """
+        pipe = self.replies.reader
+        while True:
+            try:
+                if not pipe.poll(self.POLL):
+                    if not self.alive:
+                        log.warning('worker:%d, terminated', self.process.pid)
+                        raise protocol.End()
+                    continue
+                reply = protocol.Reply.read(pipe)
+                reply()
+            except protocol.End as end:
+                return end.result
@@ -156,6 +156,14 @@ class Policy(object):
     def authenticator(self):
         return self.options.authenticator
 
+    @property
+    def codec(self):
+        return self.options.codec
+
+    @property
+    def compression(self):
+        return self.options.compression
+
     @property
     def reply(self):
         return self.options.reply
@@ -310,6 +318,8 @@ class Trigger:
         """
         with Producer(self._policy.url) as producer:
             producer.authenticator = self._policy.authenticator
+            producer.codec = self._policy.codec
+            producer.compression = self._policy.compression
             producer.send(
                 self._policy.address,
                 self._policy.ttl,
@@ -14,18 +14,32 @@ Request tracker classes.
 """
 import os
 
-from threading import RLock
+from collections import OrderedDict
+from threading import Event, RLock
 
 from gofer import Singleton, synchronized, NAME
-from gofer.common import mkdir
+from gofer.common import mkdir, unlink
+from gofer.rmi.criteria import Criteria, Compiled, Match, Equal, In, And, Or
 
 
 class Tracker(metaclass=Singleton):
     """
     Request tracker used to track information about
     active RMI requests.
+    A cancellation token is created for each tracked request and set
+    when the request is cancelled.
+    Fields of the locator (RMI request *data*) may be declared indexed.
+    Criteria matching indexed fields are resolved using the index rather
+    than evaluated against every tracked request.  Criteria are evaluated
+    against a snapshot of the candidates outside of the mutex, and checking
+    cancellation does not use the mutex so that cancelled() never waits
+    on find().
     :ivar __all: All known requests by serial number.
     :type __all: dict
+    :ivar __tokens: Cancellation tokens by serial number.
+    :type __tokens: dict
+    :ivar __index: Indexes by field name.
+    :type __index: dict
     :ivar __cancelled: Cancelled requests.
     :type __cancelled: Canceled
     :ivar __mutex: The object mutex.
@@ -34,9 +48,26 @@ class Tracker(metaclass=Singleton):
 
     def __init__(self):
         self.__all = dict()
+        self.__tokens = dict()
+        self.__index = dict()
         self.__cancelled = Canceled()
         self.__mutex = RLock()
 
+    @synchronized
+    def index(self, *names):
+        """
+        Declare locator fields to be indexed.
+        :param names: A list of field names.
+        :type names: list
+        """
+        for name in names:
+            if name in self.__index:
+                continue
+            index = Index(name)
+            for sn, locator in self.__all.items():
+                index.add(sn, locator)
+            self.__index[name] = index
+
     @synchronized
     def add(self, sn, locator):
         """
@@ -46,10 +77,38 @@ class Tracker(metaclass=Singleton):
         :param locator:  The object used by find() to match
             on RMI requests.
         :type locator: object
+        :return: The cancellation token.
+        :rtype: Token
         """
+        self.remove_index(sn)
         self.__all[sn] = locator
+        for index in self.__index.values():
+            index.add(sn, locator)
+        token = self.__tokens.get(sn)
+        if token is None:
+            token = Token(sn)
+            self.__tokens[sn] = token
+        if sn in self.__cancelled:
+            token.set()
+        return token
 
     @synchronized
+    def token(self, sn):
+        """
+        Get the cancellation token for a request.
+        :param sn: An RMI serial number.
+        :type sn: str
+        :return: The token.  An (untracked) token when the
+            request is not tracked.
+        :rtype: Token
+        """
+        token = self.__tokens.get(sn)
+        if token is None:
+            token = Token(sn)
+            if sn in self.__cancelled:
+                token.set()
+        return token
+
     def find(self, criteria):
         """
         Find serial numbers matching user defined (any) data.
@@ -59,11 +118,95 @@ class Tracker(metaclass=Singleton):
         :rtype: list
         """
         matched = []
-        for sn, locator in self.__all.items():
+        for sn, locator in self.candidates(criteria):
             if criteria.match(locator):
                 matched.append(sn)
         return matched
 
+    def find_all(self, criteria):
+        """
+        Find serial numbers matching any of the criteria.
+        Tracked requests are evaluated in one pass.
+        :param criteria: A list of objects used to match RMI requests.
+        :type criteria: list
+        :return: The list of matching serial numbers.
+        :rtype: list
+        """
+        matched = []
+        for sn, locator in self.candidates(*criteria):
+            for c in criteria:
+                if c.match(locator):
+                    matched.append(sn)
+                    break
+        return matched
+
+    @synchronized
+    def candidates(self, *criteria):
+        """
+        Get a snapshot of the requests that may match any of the criteria.
+        :param criteria: A list of objects used to match RMI requests.
+        :type criteria: list
+        :return: A list of: (sn, locator).
+        :rtype: list
+        """
+        planned = set()
+        for c in criteria:
+            found = self.plan(c)
+            if found is None:
+                return list(self.__all.items())
+            planned |= found
+        return [(sn, self.__all[sn]) for sn in planned]
+
+    def plan(self, criteria):
+        """
+        Resolve the criteria using the indexes.
+        :param criteria: The object used to match RMI requests.
+        :type criteria: gofer.rmi.criteria.Criteria
+        :return: The set of candidate serial numbers or None
+            when all tracked requests must be evaluated.
+        :rtype: set
+        """
+        if isinstance(criteria, Compiled):
+            return self.plan(criteria.criteria)
+        if isinstance(criteria, Match) and isinstance(criteria.criteria, dict):
+            planned = None
+            for name, value in criteria.criteria.items():
+                index = self.__index.get(name)
+                if index is None:
+                    continue
+                try:
+                    if isinstance(value, In):
+                        if not isinstance(value.criteria, (list, tuple, set, frozenset)):
+                            continue
+                        found = index.find(*value.criteria)
+                    elif isinstance(value, Equal):
+                        found = index.find(value.criteria)
+                    elif isinstance(value, Criteria):
+                        # not resolved by the index
+                        continue
+                    else:
+                        found = index.find(value)
+                except TypeError:
+                    # not hashable
+                    continue
+                if planned is None:
+                    planned = found
+                else:
+                    planned &= found
+            return planned
+        if isinstance(criteria, And):
+            left, right = [self.plan(c) for c in criteria.criteria]
+            if left is None:
+                return right
+            if right is None:
+                return left
+            return left & right
+        if isinstance(criteria, Or):
+            left, right = [self.plan(c) for c in criteria.criteria]
+            if left is None or right is None:
+                return None
+            return left | right
+
     @synchronized
     def cancel(self, sn):
         """
@@ -76,14 +219,37 @@ class Tracker(metaclass=Singleton):
         if sn in self.__all:
             if sn not in self.__cancelled:
                 self.__cancelled.add(sn)
+                self.__tokens[sn].set()
                 return sn
         else:
             raise Exception('serial number (%s), not-found' % sn)
 
     @synchronized
+    def cancel_all(self, sn_list):
+        """
+        Notify the tracker that RMI requests have been cancelled.
+        Serial numbers not found are ignored.  The cancelled requests
+        are persisted in one write.
+        :param sn_list: A list of RMI serial numbers.
+        :type sn_list: list
+        :return: The cancelled serial numbers (if not already cancelled).
+        :rtype: list
+        """
+        cancelled = []
+        for sn in sn_list:
+            if sn in self.__all and sn not in self.__cancelled:
+                cancelled.append(sn)
+        cancelled = list(OrderedDict.fromkeys(cancelled))
+        self.__cancelled.add_all(cancelled)
+        for sn in cancelled:
+            self.__tokens[sn].set()
+        return cancelled
+
     def cancelled(self, sn):
         """
         Get whether an RMI request has been cancelled.
+        Not synchronized; set membership is atomic.
+        Methods should use the token (in the context) instead.
         :param sn: An RMI serial number.
         :type sn: str
         :return: True if cancelled.
@@ -98,22 +264,183 @@ class Tracker(metaclass=Singleton):
         :param sn: An RMI serial number.
         :type sn: str
         """
+        self.remove_index(sn)
         self.__all.pop(sn, 0)
+        self.__tokens.pop(sn, 0)
         self.__cancelled.delete(sn)
 
+    def remove_index(self, sn):
+        """
+        Remove a tracked request from the indexes.
+        :param sn: An RMI serial number.
+        :type sn: str
+        """
+        try:
+            locator = self.__all[sn]
+        except KeyError:
+            return
+        for index in self.__index.values():
+            index.remove(sn, locator)
+
+
+class Token(Event):
+    """
+    A request cancellation token.
+    Set when the request is cancelled.  Called to check
+    cancellation (as the context *cancelled*).
+    :ivar sn: An RMI serial number.
+    :type sn: str
+    """
+
+    def __init__(self, sn):
+        """
+        :param sn: An RMI serial number.
+        :type sn: str
+        """
+        super(Token, self).__init__()
+        self.sn = sn
+
+    def __call__(self):
+        """
+        Get whether the request has been cancelled.
+        :return: True if cancelled.
+        :rtype: bool
+        """
+        return self.is_set()
+
+
+class Index(object):
+    """
+    An index of tracked requests by the value of a locator field.
+    :ivar name: The field name.
+    :type name: str
+    :ivar values: Serial numbers by field value.
+    :type values: dict
+    :ivar unindexed: Serial numbers of locators not indexed because
+        the field is not defined or the value is not hashable.
+        Criteria match locators without the field.
+    :type unindexed: set
+    """
+
+    def __init__(self, name):
+        """
+        :param name: The field name.
+        :type name: str
+        """
+        self.name = name
+        self.values = {}
+        self.unindexed = set()
+
+    def add(self, sn, locator):
+        """
+        Add a tracked request.
+        :param sn: An RMI serial number.
+        :type sn: str
+        :param locator: The RMI request locator.
+        :type locator: object
+        """
+        if not isinstance(locator, dict):
+            return
+        try:
+            self.values.setdefault(locator[self.name], set()).add(sn)
+        except (KeyError, TypeError):
+            self.unindexed.add(sn)
+
+    def remove(self, sn, locator):
+        """
+        Remove a tracked request.
+        :param sn: An RMI serial number.
+        :type sn: str
+        :param locator: The RMI request locator.
+        :type locator: object
+        """
+        if not isinstance(locator, dict):
+            return
+        try:
+            value = locator[self.name]
+            indexed = self.values[value]
+            indexed.discard(sn)
+            if not indexed:
+                del self.values[value]
+        except (KeyError, TypeError):
+            self.unindexed.discard(sn)
+
+    def find(self, *values):
+        """
+        Find tracked requests that may have one of the specified values.
+        :param values: A list of field values.
+        :type values: list
+        :return: The set of candidate serial numbers.
+        :rtype: set
+        :raise TypeError: When a value is not hashable.
+        """
+        found = set(self.unindexed)
+        for value in values:
+            found.update(self.values.get(value, ()))
+        return found
+
 
 class Canceled(object):
     """
     Persistent collection of canceled requests by serial number.
+    Changes are appended to a journal (log) as: +<sn> (added) and
+    -<sn> (deleted) and replayed when loaded.  The journal is compacted
+    (rewritten) when it contains COMPACT more records than serial numbers.
+    Files written (one per serial number) by previous versions are
+    migrated to the journal.
+    :cvar COMPACT: The number of stale records that triggers compaction.
+    :type COMPACT: int
     :ivar collection: The set canceled requests (serial number).
     :type collection: set
+    :ivar records: The number of records in the journal.
+    :type records: int
+    :ivar __mutex: The object mutex.
+    :type __mutex: RLock
     """
 
     PATH = '/var/lib/%s/messaging/canceled' % NAME
+    JOURNAL = 'journal'
+
+    COMPACT = 1000
 
     def __init__(self):
+        self.__mutex = RLock()
+        self.collection = set()
+        self.records = 0
+        self.fp = None
         mkdir(Canceled.PATH)
-        self.collection = set(os.listdir(Canceled.PATH))
+        self.load()
+
+    @property
+    def path(self):
+        """
+        The journal path.
+        :rtype: str
+        """
+        return os.path.join(Canceled.PATH, Canceled.JOURNAL)
+
+    @synchronized
+    def load(self):
+        """
+        Load the journal and migrate files written by previous versions.
+        """
+        try:
+            with open(self.path) as fp:
+                for line in fp:
+                    self.records += 1
+                    op, sn = line[:1], line[1:].rstrip('\n')
+                    if op == '+':
+                        self.collection.add(sn)
+                    elif op == '-':
+                        self.collection.discard(sn)
+        except IOError:
+            pass
+        journal = (Canceled.JOURNAL, Canceled.JOURNAL + '.tmp')
+        legacy = [sn for sn in os.listdir(Canceled.PATH) if sn not in journal]
+        self.collection.update(legacy)
+        self.compact()
+        for sn in legacy:
+            unlink(os.path.join(Canceled.PATH, sn))
 
     def add(self, sn):
         """
@@ -121,9 +448,18 @@ class Canceled(object):
         :param sn: A canceled request serial number.
         :rtype: str
         """
-        self.collection.add(sn)
-        with open(os.path.join(Canceled.PATH, sn), 'w+') as fp:
-            fp.write(sn)
+        self.add_all([sn])
+
+    @synchronized
+    def add_all(self, sn_list):
+        """
+        Add serial numbers.
+        :param sn_list: A list of canceled request serial numbers.
+        :type sn_list: list
+        """
+        added = [sn for sn in sn_list if sn not in self.collection]
+        self.collection.update(added)
+        self.write('+', added)
 
     def delete(self, sn):
         """
@@ -131,14 +467,61 @@ class Canceled(object):
         :param sn: A canceled request serial number.
         :rtype: str
         """
-        try:
-            self.collection.remove(sn)
-        except KeyError:
-            pass
-        try:
-            os.unlink(os.path.join(Canceled.PATH, sn))
-        except OSError:
-            pass
+        self.delete_all([sn])
+
+    @synchronized
+    def delete_all(self, sn_list):
+        """
+        Delete serial numbers.
+        :param sn_list: A list of canceled request serial numbers.
+        :type sn_list: list
+        """
+        deleted = [sn for sn in sn_list if sn in self.collection]
+        self.collection.difference_update(deleted)
+        self.write('-', deleted)
+
+    @synchronized
+    def write(self, op, sn_list):
+        """
+        Append records to the journal.
+        :param op: The operation (+|-).
+        :type op: str
+        :param sn_list: A list of serial numbers.
+        :type sn_list: list
+        """
+        if not sn_list:
+            return
+        if self.fp is None:
+            self.fp = open(self.path, 'a')
+        self.fp.write(''.join('%s%s\n' % (op, sn) for sn in sn_list))
+        self.fp.flush()
+        self.records += len(sn_list)
+        if self.records - len(self.collection) > self.COMPACT:
+            self.compact()
+
+    @synchronized
+    def compact(self):
+        """
+        Rewrite the journal containing only the canceled serial numbers.
+        """
+        self.close()
+        path = self.path + '.tmp'
+        with open(path, 'w') as fp:
+            fp.write(''.join('+%s\n' % sn for sn in self.collection))
+        os.rename(path, self.path)
+        self.records = len(self.collection)
+
+    @synchronized
+    def close(self):
+        """
+        Close the journal.
+        """
+        if self.fp is not None:
+            self.fp.close()
+            self.fp = None
 
     def __contains__(self, sn):
         return sn in self.collection
+
+    def __len__(self):
+        return len(self.collection)
@@ -0,0 +1,133 @@
+#
+# Measure messages per second read through the amqp adapter Reader.get().
+#
+# The broker is replaced by a stand-in channel bound to a local socket pair.
+# Each delivery is signalled by writing a byte on the socket so the receiver
+# polls the connection socket exactly as it does with a real broker.
+# Reads are measured using a poller created per fetch (the previous
+# implementation) and the persistent poller created when the receiver is opened.
+#
+# usage: python amqp_receive.py [-n <messages>]
+#
+
+import select
+import socket
+
+from optparse import OptionParser
+from time import time
+
+from gofer.messaging.adapter.model import Node
+from gofer.messaging.adapter.amqp import consumer
+from gofer.messaging.adapter.amqp.consumer import Reader, Receiver
+
+
+BATCH = 1000
+
+
+class Message(object):
+
+    def __init__(self, body):
+        self.body = body
+
+
+class Connection(object):
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class Channel(object):
+    """
+    The broker stand-in.
+    """
+
+    def __init__(self):
+        self.sock, self.peer = socket.socketpair()
+        self.connection = Connection(self.sock)
+        self.method_queue = []
+        self.callback = None
+
+    def basic_qos(self, *unused):
+        pass
+
+    def basic_consume(self, address, callback):
+        self.callback = callback
+        return address
+
+    def basic_cancel(self, tag):
+        pass
+
+    def wait(self, method):
+        self.sock.recv(1)
+        self.callback(Message('{}'))
+
+    def publish(self, count):
+        self.peer.sendall(b'0' * count)
+
+    def close(self):
+        self.sock.close()
+        self.peer.close()
+
+
+class PerFetch(Receiver):
+    """
+    Poller created for each fetch.
+    """
+
+    def _wait(self, channel, timeout):
+        if len(channel.method_queue):
+            channel.wait(consumer.Basic.Deliver)
+            return
+        fd = channel.connection.sock.fileno()
+        epoll = select.epoll()
+        epoll.register(fd, select.EPOLLIN)
+        try:
+            if epoll.poll(timeout):
+                channel.wait(consumer.Basic.Deliver)
+        finally:
+            epoll.unregister(fd)
+            epoll.close()
+
+
+def measure(receiver, messages):
+    channel = Channel()
+    reader = Reader(Node('test'), 'amqp://localhost')
+    reader.connection = channel.connection
+    reader.channel = channel
+    reader.receiver = receiver(reader).open()
+    started = time()
+    for batch in range(0, messages, BATCH):
+        count = min(BATCH, messages - batch)
+        channel.publish(count)
+        for n in range(count):
+            reader.get(1)
+    elapsed = time() - started
+    reader.receiver.close()
+    channel.close()
+    return messages / elapsed
+
+
+def get_options():
+    parser = OptionParser()
+    parser.add_option('-n', '--messages', default='100000', help='number of messages')
+    opts, args = parser.parse_args()
+    return opts
+
+
+def main():
+    options = get_options()
+    messages = int(options.messages)
+    before = measure(PerFetch, messages)
+    after = measure(Receiver, messages)
+    print('messages: {}'.format(messages))
+    print('messages/sec: per-fetch poller={:.0f} persistent poller={:.0f}'.format(before, after))
+
+
+if __name__ == '__main__':
+    main()
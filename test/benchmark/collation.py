@@ -0,0 +1,76 @@
+#
+# Measure the time to collate the @remote functions of a plugin.
+#
+# A plugin module is generated with the specified number of classes each
+# defining the specified number of methods and the same number of module
+# functions.  The functions are collated using the Collator and using the
+# (previous) approach that searched the methods of every class for each
+# function.
+#
+# usage: python collation.py [-c <classes>] [-m <methods>]
+#
+
+import sys
+
+from optparse import OptionParser
+from time import time
+from types import ModuleType
+
+from gofer import inspection
+from gofer.collation import Collator
+
+
+def plugin(classes, methods):
+    lines = []
+    for n in range(methods):
+        lines.append('def fn%d(): pass' % n)
+    for c in range(classes):
+        lines.append('class Class%d(object):' % c)
+        for n in range(methods):
+            lines.append('    def method%d(self): pass' % n)
+    mod = ModuleType('plugin')
+    sys.modules[mod.__name__] = mod
+    exec('\n'.join(lines), mod.__dict__)
+    functions = [f for _, f in inspection.functions(mod)]
+    for _, cls in inspection.classes(mod):
+        functions.extend(f for _, f in inspection.methods(cls))
+    return {f: {} for f in functions}
+
+
+def previous(functions):
+    classes = []
+    collated = set()
+    for fn in functions:
+        classes.extend(inspection.classes(inspection.module(fn)))
+        for _, cls in classes:
+            if fn in [f for _, f in inspection.methods(cls)]:
+                collated.add(cls)
+                break
+    return collated
+
+
+def measure(fn, functions):
+    started = time()
+    fn(functions)
+    return time() - started
+
+
+def get_options():
+    parser = OptionParser()
+    parser.add_option('-c', '--classes', default='20', help='number of classes')
+    parser.add_option('-m', '--methods', default='20', help='number of methods per class')
+    opts, args = parser.parse_args()
+    return opts
+
+
+def main():
+    options = get_options()
+    functions = plugin(int(options.classes), int(options.methods))
+    collated = measure(Collator(), functions)
+    searched = measure(previous, functions)
+    print('functions: {}'.format(len(functions)))
+    print('seconds: collated={:.4f} searched={:.4f}'.format(collated, searched))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#
+# Measure the CPU cost of compressing message bodies against the bytes saved.
+#
+# A reply containing a package list (structured) and command output (text)
+# of the specified size is dumped and signed as it is by Producer.send().
+# The body is compressed and decompressed using each registered compressor
+# at each level.  Compressors for packages that are not installed are skipped.
+#
+# usage: python compression.py [-s <sizes>] [-l <levels>] [-n <iterations>]
+#
+
+from optparse import OptionParser
+from time import time
+
+from gofer.messaging.model import Document
+from gofer.messaging.compression import Compressor
+
+
+KB = 1024
+MB = KB * KB
+
+SIZES = '64k,1m,10m'
+LEVELS = '1,3,6,9'
+
+
+def reply(size):
+    """
+    Build a reply of approximately (size) bytes.
+    Half is a package list and half is command output.
+    """
+    packages = []
+    output = []
+    n = 0
+    while len(packages) * 80 < size // 2:
+        packages.append(
+            Document(
+                name='package-%d' % n,
+                version='1.%d.%d' % (n % 7, n % 13),
+                release='%d.el7' % (n % 5),
+                arch='x86_64',
+                size=n * 1024))
+        n += 1
+    n = 0
+    while n * 64 < size // 2:
+        output.append('%08d: installed package-%d from repository: base (%d bytes)' % (n, n, n * 7))
+        n += 1
+    result = Document(retval=dict(packages=packages, output='\n'.join(output)))
+    return Document(sn='0', routing=['agent', 'reply'], result=result).dump()
+
+
+def measure(compressor, level, body, iterations):
+    compressed = None
+    started = time()
+    for n in range(iterations):
+        compressed = compressor.compress(body, level)
+    deflated = (time() - started) / iterations
+    started = time()
+    for n in range(iterations):
+        compressor.inflate(compressed)
+    inflated = (time() - started) / iterations
+    return len(compressed), deflated, inflated
+
+
+def parse(size):
+    size = size.strip().lower()
+    if size.endswith('k'):
+        return int(size[:-1]) * KB
+    if size.endswith('m'):
+        return int(size[:-1]) * MB
+    return int(size)
+
+
+def get_options():
+    parser = OptionParser()
+    parser.add_option('-s', '--sizes', default=SIZES, help='comma separated body sizes')
+    parser.add_option('-l', '--levels', default=LEVELS, help='comma separated compression levels')
+    parser.add_option('-n', '--iterations', default='3', help='iterations per measurement')
+    opts, args = parser.parse_args()
+    return opts
+
+
+def main():
+    options = get_options()
+    iterations = int(options.iterations)
+    levels = [int(n) for n in options.levels.split(',')]
+    names = sorted(Compressor.compressors)
+    print('compressors: {}'.format(', '.join(names)))
+    for size in [parse(s) for s in options.sizes.split(',')]:
+        body = reply(size).encode('utf-8')
+        print('')
+        print('body: {} bytes'.format(len(body)))
+        for name in names:
+            compressor = Compressor.find(name)
+            for level in levels:
+                compressed, deflated, inflated = measure(compressor, level, body, iterations)
+                print(
+                    '  {:<5} level={:<2} ratio={:5.1f}x saved={:>10} bytes'
+                    '  compress={:7.1f} MB/s  decompress={:7.1f} MB/s'.format(
+                        name,
+                        level,
+                        len(body) / compressed,
+                        len(body) - compressed,
+                        len(body) / deflated / MB,
+                        len(body) / inflated / MB))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#
+# Measure locators matched per second using criteria built (object graph)
+# and compiled by the criteria Builder.
+#
+# usage: python criteria.py [-n <locators>]
+#
+
+from optparse import OptionParser
+from time import time
+
+from gofer.rmi.criteria import Builder
+
+
+CRITERIA = {
+    'or': (
+        {'and': ({'match': {'group_id': 'A', 'task_id': {'in': list(range(100))}}}, {'neq': None})},
+        {'match': {'campaign': 'spring'}}
+    )
+}
+
+
+def measure(criteria, locators):
+    started = time()
+    matched = 0
+    for locator in locators:
+        if criteria.match(locator):
+            matched += 1
+    return len(locators) / (time() - started), matched
+
+
+def get_options():
+    parser = OptionParser()
+    parser.add_option('-n', '--locators', default='200000', help='number of locators')
+    opts, args = parser.parse_args()
+    return opts
+
+
+def main():
+    options = get_options()
+    locators = [
+        {'task_id': n, 'group_id': 'AB'[n % 2], 'campaign': 'fall'}
+        for n in range(int(options.locators))
+    ]
+    builder = Builder()
+    built, matched = measure(builder.build(CRITERIA), locators)
+    compiled, _matched = measure(builder.compile(CRITERIA), locators)
+    assert matched == _matched
+    print('locators: {} matched: {}'.format(len(locators), matched))
+    print('locators/sec: built={:.0f} compiled={:.0f}'.format(built, compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#
+# Measure the time to validate and send (dump) an RMI reply.
+#
+# A reply is validated when the Return document is created and dumped again
+# when sent by the producer.  Replies of increasing size are measured using
+# the previous implementation (deep copy, then dump) and Document.validate()
+# plus Document.dump() which encode nested documents using the encoder hook.
+#
+# usage: python document_dump.py [-s <sizes>]
+#
+
+from optparse import OptionParser
+from time import time
+
+from gofer import Options
+from gofer.compat import json
+from gofer.messaging.model import Document
+
+
+KB = 1024
+MB = KB * KB
+
+SIZES = '1k,10k,100k,1m,10m,50m'
+
+
+def legacy(document):
+    """
+    The previous Document.dump().
+    """
+    def fn(thing):
+        if isinstance(thing, Options):
+            thing = dict(thing.__dict__)
+            for k, v in thing.items():
+                thing[k] = fn(v)
+            return thing
+        if isinstance(thing, dict):
+            thing = dict(thing)
+            for k, v in thing.items():
+                thing[k] = fn(v)
+            return thing
+        if isinstance(thing, (tuple, list)):
+            thing = [fn(e) for e in thing]
+            return thing
+        return thing
+    d = fn(document)
+    return json.dumps(d, sort_keys=True)
+
+
+def reply(size):
+    """
+    Build a reply of approximately (size) bytes.
+    """
+    retval = []
+    item = Document(name='package', version='1.0.0', release='1.el7', arch='x86_64', size=0)
+    n = max(1, size // len(item.dump()))
+    for i in range(n):
+        item = Document(name='package-%d' % i, version='1.0.%d' % i, release='1.el7', arch='x86_64', size=i)
+        retval.append(item)
+    return Document(sn='0', routing=['agent', 'reply'], result=Document(retval=retval))
+
+
+def before(document):
+    legacy(document)  # validate
+    return legacy(document)
+
+
+def after(document):
+    document.validate()
+    return document.dump()
+
+
+def measure(fn, document):
+    started = time()
+    fn(document)
+    return time() - started
+
+
+def parse(size):
+    size = size.strip().lower()
+    if size.endswith('k'):
+        return int(size[:-1]) * KB
+    if size.endswith('m'):
+        return int(size[:-1]) * MB
+    return int(size)
+
+
+def get_options():
+    parser = OptionParser()
+    parser.add_option('-s', '--sizes', default=SIZES, help='comma separated reply sizes')
+    opts, args = parser.parse_args()
+    return opts
+
+
+def main():
+    options = get_options()
+    for size in [parse(s) for s in options.sizes.split(',')]:
+        document = reply(size)
+        actual = len(document.dump())
+        t1 = measure(before, document)
+        t2 = measure(after, document)
+        print('reply: {:>10} bytes  before={:.4f}s  after={:.4f}s  ({:.1f}x)'.format(
+            actual,
+            t1,
+            t2,
+            t1 / t2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#
+# Measure the private (dirty) memory of each forked RMI call.
+#
+# A heap of (n) objects is built in the parent to simulate loaded plugins.
+# Each forked call allocates objects, runs a full collection and reports
+# the private memory of the child.  The calls are measured before and
+# after the memory layout is frozen (gofer.mp.freeze).
+#
+# usage: python fork_memory.py [-n <objects>] [-c <calls>]
+#
+
+import os
+import gc
+
+from optparse import OptionParser
+
+from gofer.metrics import Memory
+from gofer.mp import Process, freeze
+from gofer.rmi.context import Context, Progress
+from gofer.rmi.model.fork import Call
+
+
+def private():
+    """
+    Get the private memory (bytes) of this process.
+    """
+    total = 0
+    for name in ('/proc/self/smaps_rollup', '/proc/self/smaps'):
+        if not os.path.exists(name):
+            continue
+        with open(name) as fp:
+            for line in fp:
+                if line.startswith(('Private_Dirty:', 'Private_Clean:')):
+                    total += int(line.split()[1]) * 1024
+        break
+    return total
+
+
+def work():
+    garbage = [{'n': n} for n in range(100000)]
+    del garbage
+    gc.collect()
+    return private()
+
+
+class Cancelled(object):
+
+    def __call__(self):
+        return False
+
+
+def measure(calls):
+    measured = []
+    for n in range(calls):
+        call = Call(work)
+        measured.append(call())
+    return sum(measured) / len(measured)
+
+
+def get_options():
+    parser = OptionParser()
+    parser.add_option('-n', '--objects', default='1000000', help='number of objects')
+    parser.add_option('-c', '--calls', default='10', help='number of calls')
+    opts, args = parser.parse_args()
+    return opts
+
+
+def main():
+    options = get_options()
+    context = Context('0', Progress(None, None), Cancelled())
+    Context.set(context)
+    heap = [[n, str(n)] for n in range(int(options.objects))]
+    calls = int(options.calls)
+    before = measure(calls)
+    freeze()
+    after = measure(calls)
+    print('heap: {} objects, gc.freeze supported: {}'.format(
+        len(heap),
+        hasattr(gc, 'freeze')))
+    print('private memory per call: before={} after={}'.format(
+        Memory.format(before),
+        Memory.format(after)))
+    Process.collect = True
+
+
+if __name__ == '__main__':
+    main()
@@ -34,16 +34,64 @@ class TestAdmin(TestCase):
         sn = '1234'
         name = 'joe'
         criteria = {'eq': name}
-        tracker.return_value.find.return_value = [sn]
+        tracker.return_value.find_all.return_value = [sn]
 
         # test
         admin = Admin()
         canceled = admin.cancel(criteria=criteria)
 
         # validation
-        builder.return_value.build.assert_called_once_with(criteria)
-        tracker.return_value.cancel.assert_called_once_with(sn)
-        self.assertEqual(canceled, [tracker.return_value.cancel.return_value])
+        builder.return_value.compile.assert_called_once_with(criteria)
+        tracker.return_value.find_all.assert_called_once_with(
+            [builder.return_value.compile.return_value])
+        tracker.return_value.cancel_all.assert_called_once_with([sn])
+        self.assertEqual(canceled, tracker.return_value.cancel_all.return_value)
+
+    @patch('gofer.agent.builtin.Builder')
+    @patch('gofer.agent.builtin.Tracker')
+    def test_cancel_bulk(self, tracker, builder):
+        criteria = [{'eq': 'joe'}, {'eq': 'jane'}]
+        builder.return_value.compile.side_effect = ['c1', 'c2']
+        tracker.return_value.find_all.return_value = ['3', '4']
+
+        # test
+        admin = Admin()
+        canceled = admin.cancel(sn=['1', '2'], criteria=criteria)
+
+        # validation
+        tracker.return_value.find_all.assert_called_once_with(['c1', 'c2'])
+        tracker.return_value.cancel_all.assert_called_once_with(['1', '2', '3', '4'])
+        self.assertFalse(tracker.return_value.cancel.called)
+        self.assertEqual(canceled, tracker.return_value.cancel_all.return_value)
+
+    @patch('gofer.agent.builtin.Context')
+    @patch('gofer.agent.builtin.Tracker')
+    def test_cancel_progress(self, tracker, context):
+        cancelled = ['1', '2', '3', '4', '5']
+        tracker.return_value.cancel_all.return_value = cancelled
+        progress = context.current.return_value.progress
+        reported = []
+        progress.send.side_effect = lambda: reported.append(
+            (progress.total, progress.completed, progress.details))
+
+        # test
+        admin = Admin()
+        canceled = admin.cancel(sn=cancelled, progress=2)
+
+        # validation
+        self.assertEqual(canceled, len(cancelled))
+        self.assertEqual(
+            reported,
+            [
+                (5, 2, {'cancelled': ['1', '2']}),
+                (5, 4, {'cancelled': ['3', '4']}),
+                (5, 5, {'cancelled': ['5']}),
+            ])
+
+    @patch('gofer.agent.builtin.Context')
+    def test_report_no_context(self, context):
+        context.current.return_value = None
+        Admin.report(['1'], 10)
 
     def test_hello(self):
         admin = Admin()
@@ -95,6 +143,8 @@ class TestBuiltin(TestCase):
         builtin = Builtin(plugin)
         self.assertEqual(builtin.url, builtin.url)
         self.assertEqual(builtin.authenticator, builtin.authenticator)
+        self.assertEqual(builtin.accounting, plugin.accounting)
+        self.assertEqual(builtin.throttle, plugin.throttle)
 
     @patch('gofer.agent.builtin.ThreadPool', Mock())
     def test_provides(self):
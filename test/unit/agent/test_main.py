@@ -9,8 +9,75 @@
 # have received a copy of GPLv2 along with this software; if not, see
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
+import os
+import socket
+import shutil
+import tempfile
+
 from unittest import TestCase
 
+from mock import patch, Mock
+
+from gofer.agent.main import Agent, notify
+
+
+class TestNotify(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'notify')
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+
+    def tearDown(self):
+        self.sock.close()
+        shutil.rmtree(self.tmp)
+
+    def test_notify(self):
+        with patch.dict(os.environ, {'NOTIFY_SOCKET': self.path}):
+            notify('READY=1')
+        self.assertEqual(self.sock.recv(100), b'READY=1')
+
+    @patch('gofer.agent.main.socket.socket')
+    def test_not_notify(self, _socket):
+        with patch.dict(os.environ, {}, clear=True):
+            notify('READY=1')
+        self.assertFalse(_socket.called)
+
+
+class TestAgent(TestCase):
+
+    @patch('gofer.agent.main.AgentConfig')
+    def test_start_plugin(self, cfg):
+        plugin = Mock()
+        Agent._start(plugin)
+        plugin.start.assert_called_once_with()
+        plugin.ready.wait.assert_called_once_with(Agent.ATTACH)
+
+    @patch('gofer.agent.main.notify')
+    @patch('gofer.agent.main.ActionThread')
+    @patch('gofer.agent.main.Parallel')
+    @patch('gofer.agent.main.Plugin')
+    @patch('gofer.agent.main.AgentConfig')
+    def test_start(self, cfg, plugin, parallel, actions, notify):
+        cfg.return_value.management.enabled = '0'
+        parallel.return_value.timers = {'a': Mock()}
+        agent = Agent()
+
+        def _start(fn):
+            # actions started and not ready while plugins attach
+            actions.return_value.start.assert_called_once_with()
+            self.assertFalse(agent.ready.is_set())
+            self.assertFalse(notify.called)
+        parallel.return_value.side_effect = _start
+
+        # test
+        agent.start(block=False)
 
-class Test(TestCase):
-    pass
\ No newline at end of file
+        # validation
+        parallel.assert_called_once_with(plugin.all.return_value)
+        parallel.return_value.assert_called_once_with(agent._start)
+        actions.return_value.start.assert_called_once_with()
+        self.assertFalse(actions.return_value.join.called)
+        self.assertTrue(agent.ready.is_set())
+        notify.assert_called_once_with('READY=1')
@@ -9,13 +9,41 @@
 # have received a copy of GPLv2 along with this software; if not, see
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
+import os
+import shutil
+import sys
+import tempfile
+
+from threading import Event, Lock, Thread
+from time import sleep
 from unittest import TestCase
 
 from mock import patch, Mock, ANY
 
 from gofer.common import Singleton
 from gofer.agent.plugin import attach
-from gofer.agent.plugin import Container, Plugin
+from gofer.agent.plugin import Container, Plugin, PluginLoader, Parallel, Manifest
+from gofer.compat import json
+from gofer.messaging import Document
+from gofer.messaging.auth import Authenticator, Cache, Hmac
+from gofer.rmi.decorator import Remote
+
+
+PLUGIN = """
+from gofer.decorators import remote
+
+
+class Dog(object):
+
+    @remote
+    def bark(self, words):
+        return words
+
+
+@remote
+def wag(n):
+    return n
+"""
 
 
 class TestAttach(TestCase):
@@ -31,6 +59,7 @@ class TestAttach(TestCase):
         call()
         plugin.pool.run.assert_called_once_with(ANY)
         fn.assert_called_once_with(plugin)
+        plugin.ready.set.assert_called_once_with()
 
     def test_not_called(self):
         fn = Mock()
@@ -43,6 +72,222 @@ class TestAttach(TestCase):
         call()
         plugin.pool.run.assert_called_once_with(ANY)
         self.assertFalse(fn.called)
+        plugin.ready.set.assert_called_once_with()
+
+    def test_failed(self):
+        fn = Mock(side_effect=ValueError)
+        pool = Mock(queue=[])
+        pool.run.side_effect = pool.queue.append
+        plugin = Mock(url=1, uuid=2, pool=pool)
+        _fn = attach(fn)
+        _fn(plugin)
+        call = pool.queue[0]
+        self.assertRaises(ValueError, call)
+        plugin.ready.set.assert_called_once_with()
+
+
+class TestParallel(TestCase):
+
+    @staticmethod
+    def plugin(name, *requires):
+        plugin = Mock(requires=list(requires))
+        plugin.name = name
+        return plugin
+
+    def test_init(self):
+        a = self.plugin('a', 'b', 'c', 'z')
+        b = self.plugin('b', 'c')
+        c = self.plugin('c')
+        parallel = Parallel([a, b, c])
+        self.assertEqual(parallel.plugins, [c, b, a])
+        self.assertEqual(parallel.requires, {a: [b, c], b: [c], c: []})
+        self.assertEqual(parallel.timers, {})
+
+    def test_call(self):
+        lock = Lock()
+        called = []
+
+        def fn(plugin):
+            sleep(0.01 * len(plugin.requires))
+            with lock:
+                called.append(plugin.name)
+            if plugin.name == 'd':
+                raise ValueError()
+            return plugin.name
+
+        a = self.plugin('a', 'b', 'c')
+        b = self.plugin('b', 'c')
+        c = self.plugin('c', 'a')
+        d = self.plugin('d')
+        parallel = Parallel([a, b, c, d])
+        returned = parallel(fn)
+        self.assertEqual(returned, ['c', 'b', 'a', None])
+        self.assertEqual(called[-2:], ['b', 'a'])
+        self.assertEqual(sorted(called), ['a', 'b', 'c', 'd'])
+        self.assertEqual(sorted(parallel.timers), ['a', 'b', 'c'])
+
+
+class TestPluginLoader(TestCase):
+
+    @patch('gofer.agent.plugin.PluginLoader._load')
+    @patch('gofer.agent.plugin.PluginLoader.create')
+    @patch('gofer.agent.plugin.os.path.isdir', Mock(return_value=False))
+    @patch('gofer.agent.plugin.os.listdir')
+    @patch('gofer.agent.plugin.mkdir', Mock())
+    def test_load_all(self, listdir, create, load):
+        plugins = {
+            'a.conf': TestParallel.plugin('a', 'b'),
+            'b.conf': TestParallel.plugin('b'),
+            'c.conf': None,
+        }
+        listdir.return_value = ['c.conf', 'b.conf', 'a.conf', 'readme.txt']
+        create.side_effect = lambda p: plugins[p.split('/')[-1]]
+        load.side_effect = lambda p: p if p.name == 'b' else None
+
+        # test
+        loaded = PluginLoader.load_all()
+
+        # validation
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(loaded, [plugins['b.conf']])
+
+    @patch('gofer.agent.plugin.PluginLoader._load')
+    @patch('gofer.agent.plugin.PluginLoader.create')
+    def test_load(self, create, load):
+        plugin = PluginLoader.load('path')
+        create.assert_called_once_with('path')
+        load.assert_called_once_with(create.return_value)
+        self.assertEqual(plugin, load.return_value)
+
+    @patch('gofer.agent.plugin.PluginLoader._load')
+    @patch('gofer.agent.plugin.PluginLoader.create')
+    def test_load_disabled(self, create, load):
+        create.return_value = None
+        plugin = PluginLoader.load('path')
+        self.assertFalse(load.called)
+        self.assertEqual(plugin, None)
+
+
+@patch('gofer.agent.plugin.Scheduler', Mock())
+@patch('gofer.agent.plugin.Whiteboard', Mock())
+@patch('gofer.agent.plugin.ThreadPool', Mock())
+class TestLazy(TestCase):
+
+    def setUp(self):
+        Singleton._inst.clear()
+        self.tmp = tempfile.mkdtemp()
+        self.module = os.path.join(self.tmp, 'animals.py')
+        with open(self.module, 'w') as fp:
+            fp.write(PLUGIN)
+        self.patchers = [
+            patch('gofer.agent.plugin.PluginLoader.PATH', [self.tmp]),
+            patch('gofer.agent.plugin.Manifest.PATH', os.path.join(self.tmp, 'manifests')),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.tmp)
+        sys.modules.pop('animals', None)
+        Remote.clear()
+        Singleton._inst.clear()
+
+    @staticmethod
+    def plugin(lazy='1'):
+        descriptor = Mock(
+            main=Mock(threads=1, plugin=None, lazy=lazy, index=None),
+            messaging=Mock(authenticator=None))
+        descriptor.main.name = 'animals'
+        return Plugin(descriptor, '')
+
+    def test_import(self):
+        plugin = PluginLoader._load(self.plugin())
+        self.assertFalse(plugin.deferred)
+        self.assertTrue(plugin.provides('Dog'))
+        with open(Manifest(plugin).path) as fp:
+            manifest = json.load(fp)
+        self.assertEqual(manifest['plugin'], '')
+        self.assertEqual(manifest['module'], self.module)
+        self.assertEqual(manifest['namespaces'], {'Dog': ['bark'], 'animals': ['wag']})
+
+    def test_not_lazy(self):
+        plugin = PluginLoader._load(self.plugin(lazy='0'))
+        self.assertFalse(plugin.deferred)
+        self.assertFalse(os.path.exists(Manifest(plugin).path))
+        plugin = PluginLoader._load(self.plugin(lazy='0'))
+        self.assertFalse(plugin.deferred)
+
+    def test_deferred(self):
+        PluginLoader._load(self.plugin())
+        sys.modules.pop('animals')
+        plugin = PluginLoader._load(self.plugin())
+        self.assertTrue(plugin.deferred)
+        self.assertEqual(plugin.impl, None)
+        self.assertEqual(plugin.dispatcher.catalog, {})
+        self.assertFalse('animals' in sys.modules)
+        self.assertTrue(plugin.provides('Dog'))
+        self.assertTrue(plugin.provides('animals'))
+        self.assertFalse(plugin.provides('Cat'))
+        # activate
+        with patch('gofer.agent.plugin.Delegate') as delegate:
+            plugin.activate()
+            plugin.activate()
+        self.assertFalse(plugin.deferred)
+        self.assertEqual(plugin.manifest, None)
+        self.assertTrue('animals' in sys.modules)
+        self.assertEqual(sorted(plugin.dispatcher.catalog), ['Dog', 'animals'])
+        delegate.return_value.loaded.assert_called_once_with()
+
+    def test_activate_not_synchronized(self):
+        PluginLoader._load(self.plugin())
+        sys.modules.pop('animals')
+        plugin = PluginLoader._load(self.plugin())
+        self.assertTrue(plugin.deferred)
+        # the plugin mutex held by shutdown() joining the pool threads
+        holding = Event()
+        released = Event()
+
+        def hold():
+            with plugin._Plugin__mutex:
+                holding.set()
+                released.wait(10)
+        holder = Thread(target=hold)
+        holder.start()
+        holding.wait(10)
+        try:
+            activating = Thread(target=plugin.activate)
+            activating.start()
+            activating.join(10)
+            self.assertFalse(activating.is_alive())
+            self.assertFalse(plugin.deferred)
+        finally:
+            released.set()
+            holder.join()
+
+    def test_modified(self):
+        plugin = PluginLoader._load(self.plugin())
+        manifest = Manifest(plugin)
+        self.assertTrue(manifest.load())
+        os.utime(self.module, (0, 0))
+        self.assertFalse(manifest.load())
+        plugin = PluginLoader._load(self.plugin())
+        self.assertFalse(plugin.deferred)
+        self.assertTrue(Manifest(plugin).load())
+
+    def test_invalid(self):
+        plugin = self.plugin()
+        manifest = Manifest(plugin)
+        self.assertFalse(manifest.load())
+        os.makedirs(Manifest.PATH)
+        with open(manifest.path, 'w') as fp:
+            fp.write('[')
+        self.assertFalse(manifest.load())
+        PluginLoader._load(plugin)
+        plugin.descriptor.main.plugin = 'gofer.animals'
+        self.assertFalse(Manifest(plugin).load())
 
 
 class TestContainer(TestCase):
@@ -156,10 +401,23 @@ class TestPlugin(TestCase):
                 threads=4,
                 latency=0.5,
                 forward='a, b, c',
-                accept='d, e, f'),
+                accept='d, e, f',
+                requires='a, b,',
+                index='task_id, group_id',
+                accounting='1'),
             messaging=Mock(
                 uuid='x99',
-                url='amqp://localhost')
+                url='amqp://localhost',
+                prefetch='10',
+                ack_batch='20',
+                ack_latency='0.5',
+                concurrency='4',
+                compression_level='9',
+                compression_threshold='1024',
+                decompression_limit='2048'),
+            progress=Mock(
+                interval='0.5',
+                rate='10')
         )
         plugin = Plugin(descriptor, '')
         plugin.scheduler = Mock()
@@ -169,6 +427,22 @@ class TestPlugin(TestCase):
         self.assertEqual(plugin.cfg, descriptor)
         # latency
         self.assertEqual(plugin.latency, descriptor.main.latency)
+        # accounting
+        self.assertTrue(plugin.accounting)
+        # prefetch
+        self.assertEqual(plugin.prefetch, 10)
+        # batch
+        self.assertEqual(plugin.batch.limit, 20)
+        self.assertEqual(plugin.batch.latency, 0.5)
+        # pipeline
+        self.assertEqual(plugin.pipeline.concurrency, 4)
+        # compression
+        self.assertEqual(plugin.compression_level, 9)
+        self.assertEqual(plugin.compression_threshold, 1024)
+        self.assertEqual(plugin.decompression_limit, 2048)
+        # throttle
+        self.assertEqual(plugin.throttle.interval, 0.5)
+        self.assertEqual(plugin.throttle.rate, 10)
         # url
         self.assertEqual(plugin.url, descriptor.messaging.url)
         # enabled
@@ -189,6 +463,9 @@ class TestPlugin(TestCase):
         self.assertEqual(
             plugin.accept,
             set([p.strip() for p in _list.split(',')]))
+        # requires
+        self.assertEqual(plugin.requires, ['a', 'b'])
+        self.assertEqual(plugin.index, ['task_id', 'group_id'])
         # is_started
         self.assertEqual(plugin.is_started, plugin.scheduler.isAlive.return_value)
 
@@ -224,6 +501,97 @@ class TestPlugin(TestCase):
         self.assertFalse(plugin.attach.called)
         self.assertFalse(scheduler.return_value.start.called)
 
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    def test_load(self):
+        descriptor = Mock(
+            main=Mock(threads=4, index=None),
+            messaging=Mock(
+                authenticator='gofer.messaging.auth.Authenticator',
+                keys=None,
+                auth_cache='0'))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.delegate = Mock()
+        plugin.load()
+
+        # validation
+        plugin.delegate.loaded.assert_called_once_with()
+        self.assertEqual(type(plugin.authenticator), Authenticator)
+        self.assertEqual(plugin.authenticator.cache, None)
+
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    @patch('gofer.agent.plugin.Tracker')
+    def test_load_index(self, tracker):
+        descriptor = Mock(
+            main=Mock(threads=4, index='task_id, group_id'),
+            messaging=Mock(authenticator=None))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.delegate = Mock()
+        plugin.load()
+
+        # validation
+        tracker.return_value.index.assert_called_once_with('task_id', 'group_id')
+
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    def test_load_cache(self):
+        descriptor = Mock(
+            main=Mock(threads=4, index=None),
+            messaging=Mock(
+                authenticator='gofer.messaging.auth.Authenticator',
+                keys=None,
+                auth_cache='100'))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.delegate = Mock()
+        plugin.load()
+
+        # validation
+        self.assertTrue(isinstance(plugin.authenticator.cache, Cache))
+        self.assertEqual(plugin.authenticator.cache.capacity, 100)
+
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    @patch('gofer.messaging.auth.Hmac.load')
+    def test_load_hmac(self, load):
+        path = '/tmp/keys.conf'
+        descriptor = Mock(
+            main=Mock(threads=4, index=None),
+            messaging=Mock(authenticator='gofer.messaging.auth.Hmac', keys=path, auth_cache='0'))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.delegate = Mock()
+        plugin.load()
+
+        # validation
+        self.assertTrue(isinstance(plugin.authenticator, Hmac))
+        load.assert_called_with(path)
+
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    def test_load_no_authenticator(self):
+        descriptor = Mock(main=Mock(threads=4, index=None), messaging=Mock(authenticator=None))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.delegate = Mock()
+        plugin.load()
+
+        # validation
+        self.assertEqual(plugin.authenticator, None)
+
     @patch('gofer.agent.plugin.Scheduler')
     @patch('gofer.agent.plugin.ThreadPool')
     @patch('gofer.agent.plugin.Whiteboard', Mock())
@@ -276,7 +644,9 @@ class TestPlugin(TestCase):
                 cacert='ca',
                 clientkey='key',
                 clientcert='crt',
-                heartbeat='8')
+                heartbeat='8',
+                reconnect_delay='5',
+                reconnect_max_delay='60')
         )
 
         # test
@@ -291,6 +661,8 @@ class TestPlugin(TestCase):
         self.assertEqual(connector.ssl.client_key, descriptor.messaging.clientkey)
         self.assertEqual(connector.ssl.client_certificate, descriptor.messaging.clientcert)
         self.assertEqual(connector.ssl.host_validation, descriptor.messaging.host_validation)
+        self.assertEqual(connector.reconnect.delay, 5)
+        self.assertEqual(connector.reconnect.max_delay, 60)
 
     @patch('gofer.agent.plugin.Node')
     @patch('gofer.agent.plugin.RequestConsumer')
@@ -300,7 +672,14 @@ class TestPlugin(TestCase):
     @patch('gofer.agent.plugin.Whiteboard', Mock())
     def test_attach(self, pool, model, consumer, node):
         queue = 'test'
-        descriptor = Mock(main=Mock(threads=4))
+        descriptor = Mock(
+            main=Mock(threads=4),
+            messaging=Mock(
+                prefetch='10',
+                ack_batch='20',
+                ack_latency='0.5',
+                concurrency='4',
+                decompression_limit='1024'))
         pool.return_value.run.side_effect = lambda fn: fn()
         model.return_value.queue = queue
 
@@ -320,6 +699,10 @@ class TestPlugin(TestCase):
         consumer = consumer.return_value
         consumer.start.assert_called_once_with()
         self.assertEqual(consumer.authenticator, plugin.authenticator)
+        self.assertEqual(consumer.decompression_limit, 1024)
+        self.assertEqual(consumer.prefetch, 10)
+        self.assertEqual(consumer.batch.limit, 20)
+        self.assertEqual(consumer.pipeline.concurrency, 4)
         self.assertEqual(plugin.consumer, consumer)
 
     @patch('gofer.agent.plugin.BrokerModel')
@@ -333,9 +716,11 @@ class TestPlugin(TestCase):
         # test
         plugin = Plugin(descriptor, '')
         plugin.consumer = consumer
+        plugin.ready.set()
         plugin.detach()
 
         # validation
+        self.assertFalse(plugin.ready.is_set())
         consumer.shutdown.assert_called_once_with()
         consumer.join.assert_called_once_with()
         model.assert_called_with(plugin)
@@ -376,6 +761,56 @@ class TestPlugin(TestCase):
         self.assertFalse(model.teardown.called)
         self.assertEqual(plugin.consumer, None)
 
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    def test_dispatch(self):
+        descriptor = Mock(main=Mock(threads=4))
+        request = Document(request=Document(classname='Dog'))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.dispatcher = Mock()
+        plugin.activate = Mock()
+        result = plugin.dispatch(request)
+
+        # validation
+        plugin.activate.assert_called_once_with()
+        plugin.dispatcher.dispatch.assert_called_once_with(request)
+        self.assertEqual(result, plugin.dispatcher.dispatch.return_value)
+
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    def test_dispatch_import_failed(self):
+        descriptor = Mock(main=Mock(threads=4))
+        request = Document(request=Document(classname='Dog'))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.dispatcher = Mock()
+        plugin.activate = Mock(side_effect=ImportError)
+        result = plugin.dispatch(request)
+
+        # validation
+        self.assertTrue(result.failed())
+        self.assertFalse(plugin.dispatcher.dispatch.called)
+
+    @patch('gofer.agent.plugin.ThreadPool', Mock())
+    @patch('gofer.agent.plugin.Scheduler', Mock())
+    @patch('gofer.agent.plugin.Whiteboard', Mock())
+    def test_provides_deferred(self):
+        descriptor = Mock(main=Mock(threads=4))
+
+        # test
+        plugin = Plugin(descriptor, '')
+        plugin.manifest = Mock(__contains__=Mock(return_value=True))
+
+        # validation
+        self.assertTrue(plugin.deferred)
+        self.assertTrue(plugin.provides('Dog'))
+        plugin.manifest.__contains__.assert_called_once_with('Dog')
+
     @patch('gofer.agent.plugin.ThreadPool', Mock())
     @patch('gofer.agent.plugin.Scheduler', Mock())
     @patch('gofer.agent.plugin.Whiteboard', Mock())
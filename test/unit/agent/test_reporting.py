@@ -42,6 +42,18 @@ Actions:
   report 1 day, 0:00:00\
 """
 
+DEFERRED = """\
+Plugins:
+
+  <plugin> animals
+    Deferred:
+      <namespace> Dog
+        bark
+        wag
+
+Actions:\
+"""
+
 
 def bar1(n):
     pass
@@ -73,10 +85,12 @@ class Dog(object):
 
 class Plugin(object):
 
-    def __init__(self, name, enabled, dispatcher):
+    def __init__(self, name, enabled, dispatcher, manifest=None):
         self.name = name
         self.enabled = enabled
         self.dispatcher = dispatcher
+        self.manifest = manifest
+        self.deferred = manifest is not None
 
 
 class TestUtils(TestCase):
@@ -128,3 +142,16 @@ class TestReports(TestCase):
         # validation
         expected = HELP % {'plugin': plugins[0].name}
         self.assertEqual(expected, actual)
+
+    @patch('gofer.agent.decorator.Actions')
+    def test_loaded_deferred(self, actions):
+        manifest = Mock(namespaces={'Dog': ['bark', 'wag']})
+        container = Mock()
+        container.all.return_value = [Plugin('animals', True, None, manifest)]
+        actions.collated.return_value = []
+
+        # test
+        actual = loaded(container, actions)
+
+        # validation
+        self.assertEqual(DEFERRED, actual)
@@ -13,7 +13,7 @@ from unittest import TestCase
 
 from mock import patch, Mock
 
-from gofer.agent.rmi import Scheduler, Transaction, Context
+from gofer.agent.rmi import Scheduler, Task, Transaction, Context
 from gofer.messaging import Document
 
 
@@ -151,6 +151,70 @@ class TestScheduler(TestCase):
         abort.assert_called_once_with()
 
 
+class TestTask(TestCase):
+
+    @patch('gofer.agent.rmi.Tracker')
+    def test_call(self, tracker):
+        request = Mock(sn='1')
+        task = Task(Mock(request=request))
+        task.dispatch = Mock()
+
+        # test
+        task()
+
+        # validation
+        tracker.return_value.token.assert_called_once_with(request.sn)
+        task.dispatch.assert_called_once_with(request, tracker.return_value.token.return_value)
+        tracker.return_value.remove.assert_called_once_with(request.sn)
+
+    @patch('gofer.agent.rmi.Tracker')
+    def test_call_raised(self, tracker):
+        request = Mock(sn='1')
+        task = Task(Mock(request=request))
+        task.dispatch = Mock(side_effect=ValueError)
+
+        # test
+        self.assertRaises(ValueError, task)
+
+        # validation
+        tracker.return_value.remove.assert_called_once_with(request.sn)
+
+    def test_dispatch_cancelled(self):
+        request = Mock(sn='1')
+        transaction = Mock(request=request)
+        transaction.plugin.latency = 0
+        task = Task(transaction)
+        task._producer = Mock()
+
+        # test
+        task.dispatch(request, Mock(return_value=True))
+
+        # validation
+        transaction.discard.assert_called_once_with()
+        self.assertFalse(task._producer.called)
+
+
+    @patch('gofer.agent.rmi.Context', Mock())
+    @patch('gofer.agent.rmi.Progress')
+    def test_dispatch_raised(self, progress):
+        request = Mock(sn='1')
+        transaction = Mock(request=request)
+        transaction.plugin.latency = 0
+        transaction.plugin.dispatch.side_effect = ValueError
+        task = Task(transaction)
+        task._producer = Mock()
+        task.send_started = Mock()
+        task.send_reply = Mock()
+
+        # test
+        self.assertRaises(ValueError, task.dispatch, request, Mock(return_value=False))
+
+        # validation
+        progress.return_value.flush.assert_called_once_with()
+        task._producer.return_value.close.assert_called_once_with()
+        self.assertFalse(task.send_reply.called)
+
+
 class TestTransaction(TestCase):
 
     def test_init(self):
@@ -144,7 +144,12 @@ class TestReader(TestCase):
 
     def test_get(self):
         queue = Mock(name='test-queue')
-        received = Mock(content='<body/>')
+        received = Mock(
+            content='<body/>',
+            properties={
+                'content_type': 'application/json',
+                'application_headers': {'compression': 'zlib'}
+            })
         url = 'test-url'
 
         # test
@@ -159,6 +164,8 @@ class TestReader(TestCase):
         self.assertEqual(message._reader, reader)
         self.assertEqual(message._impl, received)
         self.assertEqual(message._body, received.body)
+        self.assertEqual(message._content_type, 'application/json')
+        self.assertEqual(message._compression, 'zlib')
 
     def test_ack(self):
         url = 'test-url'
@@ -172,7 +179,21 @@ class TestReader(TestCase):
         reader.ack(message)
 
         # validation
-        reader.channel.basic_ack.assert_called_once_with(tag)
+        reader.channel.basic_ack.assert_called_once_with(tag, False)
+
+    def test_ack_multiple(self):
+        url = 'test-url'
+        tag = '1234'
+        queue = Mock()
+        message = Mock(delivery_info={DELIVERY_TAG: tag})
+
+        # test
+        reader = Reader(queue, url=url)
+        reader.channel = Mock()
+        reader.ack(message, True)
+
+        # validation
+        reader.channel.basic_ack.assert_called_once_with(tag, True)
 
     def test_ack_exception(self):
         url = 'test-url'
@@ -248,59 +269,120 @@ class TestReader(TestCase):
 
 class TestReceiver(TestCase):
 
-    @patch('select.epoll')
     @patch('gofer.messaging.adapter.amqp.consumer.Basic')
-    def test_wait(self, basic, epoll):
+    def test_wait(self, basic):
         fd = 0
         channel = Mock(method_queue=[])
         timeout = 10
+        basic.Deliver = (10, 70)
+
+        # test
+        r = Receiver(Mock())
+        r.poller = Mock()
+        r.poller.poll.return_value = [fd]
+        r.sock = channel.connection.sock
+        r.fd = r.sock.fileno.return_value
+        r._wait(channel, timeout)
 
-        epoll.return_value.poll.return_value = [fd]
+        # validation
+        r.poller.poll.assert_called_once_with(timeout)
+        channel.wait.assert_called_once_with(basic.Deliver)
+
+    @patch('select.epoll')
+    @patch('gofer.messaging.adapter.amqp.consumer.Basic')
+    def test_wait_socket_replaced(self, basic, epoll):
+        channel = Mock(method_queue=[])
+        timeout = 10
         basic.Deliver = (10, 70)
+        poller = Mock()
+        epoll.return_value.poll.return_value = [1]
 
         # test
-        Receiver._wait(fd, channel, timeout)
+        r = Receiver(Mock())
+        r.poller = poller
+        r.sock = Mock()
+        r.fd = channel.connection.sock.fileno.return_value
+        r._wait(channel, timeout)
 
         # validation
-        epoll.assert_called_once_with()
-        epoll.return_value.register.assert_called_with(fd, select.EPOLLIN)
-        epoll.return_value.poll.assert_called_with(timeout)
+        fd = channel.connection.sock.fileno.return_value
+        poller.close.assert_called_once_with()
+        self.assertFalse(poller.poll.called)
+        epoll.return_value.register.assert_called_once_with(fd, select.EPOLLIN)
+        epoll.return_value.poll.assert_called_once_with(timeout)
         channel.wait.assert_called_once_with(basic.Deliver)
+        self.assertEqual(r.poller, epoll.return_value)
+        self.assertEqual(r.sock, channel.connection.sock)
+        self.assertEqual(r.fd, fd)
+
+    @patch('select.epoll')
+    def test_wait_fd_changed(self, epoll):
+        channel = Mock(method_queue=[])
+        channel.connection.sock.fileno.return_value = 12
+        poller = Mock()
+        epoll.return_value.poll.return_value = []
+
+        # test
+        r = Receiver(Mock())
+        r.poller = poller
+        r.sock = channel.connection.sock
+        r.fd = 11
+        r._wait(channel, 10)
+
+        # validation
+        poller.close.assert_called_once_with()
+        epoll.return_value.register.assert_called_once_with(12, select.EPOLLIN)
+        self.assertEqual(r.fd, 12)
 
     @patch('select.epoll')
+    def test_wait_socket_closed(self, epoll):
+        channel = Mock(method_queue=[])
+        channel.connection.sock = None
+        poller = Mock()
+
+        # test
+        r = Receiver(Mock())
+        r.poller = poller
+        r.sock = Mock()
+        r.fd = 11
+        self.assertRaises(AttributeError, r._wait, channel, 10)
+
+        # validation
+        self.assertFalse(epoll.called)
+        self.assertFalse(poller.poll.called)
+        self.assertFalse(channel.wait.called)
+
     @patch('gofer.messaging.adapter.amqp.consumer.Basic')
-    def test_wait_with_queued(self, basic, epoll):
-        fd = 0
+    def test_wait_with_queued(self, basic):
         channel = Mock(method_queue=[Mock()])
         timeout = 10
-
-        epoll.return_value.poll.return_value = [fd]
         basic.Deliver = (10, 70)
 
         # test
-        Receiver._wait(fd, channel, timeout)
+        r = Receiver(Mock())
+        r.poller = Mock()
+        r._wait(channel, timeout)
 
         # validation
-        self.assertFalse(epoll.called)
+        self.assertFalse(r.poller.poll.called)
         channel.wait.assert_called_once_with(basic.Deliver)
 
-    @patch('select.epoll')
     @patch('gofer.messaging.adapter.amqp.consumer.Basic')
-    def test_wait_nothing(self, basic, epoll):
-        fd = 0
+    def test_wait_nothing(self, basic):
         channel = Mock(method_queue=[])
         timeout = 10
-
-        epoll.return_value.poll.return_value = []
         basic.Deliver = (10, 70)
 
         # test
-        Receiver._wait(fd, channel, timeout)
+        r = Receiver(Mock())
+        r.poller = Mock()
+        r.poller.poll.return_value = []
+        r.sock = channel.connection.sock
+        r.fd = r.sock.fileno.return_value
+        r._wait(channel, timeout)
 
         # validation
-        epoll.assert_called_once_with()
-        epoll.return_value.register.assert_called_with(fd, select.EPOLLIN)
-        epoll.return_value.poll.assert_called_with(timeout)
+        r.poller.poll.assert_called_once_with(timeout)
         self.assertFalse(channel.wait.called)
 
     def test_init(self):
@@ -308,6 +390,9 @@ class TestReceiver(TestCase):
         r = Receiver(reader)
         self.assertEqual(r.reader, reader)
         self.assertEqual(r.tag, None)
+        self.assertEqual(r.poller, None)
+        self.assertEqual(r.sock, None)
+        self.assertEqual(r.fd, None)
         self.assertTrue(isinstance(r.inbox, Inbox))
 
     def test_channel(self):
@@ -316,29 +401,57 @@ class TestReceiver(TestCase):
         channel = r.channel()
         self.assertEqual(channel, reader.channel)
 
-    def test_open(self):
+    @patch('select.epoll')
+    def test_open(self, epoll):
         node = Mock(address='test')
-        reader = Mock(node=node, channel=Mock())
+        reader = Mock(node=node, channel=Mock(), prefetch=0)
 
         # test
         r = Receiver(reader)
         r = r.open()
 
         # validation
+        fd = reader.channel.connection.sock.fileno.return_value
+        self.assertFalse(reader.channel.basic_qos.called)
         reader.channel.basic_consume.assert_called_once_with(node.address, callback=r.inbox.put)
+        epoll.assert_called_once_with()
+        epoll.return_value.register.assert_called_once_with(fd, select.EPOLLIN)
         self.assertEqual(r.tag, reader.channel.basic_consume.return_value)
+        self.assertEqual(r.poller, epoll.return_value)
+        self.assertEqual(r.sock, reader.channel.connection.sock)
+        self.assertEqual(r.fd, fd)
+
+    @patch('select.epoll', Mock())
+    def test_open_prefetch(self):
+        node = Mock(address='test')
+        reader = Mock(node=node, channel=Mock(), prefetch=10)
+
+        # test
+        r = Receiver(reader)
+        r.open()
+
+        # validation
+        reader.channel.basic_qos.assert_called_once_with(0, 10, False)
 
     def test_close(self):
         reader = Mock(channel=Mock())
+        poller = Mock()
         tag = 1234
 
         # test
         r = Receiver(reader)
         r.tag = tag
+        r.poller = poller
+        r.sock = Mock()
+        r.fd = 11
         r.close()
 
         # validation
         reader.channel.basic_cancel.assert_called_once_with(tag)
+        poller.close.assert_called_once_with()
+        self.assertEqual(r.poller, None)
+        self.assertEqual(r.sock, None)
+        self.assertEqual(r.fd, None)
 
     def test_close_exception(self):
         reader = Mock()
@@ -368,8 +481,7 @@ class TestReceiver(TestCase):
         message = r.fetch(timeout)
 
         # validation
-        fd = channel.connection.sock.fileno.return_value
-        r._wait.assert_called_once_with(fd, channel, timeout)
+        r._wait.assert_called_once_with(channel, timeout)
         self.assertEqual(message, received)
 
     def test_fetch_empty(self):
@@ -62,6 +62,30 @@ class TestBuildMessage(TestCase):
         message.assert_called_once_with(body, delivery_mode=2)
         self.assertEqual(m, message.return_value)
 
+    @patch('gofer.messaging.adapter.amqp.producer.Message')
+    def test_call_content_type(self, message):
+        body = b'test-body'
+
+        # test
+        m = build_message(body, 0, True, 'application/msgpack')
+
+        # validation
+        message.assert_called_once_with(
+            body, delivery_mode=2, content_type='application/msgpack')
+        self.assertEqual(m, message.return_value)
+
+    @patch('gofer.messaging.adapter.amqp.producer.Message')
+    def test_call_compression(self, message):
+        body = b'test-body'
+
+        # test
+        m = build_message(body, 0, True, compression='zlib')
+
+        # validation
+        message.assert_called_once_with(
+            body, delivery_mode=2, application_headers={'compression': 'zlib'})
+        self.assertEqual(m, message.return_value)
+
 
 class TestSender(TestCase):
 
@@ -162,7 +186,7 @@ class TestSender(TestCase):
         sender.send(address, content, ttl=ttl)
 
         # validation
-        build.assert_called_once_with(content, ttl, sender.durable)
+        build.assert_called_once_with(content, ttl, sender.durable, None, None)
         sender.channel.basic_publish.assert_called_once_with(
             build.return_value,
             mandatory=True,
@@ -186,7 +210,7 @@ class TestSender(TestCase):
         sender.send(address, content, ttl=ttl)
 
         # validation
-        build.assert_called_once_with(content, ttl, sender.durable)
+        build.assert_called_once_with(content, ttl, sender.durable, None, None)
         sender.channel.basic_publish.assert_called_once_with(
             build.return_value,
             mandatory=True,
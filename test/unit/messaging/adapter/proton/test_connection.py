@@ -102,7 +102,7 @@ class TestConnection(TestCase):
 
         # validation
         canonical = URL(url).canonical
-        find.assert_called_once_with(url)
+        find.assert_called_with(url)
         blocking.assert_called_once_with(
             canonical,
             heartbeat=find.return_value.heartbeat,
@@ -149,10 +149,25 @@ class TestConnection(TestCase):
 
         # validation
         connection._impl.create_receiver.assert_called_once_with(
-            address, dynamic=False, name=uuid.return_value, options=None)
+            address, credit=None, dynamic=False, name=uuid.return_value, options=None)
         self.assertEqual(receiver, connection._impl.create_receiver.return_value)
         self.assertFalse(properties.called)
 
+    @patch('gofer.messaging.adapter.proton.connection.uuid4')
+    def test_receiver_credit(self, uuid):
+        url = 'test-url'
+        address = 'test'
+        uuid.return_value = '1234'
+        connection = Connection(url)
+        connection._impl = Mock()
+
+        # test
+        connection.receiver(address, credit=10)
+
+        # validation
+        connection._impl.create_receiver.assert_called_once_with(
+            address, credit=10, dynamic=False, name=uuid.return_value, options=None)
+
     @patch('gofer.messaging.adapter.proton.connection.DynamicNodeProperties')
     @patch('gofer.messaging.adapter.proton.connection.uuid4')
     def test_dynamic_receiver(self, uuid, properties):
@@ -168,7 +183,7 @@ class TestConnection(TestCase):
         # validation
         properties.assert_called_once_with({'x-opt-qd.address': address})
         connection._impl.create_receiver.assert_called_once_with(
-            None, dynamic=True, name=uuid.return_value, options=properties.return_value)
+            None, credit=None, dynamic=True, name=uuid.return_value, options=properties.return_value)
         self.assertEqual(receiver, connection._impl.create_receiver.return_value)
 
     def test_close(self):
@@ -9,6 +9,7 @@
 # have received a copy of GPLv2 along with this software; if not, see
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
+from collections import deque
 from unittest import TestCase
 
 from mock import Mock, patch
@@ -76,9 +77,23 @@ class TestReader(TestCase):
 
         # validation
         connection.return_value.open.assert_called_once_with()
-        connection.return_value.receiver.assert_called_once_with(node.address)
+        connection.return_value.receiver.assert_called_once_with(node.address, credit=0)
         self.assertEqual(reader.receiver, reader.connection.receiver.return_value)
 
+    @patch('gofer.messaging.adapter.proton.consumer.Connection')
+    def test_open_prefetch(self, connection):
+        url = 'test-url'
+        node = Mock(address='test')
+
+        # test
+        reader = Reader(node, url)
+        reader.prefetch = 10
+        reader.is_open = Mock(return_value=False)
+        reader.open()
+
+        # validation
+        connection.return_value.receiver.assert_called_once_with(node.address, credit=10)
+
     @patch('gofer.messaging.adapter.proton.consumer.Connection')
     def test_repair(self, connection):
         url = 'test-url'
@@ -94,7 +109,7 @@ class TestReader(TestCase):
         reader.close.assert_called_once_with()
         reader.connection.close.assert_called_once_with()
         connection.return_value.open.assert_called_once_with()
-        connection.return_value.receiver.assert_called_once_with(node.address)
+        connection.return_value.receiver.assert_called_once_with(node.address, credit=0)
         self.assertEqual(reader.receiver, reader.connection.receiver.return_value)
 
     @patch('gofer.messaging.adapter.proton.consumer.Connection', Mock())
@@ -120,30 +135,38 @@ class TestReader(TestCase):
         reader = Reader(node, '')
         reader.connection = connection
         reader.receiver = receiver
+        reader.unsettled.append(Mock())
         reader.is_open = Mock(return_value=True)
         reader.close()
 
         # validation
+        self.assertEqual(len(reader.unsettled), 0)
         receiver.close.assert_called_once_with()
         self.assertFalse(connection.close.called)
 
     def test_get(self):
         node = Mock(address='test')
-        received = Mock(body='<body/>')
+        received = Mock(body='<body/>', properties={'compression': 'zlib'})
         url = 'test-url'
 
         # test
         reader = Reader(node, url=url)
         reader.receiver = Mock()
         reader.receiver.receive.return_value = received
+        delivery = Mock()
+        reader.receiver.fetcher.unsettled = deque([delivery])
         message = reader.get(10)
 
         # validation
         reader.receiver.receive.assert_called_once_with(10)
+        self.assertEqual(list(reader.unsettled), [(received, delivery)])
+        self.assertEqual(len(reader.receiver.fetcher.unsettled), 0)
         self.assertTrue(isinstance(message, Message))
         self.assertEqual(message._reader, reader)
         self.assertEqual(message._impl, received)
         self.assertEqual(message._body, received.body)
+        self.assertEqual(message._content_type, received.content_type)
+        self.assertEqual(message._compression, 'zlib')
 
     @patch('gofer.messaging.adapter.proton.consumer.Timeout', Timeout)
     def test_get_empty(self):
@@ -160,38 +183,139 @@ class TestReader(TestCase):
         reader.receiver.receive.assert_called_once_with(10)
         self.assertEqual(message, None)
 
-    def test_ack(self):
+    @staticmethod
+    def received(reader, n):
+        messages = []
+        for _ in range(n):
+            message = Mock()
+            delivery = Mock()
+            reader.unsettled.append((message, delivery))
+            messages.append((message, delivery))
+        return messages
+
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery')
+    def test_ack(self, delivery):
+        node = Mock(address='test')
+        url = 'test-url'
+
+        # test
+        reader = Reader(node, url=url)
+        reader.receiver = Mock()
+        received = self.received(reader, 3)
+        reader.ack(received[1][0])
+
+        # validation
+        received[1][1].update.assert_called_once_with(delivery.ACCEPTED)
+        received[1][1].settle.assert_called_once_with()
+        self.assertFalse(received[0][1].settle.called)
+        self.assertFalse(reader.receiver.accept.called)
+        self.assertEqual(list(reader.unsettled), [received[0], received[2]])
+
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery', Mock())
+    def test_ack_not_unsettled(self):
+        node = Mock(address='test')
+        url = 'test-url'
+
+        # test
+        reader = Reader(node, url=url)
+        reader.receiver = Mock()
+        received = self.received(reader, 1)
+        reader.ack(Mock())
+        reader.ack(Mock(), True)
+
+        # validation
+        self.assertFalse(received[0][1].settle.called)
+        self.assertEqual(list(reader.unsettled), received)
+
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery', Mock())
+    def test_ack_presettled(self):
+        node = Mock(address='test')
+        url = 'test-url'
+        message = Mock()
+
+        # test
+        reader = Reader(node, url=url)
+        reader.receiver = Mock()
+        reader.unsettled.append((message, None))
+        reader.ack(message)
+
+        # validation
+        self.assertEqual(len(reader.unsettled), 0)
+
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery')
+    def test_ack_multiple(self, delivery):
         node = Mock(address='test')
         url = 'test-url'
 
         # test
         reader = Reader(node, url=url)
         reader.receiver = Mock()
-        reader.ack(None)
+        received = self.received(reader, 3)
+        reader.ack(received[1][0], True)
 
         # validation
-        reader.receiver.accept.assert_called_once_with()
+        for _, d in received[:2]:
+            d.update.assert_called_once_with(delivery.ACCEPTED)
+            d.settle.assert_called_once_with()
+        self.assertFalse(received[2][1].settle.called)
+        self.assertEqual(list(reader.unsettled), received[2:])
+
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery')
+    def test_mixed(self, delivery):
+        node = Mock(address='test')
+        url = 'test-url'
 
-    def test_reject(self):
+        # test
+        reader = Reader(node, url=url)
+        reader.receiver = Mock()
+        received = self.received(reader, 5)
+        reader.reject(received[3][0])
+        reader.ack(received[2][0])
+        reader.ack(received[1][0], True)
+        reader.reject(received[4][0], requeue=False)
+
+        # validation
+        self.assertEqual(
+            [d.update.call_args[0][0] for _, d in received],
+            [
+                delivery.ACCEPTED,
+                delivery.ACCEPTED,
+                delivery.ACCEPTED,
+                delivery.MODIFIED,
+                delivery.REJECTED
+            ])
+        for _, d in received:
+            d.settle.assert_called_once_with()
+        self.assertEqual(len(reader.unsettled), 0)
+
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery')
+    def test_reject(self, delivery):
         node = Mock(address='test')
         url = 'test-url'
 
         # test
         reader = Reader(node, url=url)
         reader.receiver = Mock()
-        reader.reject(None, requeue=False)
+        received = self.received(reader, 2)
+        reader.reject(received[1][0], requeue=False)
 
         # validation
-        reader.receiver.reject.assert_called_once_with()
+        received[1][1].update.assert_called_once_with(delivery.REJECTED)
+        self.assertFalse(received[0][1].settle.called)
+        self.assertFalse(reader.receiver.reject.called)
+        self.assertEqual(list(reader.unsettled), received[:1])
 
-    def test_reject_queued(self):
+    @patch('gofer.messaging.adapter.proton.consumer.Delivery')
+    def test_reject_queued(self, delivery):
         node = Mock(address='test')
         url = 'test-url'
 
         # test
         reader = Reader(node, url=url)
         reader.receiver = Mock()
-        reader.reject(None, requeue=True)
+        received = self.received(reader, 1)
+        reader.reject(received[0][0], requeue=True)
 
         # validation
-        reader.receiver.release.assert_called_once_with()
+        received[0][1].update.assert_called_once_with(delivery.MODIFIED)
+        received[0][1].settle.assert_called_once_with()
@@ -40,6 +40,22 @@ class TestBuilder(TestCase):
         message.assert_called_once_with(body=content, durable=durable, ttl=ttl)
         self.assertEqual(m, message.return_value)
 
+    @patch('gofer.messaging.adapter.proton.producer.Message')
+    def test_build_content_type(self, message):
+        content = Mock()
+        m = build_message(content, None, 18, 'application/msgpack')
+        message.assert_called_once_with(
+            body=content, durable=18, content_type='application/msgpack')
+        self.assertEqual(m, message.return_value)
+
+    @patch('gofer.messaging.adapter.proton.producer.Message')
+    def test_build_compression(self, message):
+        content = Mock()
+        m = build_message(content, None, 18, compression='zlib')
+        message.assert_called_once_with(
+            body=content, durable=18, properties={'compression': 'zlib'})
+        self.assertEqual(m, message.return_value)
+
 
 class TestSender(TestCase):
 
@@ -134,7 +150,7 @@ class TestSender(TestCase):
         sender.send(address, content, ttl=ttl)
 
         # validation
-        builder.assert_called_once_with(content, ttl, sender.durable)
+        builder.assert_called_once_with(content, ttl, sender.durable, None, None)
         sender.connection.sender.assert_called_once_with(address)
         _sender = sender.connection.sender.return_value
         _sender.send.assert_called_once_with(builder.return_value)
@@ -11,11 +11,12 @@
 
 from unittest import TestCase
 
-from mock import Mock, patch
+from mock import Mock, patch, call
 
 from gofer.devel import ipatch
 
 from gofer.messaging.adapter.model import Message
+from gofer.messaging.consumer import Batch, Pipeline
 
 with ipatch('qpid'):
     from gofer.messaging.adapter.qpid.consumer import Reader, BaseReader
@@ -78,6 +79,20 @@ class TestReader(TestCase):
         self.assertEqual(reader.session, connection.return_value.session.return_value)
         self.assertEqual(reader.receiver, reader.session.receiver.return_value)
 
+    @patch('gofer.messaging.adapter.qpid.consumer.Connection')
+    def test_open_prefetch(self, connection):
+        url = 'test-url'
+        node = Mock(address='test')
+
+        # test
+        reader = Reader(node, url)
+        reader.prefetch = 10
+        reader.is_open = Mock(return_value=False)
+        reader.open()
+
+        # validation
+        self.assertEqual(reader.receiver.capacity, 10)
+
     @patch('gofer.messaging.adapter.qpid.consumer.Reader.close')
     @patch('gofer.messaging.adapter.qpid.consumer.Connection')
     def test_repair(self, connection, close):
@@ -124,12 +139,14 @@ class TestReader(TestCase):
         reader.session = session
         reader.receiver = receiver
         reader.is_open = Mock(return_value=True)
+        reader.unacked.append(Mock())
         reader.close()
 
         # validation
         receiver.close.assert_called_once_with()
         session.close.assert_called_once_with()
         self.assertFalse(connection.close.called)
+        self.assertEqual(len(reader.unacked), 0)
 
     def test_ack(self):
         message = Mock()
@@ -142,6 +159,86 @@ class TestReader(TestCase):
         # validation
         reader.session.acknowledge.assert_called_once_with(message=message)
 
+    def test_ack_multiple(self):
+        received = [Mock(), Mock(), Mock()]
+
+        # test
+        reader = Reader(None, '')
+        reader.session = Mock()
+        reader.unacked.extend(received)
+        reader.ack(received[1], True)
+
+        # validation
+        self.assertEqual(
+            reader.session.acknowledge.call_args_list,
+            [
+                call(message=received[0], sync=False),
+                call(message=received[1], sync=True),
+            ])
+        self.assertEqual(list(reader.unacked), received[2:])
+
+    def test_ack_multiple_not_received(self):
+        received = [Mock(), Mock()]
+        message = Mock()
+
+        # test
+        reader = Reader(None, '')
+        reader.session = Mock()
+        reader.unacked.extend(received)
+        reader.ack(message, True)
+
+        # validation
+        reader.session.acknowledge.assert_called_once_with(message=message)
+        self.assertEqual(list(reader.unacked), received)
+
+    def test_ack_forget(self):
+        received = [Mock(), Mock(), Mock()]
+
+        # test
+        reader = Reader(None, '')
+        reader.session = Mock()
+        reader.unacked.extend(received)
+        reader.ack(received[1])
+        reader.reject(received[0])
+        reader.ack(received[2], True)
+
+        # validation
+        self.assertEqual(reader.session.acknowledge.call_count, 3)
+        reader.session.acknowledge.assert_called_with(message=received[2], sync=True)
+        self.assertEqual(len(reader.unacked), 0)
+
+    @patch('gofer.messaging.consumer.ThreadPool')
+    def test_ack_batch_pipeline(self, pool):
+        queue = Queue('test-queue')
+        received = [Mock(properties={}) for _ in range(4)]
+        dispatch = Mock()
+        batch = Batch(2, 10)
+        pipeline = Pipeline(2)
+        pipeline.start()
+
+        # test
+        reader = Reader(queue, '')
+        reader.session = Mock()
+        reader.receiver = Mock()
+        reader.receiver.fetch.side_effect = received
+        for _ in received:
+            pipeline.put(dispatch, reader.get(10), Mock())
+        # dispatched: 1st, 2nd and 4th
+        for n in (0, 1, 3):
+            args = pool.return_value.run.call_args_list[n][0]
+            Pipeline._dispatch(*args[1:])
+        for message in pipeline.completed():
+            batch.add(message)
+
+        # validation
+        self.assertEqual(
+            reader.session.acknowledge.call_args_list,
+            [
+                call(message=received[0], sync=False),
+                call(message=received[1], sync=True),
+            ])
+        self.assertEqual(list(reader.unacked), received[2:])
+
     def test_ack_exception(self):
         message = Mock()
         session = Mock()
@@ -196,7 +293,7 @@ class TestReader(TestCase):
 
     def test_get(self):
         queue = Queue('test-queue')
-        received = Mock(content='<body/>')
+        received = Mock(content='<body/>', properties={'compression': 'zlib'})
         url = 'test-url'
 
         # test
@@ -211,6 +308,9 @@ class TestReader(TestCase):
         self.assertEqual(message._reader, reader)
         self.assertEqual(message._impl, received)
         self.assertEqual(message._body, received.content)
+        self.assertEqual(message._content_type, received.content_type)
+        self.assertEqual(message._compression, 'zlib')
+        self.assertEqual(list(reader.unacked), [received])
 
     @patch('gofer.messaging.adapter.qpid.consumer.Empty', Empty)
     def test_get_empty(self):
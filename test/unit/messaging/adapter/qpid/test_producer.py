@@ -119,7 +119,12 @@ class TestSender(TestCase):
         sender.send(address, content, ttl=ttl)
 
         # validation
-        message.assert_called_once_with(content=content, durable=sender.durable, ttl=ttl)
+        message.assert_called_once_with(
+            content=content,
+            content_type=None,
+            properties=None,
+            durable=sender.durable,
+            ttl=ttl)
         sender.session.sender.assert_called_once_with(address)
         _sender = sender.session.sender.return_value
         _sender.send.assert_called_once_with(message.return_value)
@@ -13,7 +13,7 @@ from unittest import TestCase
 
 from mock import patch, Mock
 
-from gofer.messaging.adapter.connect import retry, DELAY, DELAY_MULTIPLIER
+from gofer.messaging.adapter.connect import retry, Backoff, Breaker, DELAY, MAX_DELAY
 
 
 class ConnectError(Exception):
@@ -23,8 +23,167 @@ class ConnectError(Exception):
 URL = 'amqp://host'
 
 
+class TestBackoff(TestCase):
+
+    def test_init(self):
+        backoff = Backoff()
+        self.assertEqual(backoff.base, DELAY)
+        self.assertEqual(backoff.cap, MAX_DELAY)
+        self.assertEqual(backoff.delay, DELAY)
+
+    @patch('gofer.messaging.adapter.connect.uniform')
+    def test_next(self, uniform):
+        uniform.side_effect = lambda a, b: b
+        backoff = Backoff(1, 20)
+        self.assertEqual(backoff.next(), 3)
+        self.assertEqual(backoff.next(), 9)
+        self.assertEqual(backoff.next(), 20)
+        self.assertEqual(
+            uniform.call_args_list,
+            [
+                ((1, 3), {}),
+                ((1, 9), {}),
+                ((1, 27), {}),
+            ])
+
+    def test_jitter(self):
+        backoff = Backoff(1, 20)
+        for n in range(100):
+            delay = backoff.next()
+            self.assertTrue(1 <= delay <= 20)
+
+    def test_reset(self):
+        backoff = Backoff(1, 20)
+        backoff.delay = 10
+        backoff.reset()
+        self.assertEqual(backoff.delay, 1)
+
+
+class TestBreaker(TestCase):
+
+    def setUp(self):
+        Breaker.breakers = {}
+
+    def tearDown(self):
+        Breaker.breakers = {}
+
+    def test_init(self):
+        breaker = Breaker(URL)
+        self.assertEqual(breaker.url, URL)
+        self.assertEqual(breaker.failures, 0)
+        self.assertEqual(breaker.until, 0)
+        self.assertFalse(breaker.probing)
+        self.assertEqual(breaker.error, None)
+        self.assertEqual(breaker.state, Breaker.CLOSED)
+
+    def test_find(self):
+        breaker = Breaker.find(URL)
+        self.assertEqual(breaker.url, URL)
+        self.assertEqual(Breaker.find(URL), breaker)
+        self.assertNotEqual(Breaker.find('other'), breaker)
+
+    @patch('gofer.messaging.adapter.connect.time')
+    def test_trip(self, time):
+        time.return_value = 100
+        error = ConnectError()
+        breaker = Breaker(URL)
+
+        # test
+        for n in range(Breaker.THRESHOLD):
+            self.assertTrue(breaker.allow())
+            breaker.fail(error, 10)
+
+        # validation
+        self.assertEqual(breaker.state, Breaker.OPEN)
+        self.assertEqual(breaker.until, 110)
+        self.assertEqual(breaker.remaining, 10)
+        self.assertEqual(breaker.error, error)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(
+            breaker.stats(),
+            dict(
+                state=Breaker.OPEN,
+                failures=3,
+                attempts=3,
+                failed=3,
+                rejected=1,
+                tripped=1))
+
+    @patch('gofer.messaging.adapter.connect.time')
+    def test_half_open(self, time):
+        time.return_value = 100
+        breaker = Breaker(URL)
+        for n in range(Breaker.THRESHOLD):
+            breaker.fail(ConnectError(), 10)
+
+        # test
+        time.return_value = 111
+        self.assertEqual(breaker.state, Breaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.probing)
+        self.assertFalse(breaker.allow())
+
+        # probe failed
+        breaker.fail(ConnectError(), 20)
+        self.assertEqual(breaker.state, Breaker.OPEN)
+        self.assertEqual(breaker.until, 131)
+        self.assertEqual(breaker.tripped, 1)
+
+    @patch('gofer.messaging.adapter.connect.log')
+    @patch('gofer.messaging.adapter.connect.time')
+    def test_opened_logged(self, time, log):
+        time.return_value = 100
+        breaker = Breaker(URL)
+        for n in range(Breaker.THRESHOLD):
+            breaker.fail(ConnectError(), 10)
+        stats = log.warning.call_args[0][2]
+        self.assertEqual(stats['state'], Breaker.OPEN)
+
+    @patch('gofer.messaging.adapter.connect.time')
+    def test_release(self, time):
+        time.return_value = 100
+        breaker = Breaker(URL)
+        for n in range(Breaker.THRESHOLD):
+            breaker.fail(ConnectError(), 10)
+        time.return_value = 111
+        self.assertTrue(breaker.allow())
+        prober = breaker.prober
+        breaker.prober = Mock()
+        breaker.release()
+        self.assertTrue(breaker.probing)
+        breaker.prober = prober
+        breaker.release()
+        self.assertFalse(breaker.probing)
+        self.assertEqual(breaker.prober, None)
+        self.assertTrue(breaker.allow())
+
+    @patch('gofer.messaging.adapter.connect.time')
+    def test_succeeded(self, time):
+        time.return_value = 100
+        breaker = Breaker(URL)
+        for n in range(Breaker.THRESHOLD):
+            breaker.fail(ConnectError(), 10)
+        time.return_value = 111
+        breaker.allow()
+
+        # test
+        breaker.succeeded()
+
+        # validation
+        self.assertEqual(breaker.state, Breaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+        self.assertFalse(breaker.probing)
+        self.assertEqual(breaker.error, None)
+
+
 class TestRetry(TestCase):
 
+    def setUp(self):
+        Breaker.breakers = {}
+
+    def tearDown(self):
+        Breaker.breakers = {}
+
     @patch('gofer.messaging.adapter.connect.sleep')
     def test_open(self, sleep):
         fn = Mock()
@@ -33,6 +192,7 @@ class TestRetry(TestCase):
         fx(connection)
         fn.assert_called_once_with(connection)
         self.assertFalse(sleep.called)
+        self.assertEqual(Breaker.find(URL).attempts, 1)
 
     @patch('gofer.messaging.adapter.connect.sleep')
     def test_open_failed_no_retry(self, sleep):
@@ -43,9 +203,12 @@ class TestRetry(TestCase):
         self.assertRaises(ConnectError, fx, connection)
         self.assertFalse(sleep.called)
         fn.assert_called_once_with(connection)
+        self.assertEqual(Breaker.find(URL).failures, 1)
 
+    @patch('gofer.messaging.adapter.connect.uniform')
     @patch('gofer.messaging.adapter.connect.sleep')
-    def test_retried(self, sleep):
+    def test_retried(self, sleep, uniform):
+        uniform.side_effect = lambda a, b: b
         fn = Mock()
         fn.side_effect = [ConnectError, ConnectError, None]
         connection = Mock(url=URL, retry=True)
@@ -54,8 +217,8 @@ class TestRetry(TestCase):
         self.assertEqual(
             sleep.call_args_list,
             [
-                ((DELAY,), {}),
-                ((DELAY * DELAY_MULTIPLIER,), {}),
+                ((DELAY * 3,), {}),
+                ((MAX_DELAY,), {}),
             ])
         self.assertEqual(
             fn.call_args_list,
@@ -64,6 +227,7 @@ class TestRetry(TestCase):
                 ((connection,), {}),
                 ((connection,), {}),
             ])
+        self.assertEqual(Breaker.find(URL).failures, 0)
 
     @patch('gofer.messaging.adapter.connect.RETRIES', 2)
     @patch('gofer.messaging.adapter.connect.sleep')
@@ -73,12 +237,7 @@ class TestRetry(TestCase):
         connection = Mock(url=URL, retry=True)
         fx = retry(ConnectError)(fn)
         self.assertRaises(ConnectError, fx, connection)
-        self.assertEqual(
-            sleep.call_args_list,
-            [
-                ((DELAY,), {}),
-                ((DELAY * DELAY_MULTIPLIER,), {}),
-            ])
+        self.assertEqual(sleep.call_count, 2)
         self.assertEqual(
             fn.call_args_list,
             [
@@ -86,3 +245,65 @@ class TestRetry(TestCase):
                 ((connection,), {}),
                 ((connection,), {}),
             ])
+
+    @patch('gofer.messaging.adapter.connect.sleep')
+    def test_breaker_open(self, sleep):
+        error = ConnectError()
+        breaker = Breaker.find(URL)
+        breaker.allow = Mock(side_effect=[False, True])
+        breaker.error = error
+        fn = Mock()
+        connection = Mock(url=URL, retry=True)
+        fx = retry(ConnectError)(fn)
+        fx(connection)
+        self.assertEqual(sleep.call_count, 1)
+        fn.assert_called_once_with(connection)
+
+    @patch('gofer.messaging.adapter.connect.sleep')
+    def test_breaker_fast_fail(self, sleep):
+        error = ConnectError()
+        breaker = Breaker.find(URL)
+        breaker.allow = Mock(return_value=False)
+        breaker.error = error
+        fn = Mock()
+        connection = Mock(url=URL, retry=False)
+        fx = retry(ConnectError)(fn)
+        self.assertRaises(ConnectError, fx, connection)
+        self.assertFalse(sleep.called)
+        self.assertFalse(fn.called)
+
+    @patch('gofer.messaging.adapter.connect.time')
+    @patch('gofer.messaging.adapter.connect.sleep')
+    def test_probe_unexpected_exception(self, sleep, time):
+        time.return_value = 100
+        breaker = Breaker.find(URL)
+        for n in range(Breaker.THRESHOLD):
+            breaker.fail(ConnectError(), 10)
+        time.return_value = 111
+        fn = Mock(side_effect=[ValueError, None])
+        connection = Mock(url=URL, retry=False)
+        fx = retry(ConnectError)(fn)
+
+        # test
+        self.assertRaises(ValueError, fx, connection)
+        self.assertFalse(breaker.probing)
+        fx(connection)
+
+        # validation
+        self.assertEqual(fn.call_count, 2)
+        self.assertEqual(breaker.state, Breaker.CLOSED)
+        self.assertFalse(sleep.called)
+
+    @patch('gofer.messaging.adapter.connect.Connector.find')
+    @patch('gofer.messaging.adapter.connect.sleep')
+    def test_policy(self, sleep, find):
+        find.return_value.reconnect.delay = 1
+        find.return_value.reconnect.max_delay = 2
+        fn = Mock()
+        fn.side_effect = [ConnectError, None]
+        connection = Mock(url=URL, retry=True)
+        fx = retry(ConnectError)(fn)
+        fx(connection)
+        find.assert_called_once_with(URL)
+        delay = sleep.call_args[0][0]
+        self.assertTrue(1 <= delay <= 2)
@@ -13,6 +13,8 @@
 # Jeff Ortel <jortel@redhat.com>
 #
 
+import zlib
+
 from unittest import TestCase
 from mock import patch, Mock
 
@@ -25,9 +27,11 @@ from gofer.messaging.adapter.model import BaseQueue, Queue
 from gofer.messaging.adapter.model import Messenger
 from gofer.messaging.adapter.model import BaseReader, Reader
 from gofer.messaging.adapter.model import BaseSender, Sender, Producer
-from gofer.messaging.adapter.model import Connector, SSL
+from gofer.messaging.adapter.model import Connector, SSL, Reconnect
 from gofer.messaging.adapter.model import BaseConnection, Connection
 from gofer.messaging.adapter.model import Message
+from gofer.messaging.codec import Codec, JSON
+from gofer.messaging.compression import Compressor, CompressionError, THRESHOLD, LIMIT
 from gofer.messaging.adapter.model import ModelError
 from gofer.messaging.adapter.model import model
 from gofer.messaging.adapter.model import NotFound
@@ -385,6 +389,7 @@ class TestBaseReader(TestCase):
         reader = BaseReader(node, url)
         self.assertEqual(reader.node, node)
         self.assertEqual(reader.url, url)
+        self.assertEqual(reader.prefetch, 0)
         self.assertTrue(isinstance(reader, Messenger))
 
     def test_abstract(self):
@@ -414,6 +419,7 @@ class TestReader(TestCase):
         _find.assert_called_with(url)
         plugin.Reader.assert_called_with(node, url)
         self.assertEqual(reader.authenticator, None)
+        self.assertEqual(reader.decompression_limit, LIMIT)
         self.assertTrue(isinstance(reader, BaseReader))
 
     @patch('gofer.messaging.adapter.model.Adapter.find')
@@ -425,8 +431,10 @@ class TestReader(TestCase):
         url = TEST_URL
         node = Node('test')
         reader = Reader(node, url)
+        reader.prefetch = 10
         reader.open()
         _impl.open.assert_called_with()
+        self.assertEqual(_impl.prefetch, 10)
 
     @patch('gofer.messaging.adapter.model.Adapter.find')
     def test_repair(self, _find):
@@ -437,8 +445,10 @@ class TestReader(TestCase):
         url = TEST_URL
         node = Node('test')
         reader = Reader(node, url)
+        reader.prefetch = 10
         reader.repair()
         _impl.repair.assert_called_with()
+        self.assertEqual(_impl.prefetch, 10)
 
     @patch('gofer.messaging.adapter.model.Adapter.find')
     def test_is_open(self, _find):
@@ -489,7 +499,15 @@ class TestReader(TestCase):
         node = Node('')
         reader = Reader(node, url)
         reader.ack(message)
-        message.ack.assert_called_once_with()
+        message.ack.assert_called_once_with(False)
+
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_ack_multiple(self, _find):
+        _find.return_value = Mock()
+        message = Mock()
+        reader = Reader(Node(''), TEST_URL)
+        reader.ack(message, True)
+        message.ack.assert_called_once_with(True)
 
     @patch('gofer.messaging.adapter.model.Adapter.find')
     def test_reject(self, _find):
@@ -531,7 +549,7 @@ class TestReader(TestCase):
         plugin = Mock()
         plugin.Reader.return_value = _impl
         _find.return_value = plugin
-        message = Mock(body='test-content')
+        message = Mock(body='test-content', compression=None)
         document = Mock()
         auth.validate.return_value = document
 
@@ -543,11 +561,57 @@ class TestReader(TestCase):
 
         # validation
         reader.get.assert_called_once_with(10)
-        auth.validate.assert_called_once_with(reader.authenticator, message.body)
+        auth.validate.assert_called_once_with(reader.authenticator, message.body, JSON)
         validate.assert_called_once_with(document)
         self.assertEqual(_message, reader.get.return_value)
         self.assertEqual(_document, document)
 
+    @patch('gofer.messaging.adapter.model.validate')
+    @patch('gofer.messaging.adapter.model.auth')
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_next_compressed(self, _find, auth, validate):
+        _find.return_value = Mock()
+        message = Mock(body=zlib.compress(b'test-content'), compression='zlib')
+
+        # test
+        reader = Reader(Node(''))
+        reader.get = Mock(return_value=message)
+        reader.next(10)
+
+        # validation
+        auth.validate.assert_called_once_with(reader.authenticator, b'test-content', JSON)
+
+    @patch('gofer.messaging.adapter.model.auth')
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_next_decompress_failed(self, _find, auth):
+        _find.return_value = Mock()
+        message = Mock(body=b'garbage', compression='zlib')
+
+        # test
+        reader = Reader(Node(''))
+        reader.get = Mock(return_value=message)
+        self.assertRaises(CompressionError, reader.next, 10)
+
+        # validation
+        message.ack.assert_called_once_with()
+        self.assertFalse(auth.validate.called)
+
+    @patch('gofer.messaging.adapter.model.auth')
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_next_decompress_limit(self, _find, auth):
+        _find.return_value = Mock()
+        message = Mock(body=zlib.compress(b'0' * 1024), compression='zlib')
+
+        # test
+        reader = Reader(Node(''))
+        reader.decompression_limit = 1000
+        reader.get = Mock(return_value=message)
+        self.assertRaises(CompressionError, reader.next, 10)
+
+        # validation
+        message.ack.assert_called_once_with()
+        self.assertFalse(auth.validate.called)
+
     @patch('gofer.messaging.adapter.model.Adapter.find')
     def test_next_not_found(self, _find):
         _impl = Mock()
@@ -574,7 +638,7 @@ class TestReader(TestCase):
         plugin = Mock()
         plugin.Reader.return_value = _impl
         _find.return_value = plugin
-        message = Mock(body='test-content')
+        message = Mock(body='test-content', compression=None)
         auth.validate.side_effect = ModelError
 
         # test
@@ -585,7 +649,7 @@ class TestReader(TestCase):
 
         # validation
         reader.get.assert_called_once_with(10)
-        auth.validate.assert_called_once_with(reader.authenticator, message.body)
+        auth.validate.assert_called_once_with(reader.authenticator, message.body, JSON)
         message.ack.assert_called_once_with()
         self.assertFalse(validate.called)
 
@@ -597,7 +661,7 @@ class TestReader(TestCase):
         plugin = Mock()
         plugin.Reader.return_value = _impl
         _find.return_value = plugin
-        message = Mock(body='test-content')
+        message = Mock(body='test-content', compression=None)
         document = Mock()
         auth.validate.return_value = document
         validate.side_effect = ModelError
@@ -610,7 +674,7 @@ class TestReader(TestCase):
 
         # validation
         reader.get.assert_called_once_with(10)
-        auth.validate.assert_called_once_with(reader.authenticator, message.body)
+        auth.validate.assert_called_once_with(reader.authenticator, message.body, JSON)
         message.ack.assert_called_once_with()
         validate.assert_called_once_with(document)
 
@@ -789,7 +853,7 @@ class TestSender(TestCase):
         sender = Sender(url)
         sender.durable = 18
         sender.send(address, content, ttl)
-        _impl.send.assert_called_once_with(address, content, ttl)
+        _impl.send.assert_called_once_with(address, content, ttl, None, None)
         self.assertEqual(sender.durable, _impl.durable)
 
 
@@ -806,6 +870,10 @@ class TestProducer(TestCase):
         _find.assert_called_with(url)
         self.assertEqual(producer.url, url)
         self.assertEqual(producer.authenticator, None)
+        self.assertEqual(producer.codec, None)
+        self.assertEqual(producer.compression, None)
+        self.assertEqual(producer.compression_level, None)
+        self.assertEqual(producer.compression_threshold, THRESHOLD)
         self.assertEqual(producer._impl, _impl)
         self.assertTrue(isinstance(producer, Messenger))
 
@@ -881,12 +949,93 @@ class TestProducer(TestCase):
             version=VERSION,
             routing=(None, address)
         )
-        unsigned = document.return_value
+        unsigned = document.return_value.__iadd__.return_value
+        unsigned.dump.assert_called_once_with(codec=JSON)
         auth.sign.assert_called_once_with(
-            producer.authenticator, unsigned.__iadd__.return_value.dump.return_value)
-        _impl.send.assert_called_once_with(address, auth.sign.return_value, ttl)
+            producer.authenticator, unsigned.dump.return_value, JSON)
+        _impl.send.assert_called_once_with(address, auth.sign.return_value, ttl, None, None)
         self.assertEqual(sn, uuid4.return_value)
 
+    @patch('gofer.messaging.adapter.model.uuid4')
+    @patch('gofer.messaging.adapter.model.auth')
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_send_codec(self, _find, auth, uuid4):
+        _impl = Mock()
+        plugin = Mock()
+        plugin.Sender.return_value = _impl
+        _find.return_value = plugin
+        uuid4.return_value = '<uuid>'
+        address = 'amq.direct/bar'
+        codec = Mock(CONTENT_TYPE='application/test', DEFAULT=False)
+
+        # test
+        producer = Producer(TEST_URL)
+        producer.codec = codec.CONTENT_TYPE
+        with patch.dict(Codec.codecs, {codec.CONTENT_TYPE: codec}):
+            producer.send(address, A=1)
+
+        # validation
+        encoded = codec.encode.call_args[0][0]
+        self.assertEqual(encoded['codec'], codec.CONTENT_TYPE)
+        self.assertEqual(encoded['A'], 1)
+        auth.sign.assert_called_once_with(
+            producer.authenticator, codec.encode.return_value, codec)
+        _impl.send.assert_called_once_with(
+            address, auth.sign.return_value, None, codec.CONTENT_TYPE, None)
+
+    @patch('gofer.messaging.adapter.model.uuid4')
+    @patch('gofer.messaging.adapter.model.auth')
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_send_compressed(self, _find, auth, uuid4):
+        _impl = Mock()
+        plugin = Mock()
+        plugin.Sender.return_value = _impl
+        _find.return_value = plugin
+        uuid4.return_value = '<uuid>'
+        address = 'amq.direct/bar'
+        compressor = Mock(NAME='test')
+        auth.sign.return_value = 'x' * 10
+
+        # test
+        producer = Producer(TEST_URL)
+        producer.compression = compressor.NAME
+        producer.compression_level = 3
+        producer.compression_threshold = 10
+        with patch.dict(Compressor.compressors, {compressor.NAME: compressor}):
+            producer.send(address, A=1)
+
+        # validation
+        unsigned = auth.sign.call_args[0][1]
+        self.assertTrue('"compression": "test"' in unsigned)
+        compressor.compress.assert_called_once_with(auth.sign.return_value, 3)
+        _impl.send.assert_called_once_with(
+            address, compressor.compress.return_value, None, None, compressor.NAME)
+
+    @patch('gofer.messaging.adapter.model.uuid4')
+    @patch('gofer.messaging.adapter.model.auth')
+    @patch('gofer.messaging.adapter.model.Adapter.find')
+    def test_send_below_threshold(self, _find, auth, uuid4):
+        _impl = Mock()
+        plugin = Mock()
+        plugin.Sender.return_value = _impl
+        _find.return_value = plugin
+        uuid4.return_value = '<uuid>'
+        address = 'amq.direct/bar'
+        compressor = Mock(NAME='test')
+        auth.sign.return_value = 'x' * 9
+
+        # test
+        producer = Producer(TEST_URL)
+        producer.compression = compressor.NAME
+        producer.compression_threshold = 10
+        with patch.dict(Compressor.compressors, {compressor.NAME: compressor}):
+            producer.send(address, A=1)
+
+        # validation
+        self.assertFalse(compressor.compress.called)
+        _impl.send.assert_called_once_with(
+            address, auth.sign.return_value, None, None, None)
+
 
 class TestBaseConnection(TestCase):
 
@@ -1003,6 +1152,18 @@ class TestSSL(TestCase):
             'ca: test-ca|key: test-key|certificate: test-cert|host-validation: False')
 
 
+class TestReconnect(TestCase):
+
+    def test_init(self):
+        policy = Reconnect()
+        self.assertEqual(policy.delay, 10)
+        self.assertEqual(policy.max_delay, 90)
+
+    def test_str(self):
+        policy = Reconnect()
+        self.assertEqual(str(policy), 'delay: 10|max-delay: 90')
+
+
 class TestConnector(TestCase):
 
     def test_init(self):
@@ -1021,6 +1182,8 @@ class TestConnector(TestCase):
         self.assertEqual(b.ssl.client_key, None)
         self.assertEqual(b.ssl.client_certificate, None)
         self.assertFalse(b.ssl.host_validation)
+        self.assertEqual(b.reconnect.delay, 10)
+        self.assertEqual(b.reconnect.max_delay, 90)
 
     @patch('gofer.messaging.adapter.model.Domain.connector.add')
     def test_add(self, add):
@@ -1070,6 +1233,7 @@ class TestMessage(TestCase):
         self.assertEqual(message._reader, reader)
         self.assertEqual(message._impl, impl)
         self.assertEqual(message._body, body)
+        self.assertEqual(message._content_type, None)
 
     def test_body(self):
         reader = Mock()
@@ -1078,13 +1242,29 @@ class TestMessage(TestCase):
         message = Message(reader, impl, body)
         self.assertEqual(message.body, body)
 
+    def test_content_type(self):
+        message = Message(Mock(), Mock(), 'test-body', 'application/json')
+        self.assertEqual(message.content_type, 'application/json')
+
+    def test_compression(self):
+        message = Message(Mock(), Mock(), 'test-body', compression='zlib')
+        self.assertEqual(message.compression, 'zlib')
+
     def test_accept(self):
         reader = Mock()
         impl = Mock()
         body = 'test-body'
         message = Message(reader, impl, body)
         message.ack()
-        reader.ack.assert_called_with(impl)
+        reader.ack.assert_called_with(impl, False)
+
+    def test_accept_multiple(self):
+        reader = Mock()
+        impl = Mock()
+        body = 'test-body'
+        message = Message(reader, impl, body)
+        message.ack(True)
+        reader.ack.assert_called_with(impl, True)
 
     def test_reject(self):
         reader = Mock()
@@ -16,9 +16,9 @@ from mock import patch, Mock
 
 from gofer import ENCODING
 from gofer.messaging import Document
-from gofer.messaging.auth import ValidationFailed, Authenticator
-from gofer.messaging.auth import sign, validate
-from gofer.messaging.auth import peal, load, encode, decode
+from gofer.messaging.auth import ValidationFailed, Authenticator, Cache, Hmac
+from gofer.messaging.auth import sign, validate, validate_all
+from gofer.messaging.auth import peal, load, digest, encode, decode
 
 
 class Test(TestCase):
@@ -50,6 +50,129 @@ class TestAuthenticator(TestCase):
         self.assertRaises(NotImplementedError, auth.sign, digest)
         self.assertRaises(NotImplementedError, auth.validate, document, digest, signature)
 
+    def test_validate_all(self):
+        documents = [Document(sn=n) for n in range(3)]
+        signed = [(d, 'digest', 'signature') for d in documents]
+        auth = Authenticator()
+        auth.validate = Mock(side_effect=[None, ValidationFailed('bad'), ValueError('x')])
+
+        # functional test
+        failed = auth.validate_all(signed)
+
+        # validation
+        self.assertEqual(failed[0], None)
+        self.assertTrue(isinstance(failed[1], ValidationFailed))
+        self.assertTrue(isinstance(failed[2], ValidationFailed))
+        self.assertEqual(failed[2].document, documents[2])
+        self.assertEqual(auth.validate.call_count, 3)
+
+
+class TestCache(TestCase):
+
+    def test_init(self):
+        cache = Cache(10)
+        self.assertEqual(cache.capacity, 10)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+
+    def test_validated(self):
+        cache = Cache()
+        self.assertFalse(cache.validated('d', 's'))
+        cache.add('d', 's')
+        self.assertTrue(cache.validated('d', 's'))
+        self.assertFalse(cache.validated('d', 'x'))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_bounded(self):
+        cache = Cache(2)
+        cache.add('d1', 's')
+        cache.add('d2', 's')
+        cache.validated('d1', 's')
+        cache.add('d3', 's')
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.validated('d1', 's'))
+        self.assertFalse(cache.validated('d2', 's'))
+        self.assertTrue(cache.validated('d3', 's'))
+
+    def test_clear(self):
+        cache = Cache()
+        cache.add('d', 's')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestHmac(TestCase):
+
+    @patch('os.path.exists', return_value=False)
+    def test_init(self, exists):
+        auth = Hmac()
+        exists.assert_called_once_with(Hmac.PATH)
+        self.assertEqual(auth.keys, {})
+        self.assertEqual(auth.key_id, None)
+
+    @patch('os.path.exists', return_value=True)
+    @patch('gofer.messaging.auth.Hmac.load')
+    def test_init_path(self, load, exists):
+        Hmac()
+        load.assert_called_once_with(Hmac.PATH)
+
+    def test_init_keys(self):
+        auth = Hmac({1: 'a', '2': b'b'}, '2')
+        self.assertEqual(auth.keys, {'1': b'a', '2': b'b'})
+        self.assertEqual(auth.key_id, '2')
+
+    @patch('gofer.messaging.auth.Config')
+    def test_load(self, config):
+        config.return_value = {
+            'main': {'key': '2'},
+            'keys': {'1': 'a', '2': 'b'}
+        }
+        path = '/tmp/keys.conf'
+        auth = Hmac({})
+        auth.load(path)
+        config.assert_called_once_with(path)
+        self.assertEqual(auth.keys, {'1': b'a', '2': b'b'})
+        self.assertEqual(auth.key_id, '2')
+
+    def test_sign(self):
+        auth = Hmac({'k1': 'secret'}, 'k1')
+        signature = auth.sign('1234')
+        key_id, mac = signature.split(':')
+        self.assertEqual(key_id, 'k1')
+        self.assertEqual(mac, Hmac.hmac(b'secret', '1234'))
+
+    def test_sign_no_key(self):
+        auth = Hmac({'k1': 'secret'}, 'k2')
+        self.assertRaises(KeyError, auth.sign, '1234')
+
+    def test_validate(self):
+        document = Document()
+        auth = Hmac({'1': 'old', '2': 'new'}, '1')
+        signature = auth.sign('1234')
+        auth.key_id = '2'
+        auth.validate(document, '1234', signature)
+        auth.validate(document, '1234', auth.sign('1234'))
+
+    def test_validate_failed(self):
+        document = Document()
+        auth = Hmac({'1': 'secret'}, '1')
+        signature = auth.sign('1234')
+        self.assertRaises(ValidationFailed, auth.validate, document, '1235', signature)
+        self.assertRaises(ValidationFailed, auth.validate, document, '1234', '1:' + '0' * 64)
+        self.assertRaises(ValidationFailed, auth.validate, document, '1234', '2:' + signature[2:])
+        self.assertRaises(ValidationFailed, auth.validate, document, '1234', '')
+
+    def test_envelope(self):
+        message = '{"sn": 1}'
+        auth = Hmac({'1': 'secret'}, '1')
+        signed = sign(auth, message)
+        document = validate(auth, signed)
+        self.assertEqual(document.sn, 1)
+        other = Hmac({'1': 'other'}, '1')
+        self.assertRaises(ValidationFailed, validate, other, signed)
+
 
 class TestSign(TestCase):
 
@@ -98,6 +221,30 @@ class TestValidation(TestCase):
         decode.assert_called_once_with(signature)
         self.assertEqual(1, validated['A'])
 
+    def test_validate_encoded(self):
+        signature = 'S0xBSkRGOTg4Ug=='
+        message = b'{"message": "{\\"A\\":1}", "signature": "%s"}' % signature.encode()
+        authenticator = Mock()
+
+        # functional test
+        validated = validate(authenticator, memoryview(message))
+
+        # validation
+        authenticator.validate.assert_called_once_with(
+            validated, digest('{"A":1}'), decode(signature))
+        self.assertEqual(1, validated['A'])
+
+    def test_validate_unsigned_encoded(self):
+        message = b'{"A":1}'
+        authenticator = Mock()
+
+        # functional test
+        validated = validate(authenticator, message)
+
+        # validation
+        authenticator.validate.assert_called_once_with(validated, digest(message), '')
+        self.assertEqual(1, validated['A'])
+
     @patch('gofer.messaging.auth.Document')
     def test_validate_failed(self, _document):
         _document.return_value = Document()
@@ -133,6 +280,117 @@ class TestValidation(TestCase):
         validated = validate(None, None)
         self.assertEqual(validated, _document.return_value)
 
+    def test_validate_cached(self):
+        message = '{"message": "{\\"A\\":1}", "signature": "S0xBSkRGOTg4Ug=="}'
+        authenticator = Mock(cache=Cache())
+
+        # functional test
+        validate(authenticator, message)
+        validated = validate(authenticator, message)
+
+        # validation
+        self.assertEqual(authenticator.validate.call_count, 1)
+        self.assertEqual(authenticator.cache.hits, 1)
+        self.assertEqual(1, validated['A'])
+
+    def test_validate_failed_not_cached(self):
+        message = '{"message": "{\\"A\\":1}", "signature": "S0xBSkRGOTg4Ug=="}'
+        authenticator = Mock(cache=Cache())
+        authenticator.validate.side_effect = ValidationFailed
+
+        # functional test
+        self.assertRaises(ValidationFailed, validate, authenticator, message)
+        self.assertRaises(ValidationFailed, validate, authenticator, message)
+
+        # validation
+        self.assertEqual(authenticator.validate.call_count, 2)
+        self.assertEqual(len(authenticator.cache), 0)
+
+
+class TestValidateAll(TestCase):
+
+    def messages(self, count):
+        return [
+            '{"message": "{\\"sn\\":%d}", "signature": "S0xBSkRGOTg4Ug=="}' % n
+            for n in range(count)
+        ]
+
+    def test_validate_all(self):
+        messages = self.messages(3)
+        authenticator = Authenticator()
+        authenticator.validate_all = Mock(
+            return_value=[None, ValidationFailed('bad'), None])
+
+        # functional test
+        validated = validate_all(authenticator, messages)
+
+        # validation
+        signed = authenticator.validate_all.call_args[0][0]
+        self.assertEqual(len(signed), 3)
+        self.assertEqual(signed[1][1], digest('{"sn":1}'))
+        self.assertEqual(signed[1][2], decode('S0xBSkRGOTg4Ug=='))
+        self.assertEqual(validated[0]['sn'], 0)
+        self.assertTrue(isinstance(validated[1], ValidationFailed))
+        self.assertEqual(validated[1].document['sn'], 1)
+        self.assertEqual(validated[2]['sn'], 2)
+
+    def test_validate_all_cached(self):
+        messages = self.messages(3)
+        authenticator = Authenticator()
+        authenticator.cache = Cache()
+        authenticator.validate = Mock()
+
+        # functional test
+        validate_all(authenticator, messages[:2])
+        validated = validate_all(authenticator, messages)
+
+        # validation
+        self.assertEqual(authenticator.validate.call_count, 3)
+        self.assertEqual(authenticator.cache.hits, 2)
+        self.assertEqual([d['sn'] for d in validated], [0, 1, 2])
+
+    def test_validate_all_exception(self):
+        messages = self.messages(2)
+        authenticator = Authenticator()
+        authenticator.validate_all = Mock(side_effect=ValueError)
+
+        # functional test
+        validated = validate_all(authenticator, messages)
+
+        # validation
+        self.assertTrue(isinstance(validated[0], ValidationFailed))
+        self.assertEqual(validated[0].document['sn'], 0)
+        self.assertEqual(validated[1].document['sn'], 1)
+
+    def test_validate_all_mismatched(self):
+        messages = self.messages(3)
+        authenticator = Authenticator()
+        authenticator.cache = Cache()
+        authenticator.validate_all = Mock(return_value=[None, None])
+
+        # functional test
+        validated = validate_all(authenticator, messages)
+
+        # validation
+        self.assertTrue(all(isinstance(d, ValidationFailed) for d in validated))
+        self.assertEqual([d.document['sn'] for d in validated], [0, 1, 2])
+        self.assertEqual(len(authenticator.cache), 0)
+
+    def test_duck_typed(self):
+        messages = self.messages(2)
+        authenticator = Mock(cache=None)
+
+        # functional test
+        validated = validate_all(authenticator, messages)
+
+        # validation
+        self.assertEqual(authenticator.validate.call_count, 2)
+        self.assertEqual([d['sn'] for d in validated], [0, 1])
+
+    def test_no_authenticator(self):
+        validated = validate_all(None, self.messages(2))
+        self.assertEqual([d['sn'] for d in validated], [0, 1])
+
 
 class TestPeal(TestCase):
 
@@ -143,6 +401,13 @@ class TestPeal(TestCase):
         self.assertEqual(original, '{"A":1}')
         self.assertEqual(signature, 'test-signature')
 
+    def test_signed_encoded(self):
+        message = b'{"message": "{\\"A\\":1}", "signature": "test-signature"}'
+        document, original, signature = peal(message)
+        self.assertEqual(document['A'], 1)
+        self.assertEqual(original, '{"A":1}')
+        self.assertEqual(signature, 'test-signature')
+
     def test_unsigned(self):
         message = '{"A":1}'
         document, original, signature = peal(message)
@@ -183,6 +448,17 @@ class TestPeal(TestCase):
         self.assertEqual(document, _document.return_value)
 
 
+class TestDigest(TestCase):
+
+    def test_digest(self):
+        message = '{"A":1}'
+        h = sha256()
+        h.update(message.encode(ENCODING))
+        self.assertEqual(digest(message), h.hexdigest())
+        self.assertEqual(digest(message.encode(ENCODING)), h.hexdigest())
+        self.assertEqual(digest(memoryview(message.encode(ENCODING))), h.hexdigest())
+
+
 class TestEncoding(TestCase):
 
     def test_encode(self):
@@ -0,0 +1,140 @@
+# Copyright (c) 2026 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public
+# License as published by the Free Software Foundation; either version
+# 2 of the License (GPLv2) or (at your option) any later version.
+# There is NO WARRANTY for this software, express or implied,
+# including the implied warranties of MERCHANTABILITY,
+# NON-INFRINGEMENT, or FITNESS FOR A PARTICULAR PURPOSE. You should
+# have received a copy of GPLv2 along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+
+from unittest import TestCase
+
+from mock import patch, Mock, ANY
+
+from gofer.messaging import Document
+from gofer.messaging.codec import Codec, Json, Msgpack, Cbor, JSON
+
+
+MODULE = 'gofer.messaging.codec'
+
+
+class TestCodec(TestCase):
+
+    def test_find(self):
+        self.assertEqual(Codec.find(Json.CONTENT_TYPE), JSON)
+
+    def test_find_default(self):
+        self.assertEqual(Codec.find(), JSON)
+        self.assertEqual(Codec.find(None), JSON)
+        self.assertTrue(Codec.find().DEFAULT)
+
+    def test_find_not_registered(self):
+        self.assertEqual(Codec.find('text/plain'), JSON)
+
+    def test_register(self):
+        codec = Mock(CONTENT_TYPE='application/test')
+        with patch.dict(Codec.codecs):
+            Codec.register(codec)
+            self.assertEqual(Codec.find(codec.CONTENT_TYPE), codec)
+        self.assertEqual(Codec.find(codec.CONTENT_TYPE), JSON)
+
+    def test_abstract(self):
+        codec = Codec()
+        self.assertRaises(NotImplementedError, codec.encode, {})
+        self.assertRaises(NotImplementedError, codec.decode, '{}')
+
+    def test_str(self):
+        self.assertEqual(str(JSON), Json.CONTENT_TYPE)
+
+
+class TestJson(TestCase):
+
+    def test_encode(self):
+        encoded = JSON.encode({'B': 1, 'A': (1, 2)}, sort_keys=True)
+        self.assertEqual(encoded, '{"A": [1, 2], "B": 1}')
+
+    def test_encode_default(self):
+        encoded = JSON.encode({'A': Document(a=1)}, default=Document._default)
+        self.assertEqual(encoded, '{"A": {"a": 1}}')
+
+    def test_decode(self):
+        s = '{"A": 1}'
+        self.assertEqual(JSON.decode(s), {'A': 1})
+        self.assertEqual(JSON.decode(s.encode()), {'A': 1})
+        self.assertEqual(JSON.decode(memoryview(s.encode())), {'A': 1})
+
+
+class TestMsgpack(TestCase):
+
+    @patch(MODULE + '.msgpack')
+    def test_encode(self, msgpack):
+        default = Mock()
+        codec = Msgpack()
+        encoded = codec.encode({'A': 1}, default=default, sort_keys=True)
+        msgpack.packb.assert_called_once_with({'A': 1}, default=default, use_bin_type=True)
+        self.assertEqual(encoded, msgpack.packb.return_value)
+
+    @patch(MODULE + '.msgpack')
+    def test_decode(self, msgpack):
+        codec = Msgpack()
+        decoded = codec.decode(b'\x81')
+        msgpack.unpackb.assert_called_once_with(b'\x81', raw=False)
+        self.assertEqual(decoded, msgpack.unpackb.return_value)
+
+
+class TestCbor(TestCase):
+
+    @patch(MODULE + '.cbor2')
+    def test_encode(self, cbor2):
+        default = Mock()
+        codec = Cbor()
+        encoded = codec.encode({'A': 1}, default=default, sort_keys=True)
+        cbor2.dumps.assert_called_once_with({'A': 1}, default=ANY, canonical=True)
+        self.assertEqual(encoded, cbor2.dumps.return_value)
+
+        # hook
+        encoder = Mock()
+        hook = cbor2.dumps.call_args[1]['default']
+        hook(encoder, 18)
+        default.assert_called_once_with(18)
+        encoder.encode.assert_called_once_with(default.return_value)
+
+    @patch(MODULE + '.cbor2')
+    def test_encode_no_default(self, cbor2):
+        codec = Cbor()
+        codec.encode({'A': 1})
+        hook = cbor2.dumps.call_args[1]['default']
+        self.assertRaises(TypeError, hook, Mock(), object())
+
+    @patch(MODULE + '.cbor2')
+    def test_decode(self, cbor2):
+        codec = Cbor()
+        decoded = codec.decode(b'\xa1')
+        cbor2.loads.assert_called_once_with(b'\xa1')
+        self.assertEqual(decoded, cbor2.loads.return_value)
+
+
+class TestDocument(TestCase):
+
+    def test_dump(self):
+        codec = Mock()
+        document = Document(A=1)
+        encoded = document.dump(codec=codec)
+        codec.encode.assert_called_once_with(
+            document.__dict__, default=Document._default, sort_keys=True)
+        self.assertEqual(encoded, codec.encode.return_value)
+
+    def test_load(self):
+        codec = Mock()
+        codec.decode.return_value = {'A': 1}
+        document = Document().load(b'\x81', codec)
+        codec.decode.assert_called_once_with(b'\x81')
+        self.assertEqual(document.A, 1)
+
+    def test_validate(self):
+        codec = Mock()
+        document = Document(A=1)
+        document.validate(codec)
+        codec.encode.assert_called_once_with(document.__dict__, default=Document._default)
@@ -0,0 +1,160 @@
+# Copyright (c) 2026 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU General Public
+# License as published by the Free Software Foundation; either version
+# 2 of the License (GPLv2) or (at your option) any later version.
+# There is NO WARRANTY for this software, express or implied,
+# including the implied warranties of MERCHANTABILITY,
+# NON-INFRINGEMENT, or FITNESS FOR A PARTICULAR PURPOSE. You should
+# have received a copy of GPLv2 along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
+
+import zlib
+
+from unittest import TestCase
+
+from mock import patch, Mock
+
+from gofer.messaging.model import DocumentError
+from gofer.messaging.compression import Compressor, Zlib, Lz4, Zstd
+from gofer.messaging.compression import CompressionError, LIMIT
+
+
+MODULE = 'gofer.messaging.compression'
+
+
+class TestCompressionError(TestCase):
+
+    def test_init(self):
+        error = CompressionError('zlib', 'failed')
+        self.assertTrue(isinstance(error, DocumentError))
+        self.assertEqual(error.code, CompressionError.CODE)
+        self.assertEqual(error.description, CompressionError.DESCRIPTION)
+        self.assertEqual(error.details, 'compression:zlib, failed')
+
+
+class TestCompressor(TestCase):
+
+    def test_find(self):
+        self.assertTrue(isinstance(Compressor.find(Zlib.NAME), Zlib))
+        self.assertEqual(Compressor.find(None), None)
+        self.assertEqual(Compressor.find('unknown'), None)
+
+    def test_register(self):
+        compressor = Mock(NAME='test')
+        with patch.dict(Compressor.compressors):
+            Compressor.register(compressor)
+            self.assertEqual(Compressor.find(compressor.NAME), compressor)
+        self.assertEqual(Compressor.find(compressor.NAME), None)
+
+    def test_compress(self):
+        compressor = Compressor()
+        compressor.deflate = Mock()
+        compressed = compressor.compress('hello', 3)
+        compressor.deflate.assert_called_once_with(b'hello', 3)
+        self.assertEqual(compressed, compressor.deflate.return_value)
+
+    def test_decompress(self):
+        compressed = zlib.compress(b'hello')
+        self.assertEqual(Compressor.decompress(Zlib.NAME, compressed), b'hello')
+        self.assertEqual(Compressor.decompress(Zlib.NAME, memoryview(compressed)), b'hello')
+
+    def test_decompress_limit(self):
+        compressed = zlib.compress(b'0' * 1024)
+        self.assertEqual(Compressor.decompress(Zlib.NAME, compressed, 1024), b'0' * 1024)
+        self.assertEqual(Compressor.decompress(Zlib.NAME, compressed, 0), b'0' * 1024)
+        self.assertRaises(CompressionError, Compressor.decompress, Zlib.NAME, compressed, 1023)
+
+    def test_decompress_bomb(self):
+        compressor = Mock()
+        compressor.inflate.return_value = b'0' * (LIMIT + 1)
+        with patch.dict(Compressor.compressors, test=compressor):
+            self.assertRaises(CompressionError, Compressor.decompress, 'test', b'hello')
+        compressor.inflate.assert_called_once_with(b'hello', LIMIT + 1)
+
+    def test_decompress_not_registered(self):
+        self.assertRaises(CompressionError, Compressor.decompress, 'unknown', b'hello')
+
+    def test_decompress_failed(self):
+        self.assertRaises(CompressionError, Compressor.decompress, Zlib.NAME, b'hello')
+
+    def test_abstract(self):
+        compressor = Compressor()
+        self.assertRaises(NotImplementedError, compressor.deflate, b'', None)
+        self.assertRaises(NotImplementedError, compressor.inflate, b'', -1)
+
+    def test_str(self):
+        self.assertEqual(str(Zlib()), Zlib.NAME)
+
+
+class TestZlib(TestCase):
+
+    def test_compress(self):
+        compressor = Zlib()
+        data = b'hello' * 100
+        for level in (None, 1, 9):
+            compressed = compressor.compress(data, level)
+            self.assertTrue(len(compressed) < len(data))
+            self.assertEqual(compressor.inflate(compressed), data)
+
+    def test_inflate_max_length(self):
+        compressor = Zlib()
+        data = b'hello' * 100
+        compressed = compressor.compress(data)
+        self.assertEqual(compressor.inflate(compressed, 10), data[:10])
+        self.assertEqual(compressor.inflate(compressed, len(data) + 1), data)
+
+    def test_inflate_truncated(self):
+        compressor = Zlib()
+        compressed = compressor.compress(b'hello' * 100)
+        self.assertRaises(ValueError, compressor.inflate, compressed[:-4])
+
+
+class TestLz4(TestCase):
+
+    @patch(MODULE + '.lz4')
+    def test_deflate(self, lz4):
+        compressor = Lz4()
+        compressed = compressor.deflate(b'hello', None)
+        lz4.compress.assert_called_once_with(b'hello', compression_level=0)
+        self.assertEqual(compressed, lz4.compress.return_value)
+
+    @patch(MODULE + '.lz4')
+    def test_inflate(self, lz4):
+        compressor = Lz4()
+        data = compressor.inflate(b'hello', 10)
+        decompressor = lz4.LZ4FrameDecompressor.return_value
+        decompressor.decompress.assert_called_once_with(b'hello', max_length=10)
+        self.assertEqual(data, decompressor.decompress.return_value)
+
+
+class TestZstd(TestCase):
+
+    @patch(MODULE + '.zstandard')
+    def test_deflate(self, zstandard):
+        compressor = Zstd()
+        compressed = compressor.deflate(b'hello', 9)
+        zstandard.ZstdCompressor.assert_called_once_with(level=9)
+        zstandard.ZstdCompressor.return_value.compress.assert_called_once_with(b'hello')
+        self.assertEqual(compressed, zstandard.ZstdCompressor.return_value.compress.return_value)
+
+    @patch(MODULE + '.zstandard')
+    def test_inflate(self, zstandard):
+        stream = zstandard.ZstdDecompressor.return_value.stream_reader
+        reader = stream.return_value.__enter__.return_value
+        reader.read.side_effect = [b'hello', b'world', b'']
+        compressor = Zstd()
+        data = compressor.inflate(b'compressed')
+        stream.assert_called_once_with(b'compressed')
+        self.assertEqual(data, b'helloworld')
+
+    @patch(MODULE + '.zstandard')
+    def test_inflate_max_length(self, zstandard):
+        stream = zstandard.ZstdDecompressor.return_value.stream_reader
+        reader = stream.return_value.__enter__.return_value
+        reader.read.side_effect = [b'hel', b'lo', b'world']
+        compressor = Zstd()
+        data = compressor.inflate(b'compressed', 5)
+        self.assertEqual(reader.read.call_args_list[0][0], (5,))
+        self.assertEqual(reader.read.call_args_list[1][0], (2,))
+        self.assertEqual(data, b'hello')
@@ -10,15 +10,252 @@
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
 from threading import Thread
+from time import sleep
 from unittest import TestCase
 
 from mock import Mock, patch
 
 from gofer.messaging import Node, NotFound
-from gofer.messaging.consumer import ConsumerThread, Consumer
+from gofer.messaging.consumer import Batch, Pipeline, Tracked, ConsumerThread, Consumer
 from gofer.messaging import DocumentError, ValidationFailed
 
 
+class TestBatch(TestCase):
+
+    def test_init(self):
+        batch = Batch(10, 0.5)
+        self.assertEqual(batch.limit, 10)
+        self.assertEqual(batch.latency, 0.5)
+        self.assertEqual(batch.last, None)
+        self.assertEqual(batch.count, 0)
+        self.assertEqual(batch.started, 0)
+
+    def test_disabled(self):
+        message = Mock()
+        batch = Batch()
+
+        # test
+        batch.add(message)
+
+        # validation
+        message.ack.assert_called_once_with()
+        self.assertEqual(batch.count, 0)
+
+    @patch('gofer.messaging.consumer.time')
+    def test_add(self, time):
+        time.return_value = 10
+        messages = [Mock(), Mock()]
+        batch = Batch(3, 1)
+
+        # test
+        for m in messages:
+            batch.add(m)
+
+        # validation
+        self.assertFalse(messages[0].ack.called)
+        self.assertFalse(messages[1].ack.called)
+        self.assertEqual(batch.last, messages[1])
+        self.assertEqual(batch.count, 2)
+        self.assertEqual(batch.started, 10)
+
+    @patch('gofer.messaging.consumer.time')
+    def test_add_limit(self, time):
+        time.return_value = 10
+        messages = [Mock(), Mock(), Mock()]
+        batch = Batch(3, 1)
+
+        # test
+        for m in messages:
+            batch.add(m)
+
+        # validation
+        messages[2].ack.assert_called_once_with(True)
+        self.assertEqual(batch.count, 0)
+
+    @patch('gofer.messaging.consumer.time')
+    def test_add_expired(self, time):
+        time.side_effect = [10, 10, 11]
+        messages = [Mock(), Mock()]
+        batch = Batch(3, 1)
+
+        # test
+        for m in messages:
+            batch.add(m)
+
+        # validation
+        messages[1].ack.assert_called_once_with(True)
+        self.assertEqual(batch.count, 0)
+
+    @patch('gofer.messaging.consumer.time')
+    def test_wait(self, time):
+        time.return_value = 10
+        batch = Batch(3, 1)
+        # nothing pending
+        self.assertEqual(batch.wait(3), 3)
+        # pending
+        batch.add(Mock())
+        time.return_value = 10.25
+        self.assertEqual(batch.wait(3), 0.75)
+        self.assertEqual(batch.wait(0.5), 0.5)
+        # expired
+        time.return_value = 12
+        self.assertEqual(batch.wait(3), 0)
+
+    def test_flush(self):
+        message = Mock()
+        batch = Batch(3, 1)
+        batch.add(message)
+
+        # test
+        batch.flush()
+        batch.flush()
+
+        # validation
+        message.ack.assert_called_once_with(True)
+        self.assertEqual(batch.last, None)
+        self.assertEqual(batch.count, 0)
+
+    def test_clear(self):
+        message = Mock()
+        batch = Batch(3, 1)
+        batch.add(message)
+
+        # test
+        batch.clear()
+        batch.flush()
+
+        # validation
+        self.assertFalse(message.ack.called)
+
+
+class TestPipeline(TestCase):
+
+    def test_init(self):
+        pipeline = Pipeline(4)
+        self.assertEqual(pipeline.concurrency, 4)
+        self.assertEqual(pipeline.pool, None)
+        self.assertEqual(len(pipeline.pending), 0)
+        self.assertFalse(pipeline.busy)
+
+    @patch('gofer.messaging.consumer.ThreadPool')
+    def test_start(self, pool):
+        pipeline = Pipeline(4)
+        pipeline.start()
+        pool.assert_called_once_with(4, 4)
+        pool.return_value.start.assert_called_once_with()
+        self.assertEqual(pipeline.pool, pool.return_value)
+
+    @patch('gofer.messaging.consumer.ThreadPool')
+    def test_start_inline(self, pool):
+        pipeline = Pipeline()
+        pipeline.start()
+        self.assertFalse(pool.called)
+        self.assertEqual(pipeline.pool, None)
+
+    def test_shutdown(self):
+        pool = Mock()
+        pipeline = Pipeline(4)
+        pipeline.pool = pool
+        pipeline.shutdown()
+        pipeline.shutdown()
+        pool.shutdown.assert_called_once_with()
+        self.assertEqual(pipeline.pool, None)
+
+    def test_wait(self):
+        pipeline = Pipeline(4)
+        pipeline.pending.append(Tracked(Mock()))
+        # inline
+        self.assertEqual(pipeline.wait(3), 3)
+        # busy
+        pipeline.pool = Mock()
+        self.assertEqual(pipeline.wait(3), Pipeline.POLL)
+        # idle
+        pipeline.clear()
+        self.assertEqual(pipeline.wait(3), 3)
+
+    def test_put_inline(self):
+        dispatch = Mock()
+        message = Mock()
+        document = Mock()
+        pipeline = Pipeline()
+
+        # test
+        pipeline.put(dispatch, message, document)
+
+        # validation
+        dispatch.assert_called_once_with(document)
+        self.assertEqual(pipeline.completed(), [message])
+
+    def test_put_inline_failed(self):
+        dispatch = Mock(side_effect=ValueError)
+        pipeline = Pipeline()
+        self.assertRaises(ValueError, pipeline.put, dispatch, Mock(), Mock())
+
+    def test_put(self):
+        dispatch = Mock()
+        message = Mock()
+        document = Mock()
+        pipeline = Pipeline(4)
+        pipeline.pool = Mock()
+
+        # test
+        pipeline.put(dispatch, message, document)
+
+        # validation
+        tracked = pipeline.pending[0]
+        pipeline.pool.run.assert_called_once_with(
+            pipeline._dispatch, dispatch, tracked, document)
+        self.assertFalse(dispatch.called)
+        self.assertEqual(tracked.message, message)
+        self.assertTrue(pipeline.busy)
+
+    def test_completed(self):
+        messages = [Mock(), Mock(), Mock(), Mock()]
+        pipeline = Pipeline(4)
+        for m in messages:
+            pipeline.append(Tracked(m))
+        pipeline.pending[0].done = True
+        pipeline.pending[1].done = True
+        pipeline.pending[3].done = True
+
+        # test
+        completed = pipeline.completed()
+
+        # validation
+        self.assertEqual(completed, messages[:2])
+        self.assertEqual(len(pipeline.pending), 2)
+        self.assertEqual(pipeline.completed(), [])
+
+    def test_dispatch(self):
+        dispatch = Mock(side_effect=ValueError)
+        document = Mock()
+        tracked = Tracked(Mock())
+        self.assertRaises(ValueError, Pipeline._dispatch, dispatch, tracked, document)
+        dispatch.assert_called_once_with(document)
+        self.assertTrue(tracked.done)
+
+    def test_concurrent(self):
+        dispatched = []
+        messages = [Mock() for n in range(10)]
+        pipeline = Pipeline(4)
+
+        # test
+        completed = []
+        pipeline.start()
+        for m in messages:
+            pipeline.put(dispatched.append, m, m)
+        for n in range(100):
+            completed += pipeline.completed()
+            if len(completed) == len(messages):
+                break
+            sleep(0.01)
+        pipeline.shutdown()
+
+        # validation
+        self.assertEqual(len(dispatched), len(messages))
+        self.assertEqual(completed, messages)
+
+
 class TestConsumerThread(TestCase):
 
     def test_init(self):
@@ -30,6 +267,11 @@ class TestConsumerThread(TestCase):
         self.assertEqual(consumer.wait, 3)
         self.assertTrue(isinstance(consumer, Thread))
         self.assertTrue(consumer.daemon)
+        self.assertEqual(consumer.prefetch, 0)
+        self.assertTrue(isinstance(consumer.batch, Batch))
+        self.assertTrue(isinstance(consumer.pipeline, Pipeline))
+        self.assertEqual(consumer.backoff.base, 1)
+        self.assertEqual(consumer.backoff.cap, 30)
         self.assertEqual(consumer.reader,  None)
 
     @patch('gofer.common.Thread.abort')
@@ -45,6 +287,8 @@ class TestConsumerThread(TestCase):
         url = 'test-url'
         node = Node('test-queue')
         consumer = ConsumerThread(node, url)
+        consumer.prefetch = 10
+        consumer.pipeline = Mock()
         consumer.open = Mock()
         consumer.close = Mock()
         consumer.read = Mock(side_effect=StopIteration)
@@ -57,8 +301,11 @@ class TestConsumerThread(TestCase):
 
         # validation
         reader.assert_called_once_with(node, url)
+        self.assertEqual(reader.return_value.prefetch, 10)
+        consumer.pipeline.start.assert_called_once_with()
         consumer.open.assert_called_once_with()
         consumer.read.assert_called_once_with()
+        consumer.pipeline.shutdown.assert_called_once_with()
         consumer.close.assert_called_once_with()
 
     def test_open(self):
@@ -77,6 +324,22 @@ class TestConsumerThread(TestCase):
         url = 'test-url'
         node = Node('test-queue')
         consumer = ConsumerThread(node, url)
+        consumer.batch = Mock()
+        consumer.reader = Mock()
+
+        # test
+        consumer.close()
+
+        # validation
+        consumer.batch.flush.assert_called_once_with()
+        consumer.reader.close.assert_called_once_with()
+
+    def test_close_flush_failed(self):
+        url = 'test-url'
+        node = Node('test-queue')
+        consumer = ConsumerThread(node, url)
+        consumer.batch = Mock()
+        consumer.batch.flush.side_effect = ValueError
         consumer.reader = Mock()
 
         # test
@@ -120,6 +383,7 @@ class TestConsumerThread(TestCase):
         url = 'test-url'
         node = Node('test-queue')
         consumer = ConsumerThread(node, url)
+        consumer.backoff = Mock()
         consumer.reader = Mock()
         consumer.reader.open.side_effect = [ValueError, None]
 
@@ -127,7 +391,8 @@ class TestConsumerThread(TestCase):
         consumer.open()
 
         # validation
-        sleep.assert_called_once_with(30)
+        sleep.assert_called_once_with(consumer.backoff.next.return_value)
+        consumer.backoff.reset.assert_called_once_with()
         self.assertEqual(consumer.reader.open.call_count, 2)
 
     def test_read(self):
@@ -154,14 +419,78 @@ class TestConsumerThread(TestCase):
         consumer = ConsumerThread(node, url)
         consumer.reader = Mock()
         consumer.reader.next.return_value = (None, None)
+        consumer.batch = Mock()
         consumer.dispatch = Mock()
 
         # test
         consumer.read()
 
         # validate
+        consumer.batch.flush.assert_called_once_with()
         self.assertFalse(consumer.dispatch.called)
 
+    def test_read_batch(self):
+        url = 'test-url'
+        node = Node('test-queue')
+        message = Mock()
+        document = Mock()
+        consumer = ConsumerThread(node, url)
+        consumer.batch = Mock()
+        consumer.reader = Mock()
+        consumer.reader.next.return_value = (message, document)
+        consumer.dispatch = Mock()
+
+        # test
+        consumer.read()
+
+        # validate
+        consumer.batch.wait.assert_called_once_with(consumer.wait)
+        consumer.reader.next.assert_called_once_with(consumer.batch.wait.return_value)
+        consumer.dispatch.assert_called_once_with(document)
+        consumer.batch.add.assert_called_once_with(message)
+        self.assertFalse(message.ack.called)
+
+    def test_read_pipeline(self):
+        url = 'test-url'
+        node = Node('test-queue')
+        message = Mock()
+        document = Mock()
+        completed = [Mock(), Mock()]
+        consumer = ConsumerThread(node, url)
+        consumer.batch = Mock()
+        consumer.pipeline = Mock()
+        consumer.pipeline.completed.return_value = completed
+        consumer.reader = Mock()
+        consumer.reader.next.return_value = (message, document)
+
+        # test
+        consumer.read()
+
+        # validate
+        consumer.pipeline.wait.assert_called_once_with(consumer.batch.wait.return_value)
+        consumer.reader.next.assert_called_once_with(consumer.pipeline.wait.return_value)
+        consumer.pipeline.put.assert_called_once_with(consumer.dispatch, message, document)
+        self.assertEqual(
+            consumer.batch.add.call_args_list,
+            [((m,), {}) for m in completed])
+
+    def test_acknowledge(self):
+        url = 'test-url'
+        node = Node('test-queue')
+        completed = [Mock(), Mock()]
+        consumer = ConsumerThread(node, url)
+        consumer.batch = Mock()
+        consumer.pipeline = Mock()
+        consumer.pipeline.completed.return_value = completed
+
+        # test
+        consumer.acknowledge()
+
+        # validate
+        self.assertEqual(
+            consumer.batch.add.call_args_list,
+            [((m,), {}) for m in completed])
+
     def test_read_validation_failed(self):
         url = 'test-url'
         node = Node('test-queue')
@@ -203,6 +532,7 @@ class TestConsumerThread(TestCase):
         url = 'test-url'
         node = Node('test-queue')
         consumer = ConsumerThread(node, url)
+        consumer.backoff = Mock()
         consumer.reader = Mock()
         consumer.reader.next.side_effect = IndexError
         consumer.open = Mock()
@@ -214,7 +544,8 @@ class TestConsumerThread(TestCase):
         # validation
         consumer.close.assert_called_once_with()
         consumer.open.assert_called_once_with()
-        sleep.assert_called_once_with(30)
+        sleep.assert_called_once_with(consumer.backoff.next.return_value)
+        self.assertFalse(consumer.backoff.reset.called)
 
     @patch('gofer.messaging.consumer.sleep')
     def test_read_not_found(self, sleep):
@@ -250,6 +581,8 @@ class TestConsumerThread(TestCase):
         url = 'test-url'
         node = Node('test-queue')
         consumer = ConsumerThread(node, url)
+        consumer.batch = Mock()
+        consumer.pipeline = Mock()
         consumer.open = Mock()
         consumer.close = Mock()
 
@@ -257,6 +590,8 @@ class TestConsumerThread(TestCase):
         consumer.repair()
 
         # Validation
+        consumer.pipeline.clear.assert_called_once_with()
+        consumer.batch.clear.assert_called_once_with()
         consumer.close.assert_called_once_with()
         consumer.open.assert_called_once_with()
 
@@ -74,6 +74,20 @@ class TestDocument(TestCase):
         document.load(s)
         self.assertEqual(document.__dict__, {'A': 1})
 
+    def test_load_encoded(self):
+        s = b'{"A": 1}'
+        self.assertEqual(Document().load(s).__dict__, {'A': 1})
+        self.assertEqual(Document().load(bytearray(s)).__dict__, {'A': 1})
+        self.assertEqual(Document().load(memoryview(s)).__dict__, {'A': 1})
+
+    def test_load_update(self):
+        document = Document(A=0, B=2)
+        document.load('{"A": 1}')
+        self.assertEqual(document.__dict__, {'A': 1, 'B': 2})
+
+    def test_load_not_object(self):
+        self.assertRaises(ValueError, Document().load, '[1, 2]')
+
     def test_dump(self):
         document = Document(
             A=1,
@@ -90,3 +104,27 @@ class TestDocument(TestCase):
             s,
             '{"A": 1, "B": 2, "C": {"a": 1, "b": 2}, "D": {"x": 10, "y": 20}, '
             '"E": [1, {}, {}], "F": 10, "G": "howdy", "H": true}')
+
+    def test_dump_unsorted(self):
+        document = Document()
+        document.B = Document(y=1, x=2)
+        document.A = (1, 2)
+        s = document.dump(sort_keys=False)
+        self.assertEqual(s, '{"B": {"y": 1, "x": 2}, "A": [1, 2]}')
+
+    def test_dump_not_serializable(self):
+        document = Document(A=object())
+        self.assertRaises(TypeError, document.dump)
+
+    def test_validate(self):
+        document = Document(A=1, B=[Document(a=1), dict(b=Document())])
+        document.validate()
+
+    def test_validate_not_serializable(self):
+        document = Document(A=[Document(a=object())])
+        self.assertRaises(TypeError, document.validate)
+
+    def test_validate_circular(self):
+        document = Document(A=[])
+        document.A.append(document)
+        self.assertRaises(ValueError, document.validate)
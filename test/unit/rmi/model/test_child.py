@@ -17,6 +17,7 @@ from unittest import TestCase
 
 from mock import patch, Mock
 
+from gofer.rmi.context import Throttle
 from gofer.rmi.model.child import Progress, Call, ParentMonitor
 from gofer.rmi.model import protocol
 from gofer.mp import Pipe, PipeBroken
@@ -44,6 +45,37 @@ class TestProgress(TestCase):
         self.assertEqual(reply.payload.completed, p.completed)
         self.assertEqual(reply.payload.details, p.details)
 
+    def test_report_throttled(self):
+        pipe = Pipe()
+        p = Progress(pipe.writer, Throttle(interval=60))
+        p.send = Mock()
+        p.total = 10
+
+        # test
+        p.report()
+        p.report()
+        p.completed = 10
+        p.report()
+
+        # validation
+        self.assertEqual(p.send.call_count, 2)
+
+    def test_flush(self):
+        pipe = Pipe()
+        p = Progress(pipe.writer, Throttle(interval=60))
+        p.report()
+        p.completed = 3
+        p.report()
+
+        # test
+        p.flush()
+
+        # validation
+        protocol.Reply.read(pipe.reader)
+        reply = protocol.Reply.read(pipe.reader)
+        self.assertEqual(reply.code, protocol.Progress.CODE)
+        self.assertEqual(reply.payload.completed, 3)
+
 
 class TestCall(TestCase):
 
@@ -54,11 +86,15 @@ class TestCall(TestCase):
         pipe = Pipe()
         pipe.reader.close = Mock()
         call = Call(method, 1, 2, a=1, b=2)
+        context.return_value.progress.throttle = Throttle(0.5, 10)
 
         # test
         call(pipe)
 
         # validation
+        progress = context.return_value.progress
+        self.assertEqual(progress.throttle.interval, 0.5)
+        self.assertEqual(progress.throttle.rate, 10)
         pipe.reader.close.assert_called_once_with()
         monitor.assert_called_once_with(pipe.writer)
         monitor.return_value.start.assert_called_once_with()
@@ -90,6 +126,29 @@ class TestCall(TestCase):
         # validation
         self.assertEqual(reply.code, protocol.Raised.CODE)
 
+    @patch(MODULE + '.ParentMonitor', Mock())
+    @patch(MODULE + '.Context.current')
+    def test_call_exception_flushed(self, context):
+        def method():
+            progress = context.return_value.progress
+            progress.report()
+            progress.completed = 1
+            progress.report()
+            raise ValueError()
+        pipe = Pipe()
+        pipe.reader.close = Mock()
+        context.return_value.progress.throttle = Throttle(0, 1)
+        call = Call(method)
+
+        # test
+        call(pipe)
+
+        # validation
+        codes = [protocol.Reply.read(pipe.reader).code for _ in range(3)]
+        self.assertEqual(
+            codes,
+            [protocol.Progress.CODE, protocol.Progress.CODE, protocol.Raised.CODE])
+
 
 class TestParentMonitor(TestCase):
 
@@ -114,7 +114,9 @@ class TestCall(TestCase):
     @patch(MODULE + '.Process')
     @patch(MODULE + '.Pipe')
     @patch(MODULE + '.Monitor')
-    def test_call(self, monitor, pipe, process, context, target, read):
+    @patch(MODULE + '.Timer')
+    @patch(MODULE + '.Call.account')
+    def test_call(self, account, timer, monitor, pipe, process, context, target, read):
         pipe.return_value = Mock(reader=Mock(), writer=Mock())
 
         # test
@@ -131,6 +133,39 @@ class TestCall(TestCase):
         read.assert_called_once_with(pipe.return_value.reader)
         monitor.return_value.stop.assert_called_once_with()
         process.return_value.wait.assert_called_once_with()
+        timer.return_value.start.assert_called_once_with()
+        timer.return_value.stop.assert_called_once_with()
+        account.assert_called_once_with(
+            context.current.return_value,
+            process.return_value,
+            timer.return_value)
+
+    def test_account(self):
+        context = Mock(usage=None)
+        rusage = Mock(
+            ru_utime=1.5,
+            ru_stime=0.5,
+            ru_maxrss=1024,
+            ru_nvcsw=10,
+            ru_nivcsw=2)
+        child = Mock(rusage=rusage)
+        timer = Mock()
+        timer.duration.return_value = 3.0
+
+        # test
+        _call = Call(Mock())
+        _call.account(context, child, timer)
+
+        # validation
+        self.assertEqual(
+            context.usage.dict(),
+            dict(
+                wall=3.0,
+                utime=1.5,
+                stime=0.5,
+                maxrss=1024,
+                nvcsw=10,
+                nivcsw=2))
 
     @patch(MODULE + '.protocol.Reply')
     def test_read(self, reply):
@@ -0,0 +1,423 @@
+#
+# Copyright (c) 2017 Red Hat, Inc.
+#
+# This software is licensed to you under the GNU Lesser General Public
+# License as published by the Free Software Foundation; either version
+# 2 of the License (LGPLv2) or (at your option) any later version.
+# There is NO WARRANTY for this software, express or implied,
+# including the implied warranties of MERCHANTABILITY,
+# NON-INFRINGEMENT, or FITNESS FOR A PARTICULAR PURPOSE. You should
+# have received a copy of LGPLv2 along with this software; if not, see
+# http://www.gnu.org/licenses/old-licenses/lgpl-2.0.txt.
+#
+# Jeff Ortel <jortel@redhat.com>
+#
+
+from unittest import TestCase
+
+from mock import patch, Mock, ANY
+
+from gofer.collation import Class, Module, Method, Function
+from gofer.mp import Pipe, PipeBroken
+from gofer.rmi.context import Context, Throttle
+from gofer.rmi.model import protocol
+from gofer.rmi.model.worker import Call, Request, Main, Worker
+
+
+MODULE = 'gofer.rmi.model.worker'
+
+
+class Dog(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def bark(self, words):
+        return '%s: %s' % (self.name, words)
+
+    def fail(self):
+        raise ValueError(self.name)
+
+
+def wag(n):
+    return n * 2
+
+
+def method(fn, inst=None):
+    if inst is not None:
+        container = Class(inst.__class__)
+        container.inst = inst
+        member = Method(fn)
+    else:
+        container = Module(Mock(__name__='dog'))
+        member = Function(fn)
+    container += member
+    return member
+
+
+class TestCall(TestCase):
+
+    @patch(MODULE + '.Request')
+    @patch(MODULE + '.Worker')
+    @patch(MODULE + '.Context')
+    def test_call(self, context, worker, request):
+        _method = Mock()
+        _call = Call(_method, 1, 2, a=1, b=2)
+
+        # test
+        retval = _call()
+
+        # validation
+        current = context.current.return_value
+        worker.find.assert_called_once_with(_method.fninfo.plugin)
+        request.assert_called_once_with(
+            _method,
+            current.sn,
+            current.progress.throttle,
+            (1, 2),
+            dict(a=1, b=2))
+        worker.find.return_value.assert_called_once_with(request.return_value)
+        self.assertEqual(retval, worker.find.return_value.return_value)
+
+
+class TestRequest(TestCase):
+
+    def setUp(self):
+        Context.set()
+
+    def tearDown(self):
+        Context.set()
+
+    def test_init(self):
+        inst = Dog('rover')
+        throttle = Throttle(0.5, 10)
+
+        # test
+        request = Request(method(Dog.bark, inst), '1', throttle, (1,), {'a': 2})
+
+        # validation
+        self.assertEqual(request.fn, Dog.bark)
+        self.assertTrue(request.bound)
+        self.assertEqual(request.inst, inst)
+        self.assertEqual(request.sn, '1')
+        self.assertEqual(request.interval, throttle.interval)
+        self.assertEqual(request.rate, throttle.rate)
+        self.assertEqual(request.args, (1,))
+        self.assertEqual(request.kwargs, {'a': 2})
+
+    def test_init_function(self):
+        request = Request(method(wag), '1', Throttle(), (), {})
+        self.assertEqual(request.fn, wag)
+        self.assertFalse(request.bound)
+        self.assertEqual(request.inst, None)
+
+    def test_call(self):
+        pipe = Pipe()
+        request = Request(method(Dog.bark, Dog('rover')), '1', Throttle(), ('hello',), {})
+
+        # test
+        request(pipe.writer)
+
+        # validation
+        reply = protocol.Reply.read(pipe.reader)
+        self.assertEqual(reply.code, protocol.Result.CODE)
+        self.assertEqual(reply.payload, 'rover: hello')
+        self.assertEqual(Context.current(), None)
+
+    def test_call_function(self):
+        pipe = Pipe()
+        request = Request(method(wag), '1', Throttle(), (2,), {})
+
+        # test
+        request(pipe.writer)
+
+        # validation
+        reply = protocol.Reply.read(pipe.reader)
+        self.assertEqual(reply.payload, 4)
+
+    def test_call_raised(self):
+        pipe = Pipe()
+        request = Request(method(Dog.fail, Dog('rover')), '1', Throttle(), (), {})
+
+        # test
+        request(pipe.writer)
+
+        # validation
+        reply = protocol.Reply.read(pipe.reader)
+        self.assertEqual(reply.code, protocol.Raised.CODE)
+        self.assertTrue(isinstance(reply.payload, ValueError))
+
+    def test_call_raised_flushed(self):
+        def fail():
+            progress = Context.current().progress
+            progress.report()
+            progress.completed = 1
+            progress.report()
+            raise ValueError()
+        pipe = Pipe()
+        request = Request(method(fail), '1', Throttle(0, 1), (), {})
+
+        # test
+        request(pipe.writer)
+
+        # validation
+        codes = []
+        while protocol.Raised.CODE not in codes:
+            codes.append(protocol.Reply.read(pipe.reader).code)
+        self.assertEqual(
+            codes,
+            [protocol.Progress.CODE, protocol.Progress.CODE, protocol.Raised.CODE])
+
+    def test_call_pipe_broken(self):
+        pipe = Mock()
+        pipe.put.side_effect = PipeBroken
+        request = Request(method(wag), '1', Throttle(), (2,), {})
+        self.assertRaises(PipeBroken, request, pipe)
+
+    def test_pickle(self):
+        pipe = Pipe()
+        request = Request(method(Dog.bark, Dog('rover')), '1', Throttle(), ('hello',), {})
+
+        # test
+        request.send(pipe.writer)
+        received = Request.read(pipe.reader)
+
+        # validation
+        self.assertEqual(received.fn, Dog.bark)
+        self.assertEqual(received.inst.name, 'rover')
+
+
+class TestMain(TestCase):
+
+    @patch(MODULE + '.gc')
+    @patch(MODULE + '.Worker.detach')
+    @patch(MODULE + '.Request.read')
+    def test_call(self, read, detach, gc):
+        request = Mock()
+        read.side_effect = [request, protocol.End()]
+        requests = Mock()
+        replies = Mock()
+        worker = Mock()
+
+        # test
+        main = Main(worker)
+        main(requests, replies)
+
+        # validation
+        gc.enable.assert_called_once_with()
+        requests.writer.close.assert_called_once_with()
+        replies.reader.close.assert_called_once_with()
+        detach.assert_called_once_with(worker)
+        request.assert_called_once_with(replies.writer)
+
+    @patch(MODULE + '.gc', Mock())
+    @patch(MODULE + '.Worker.detach', Mock())
+    @patch(MODULE + '.Request.read')
+    def test_call_pipe_broken(self, read):
+        request = Mock(side_effect=PipeBroken)
+        read.return_value = request
+
+        # test
+        main = Main(Mock())
+        main(Mock(), Mock())
+
+        # validation
+        request.assert_called_once_with(ANY)
+
+
+class TestWorker(TestCase):
+
+    def setUp(self):
+        Worker.workers = {}
+
+    def tearDown(self):
+        Worker.workers = {}
+
+    def test_init(self):
+        plugin = Mock()
+        worker = Worker(plugin)
+        self.assertEqual(worker.plugin, plugin)
+        self.assertEqual(worker.process, None)
+        self.assertEqual(worker.requests, None)
+        self.assertEqual(worker.replies, None)
+
+    def test_find(self):
+        plugin = Mock()
+        worker = Worker.find(plugin)
+        self.assertEqual(worker.plugin, plugin)
+        self.assertEqual(Worker.find(plugin), worker)
+        self.assertEqual(Worker.workers, {plugin: worker})
+
+    @patch(MODULE + '.Worker.stop')
+    def test_release(self, stop):
+        plugin = Mock()
+        Worker.find(plugin)
+
+        # test
+        Worker.release(plugin)
+        Worker.release(plugin)
+
+        # validation
+        stop.assert_called_once_with()
+        self.assertEqual(Worker.workers, {})
+
+    def test_detach(self):
+        worker = Worker.find(Mock())
+        worker.process = Mock()
+        other = Worker.find(Mock())
+        other.process = Mock()
+        other.requests = Mock()
+        other.replies = Mock()
+        stopped = Worker.find(Mock())
+
+        # test
+        Worker.detach(worker)
+
+        # validation
+        other.requests.writer.close.assert_called_once_with()
+        other.replies.reader.close.assert_called_once_with()
+        self.assertEqual(stopped.process, None)
+
+    @patch('os.waitpid')
+    def test_alive(self, waitpid):
+        worker = Worker(Mock())
+        # no process
+        self.assertFalse(worker.alive)
+        # running
+        worker.process = Mock(pid=1234)
+        waitpid.return_value = (0, 0)
+        self.assertTrue(worker.alive)
+        # terminated
+        waitpid.return_value = (1234, 0)
+        self.assertFalse(worker.alive)
+        # reaped
+        waitpid.side_effect = OSError
+        self.assertFalse(worker.alive)
+
+    @patch(MODULE + '.Main')
+    @patch(MODULE + '.Process')
+    @patch(MODULE + '.Pipe')
+    def test_start(self, pipe, process, main):
+        pipe.side_effect = [Mock(), Mock()]
+        process.return_value.pid = 1234
+        worker = Worker(Mock())
+
+        # test
+        worker.start()
+
+        # validation
+        main.assert_called_once_with(worker)
+        process.assert_called_once_with(main.return_value, worker.requests, worker.replies)
+        process.return_value.start.assert_called_once_with()
+        worker.requests.reader.close.assert_called_once_with()
+        worker.replies.writer.close.assert_called_once_with()
+        self.assertEqual(worker.process, process.return_value)
+
+    @patch(MODULE + '.Worker.alive', True)
+    def test_stop(self):
+        process = Mock(pid=1234)
+        worker = Worker(Mock())
+        worker.process = process
+        worker.requests = Mock()
+        worker.replies = Mock()
+
+        # test
+        worker.stop()
+
+        # validation
+        worker.requests.writer.close.assert_called_once_with()
+        worker.replies.reader.close.assert_called_once_with()
+        process.terminate.assert_called_once_with()
+        process.wait.assert_called_once_with()
+        self.assertEqual(worker.process, None)
+
+    @patch(MODULE + '.Worker.alive', False)
+    def test_stop_terminated(self):
+        process = Mock(pid=1234)
+        worker = Worker(Mock())
+        worker.process = process
+        worker.requests = Mock()
+        worker.replies = Mock()
+
+        # test
+        worker.stop()
+
+        # validation
+        self.assertFalse(process.terminate.called)
+        self.assertEqual(worker.process, None)
+
+    def test_stop_not_started(self):
+        worker = Worker(Mock())
+        worker.stop()
+
+    @patch(MODULE + '.Worker.start')
+    @patch(MODULE + '.Worker.stop')
+    def test_restart(self, stop, start):
+        worker = Worker(Mock())
+        worker.restart()
+        stop.assert_called_once_with()
+        start.assert_called_once_with()
+
+    @patch(MODULE + '.Context')
+    @patch(MODULE + '.Monitor')
+    @patch(MODULE + '.Worker.read')
+    @patch(MODULE + '.Worker.restart')
+    @patch(MODULE + '.Worker.alive', True)
+    def test_call(self, restart, read, monitor, context):
+        request = Mock()
+        worker = Worker(Mock())
+        worker.process = Mock()
+        worker.requests = Mock()
+
+        # test
+        retval = worker(request)
+
+        # validation
+        self.assertFalse(restart.called)
+        monitor.assert_called_once_with(context.current.return_value, worker.process)
+        monitor.return_value.start.assert_called_once_with()
+        request.send.assert_called_once_with(worker.requests.writer)
+        monitor.return_value.stop.assert_called_once_with()
+        self.assertEqual(retval, read.return_value)
+
+    @patch(MODULE + '.Context', Mock())
+    @patch(MODULE + '.Monitor', Mock())
+    @patch(MODULE + '.Worker.read', Mock())
+    @patch(MODULE + '.Worker.restart')
+    @patch(MODULE + '.Worker.alive', False)
+    def test_call_restart(self, restart):
+        worker = Worker(Mock())
+        worker.requests = Mock()
+        worker(Mock())
+        restart.assert_called_once_with()
+
+    @patch(MODULE + '.protocol.Reply')
+    def test_read(self, reply):
+        reply.read.side_effect = [Mock(), Mock(side_effect=protocol.End(18))]
+        worker = Worker(Mock())
+        worker.replies = Mock()
+        worker.replies.reader.poll.side_effect = [False, True, True]
+        worker.process = Mock()
+
+        # test
+        with patch(MODULE + '.Worker.alive', True):
+            retval = worker.read()
+
+        # validation
+        worker.replies.reader.poll.assert_called_with(Worker.POLL)
+        self.assertEqual(retval, 18)
+
+    @patch(MODULE + '.protocol.Reply')
+    @patch(MODULE + '.Worker.alive', False)
+    def test_read_terminated(self, reply):
+        worker = Worker(Mock())
+        worker.process = Mock(pid=1234)
+        worker.replies = Mock()
+        worker.replies.reader.poll.return_value = False
+
+        # test
+        retval = worker.read()
+
+        # validation
+        self.assertFalse(reply.read.called)
+        self.assertEqual(retval, None)
@@ -2,7 +2,7 @@ from unittest import TestCase
 
 from mock import Mock, patch
 
-from gofer.rmi.context import Context, Progress, Cancelled
+from gofer.rmi.context import Context, Progress, Throttle
 
 
 MODULE = 'gofer.rmi.context'
@@ -24,6 +24,7 @@ class TestContext(TestCase):
         self.assertEqual(context.sn, sn)
         self.assertEqual(context.progress, progress)
         self.assertEqual(context.cancelled, cancelled)
+        self.assertEqual(context.usage, None)
 
     def test_set(self):
         context = Context('1', Mock(), Mock())
@@ -35,8 +36,125 @@ class TestContext(TestCase):
         self.assertEqual(Context._current.inst, None)
 
 
+class TestThrottle(TestCase):
+
+    def test_init(self):
+        throttle = Throttle(0.5, 10)
+        self.assertEqual(throttle.interval, 0.5)
+        self.assertEqual(throttle.rate, 10)
+        self.assertEqual(len(throttle.sent), 0)
+        self.assertFalse(throttle.pending)
+
+    def test_unlimited(self):
+        throttle = Throttle()
+        for n in range(100):
+            self.assertTrue(throttle.accept())
+        self.assertFalse(throttle.pending)
+
+    @patch(MODULE + '.time')
+    def test_interval(self, time):
+        time.return_value = 10.0
+        throttle = Throttle(interval=0.5)
+        self.assertTrue(throttle.accept())
+        time.return_value = 10.1
+        self.assertFalse(throttle.accept())
+        self.assertTrue(throttle.pending)
+        time.return_value = 10.5
+        self.assertTrue(throttle.accept())
+        self.assertFalse(throttle.pending)
+
+    @patch(MODULE + '.time')
+    def test_rate(self, time):
+        time.return_value = 10.0
+        throttle = Throttle(rate=2)
+        self.assertTrue(throttle.accept())
+        self.assertTrue(throttle.accept())
+        self.assertFalse(throttle.accept())
+        time.return_value = 11.0
+        self.assertTrue(throttle.accept())
+        self.assertEqual(len(throttle.sent), 1)
+
+    @patch(MODULE + '.time')
+    def test_final(self, time):
+        time.return_value = 10.0
+        throttle = Throttle(interval=10, rate=1)
+        self.assertTrue(throttle.accept())
+        self.assertFalse(throttle.accept())
+        self.assertTrue(throttle.accept(final=True))
+        self.assertFalse(throttle.pending)
+
+    @patch(MODULE + '.time')
+    def test_flush(self, time):
+        time.return_value = 10.0
+        throttle = Throttle(rate=1)
+        self.assertFalse(throttle.flush())
+        throttle.accept()
+        throttle.accept()
+        self.assertTrue(throttle.flush())
+        self.assertFalse(throttle.pending)
+        self.assertFalse(throttle.flush())
+
+
 class TestProgress(TestCase):
 
+    def test_init(self):
+        request = Mock()
+        producer = Mock()
+        throttle = Mock()
+        progress = Progress(request, producer, throttle)
+        self.assertEqual(progress.request, request)
+        self.assertEqual(progress.producer, producer)
+        self.assertEqual(progress.throttle, throttle)
+        self.assertEqual(progress.total, 0)
+        self.assertEqual(progress.completed, 0)
+        self.assertEqual(progress.details, {})
+
+    def test_final(self):
+        progress = Progress(Mock(), Mock())
+        self.assertFalse(progress.final)
+        progress.total = 10
+        progress.completed = 4
+        self.assertFalse(progress.final)
+        progress.completed = 10
+        self.assertTrue(progress.final)
+
+    def test_report_throttled(self):
+        request = Mock(sn=1, data=2, replyto=3)
+        producer = Mock()
+        progress = Progress(request, producer, Throttle(interval=60))
+        progress.total = 10
+
+        # test
+        for n in range(10):
+            progress.completed = n
+            progress.report()
+
+        # validation
+        self.assertEqual(producer.send.call_count, 1)
+        self.assertTrue(progress.throttle.pending)
+
+        # final
+        progress.completed = 10
+        progress.report()
+        self.assertEqual(producer.send.call_count, 2)
+        self.assertFalse(progress.throttle.pending)
+
+    def test_flush(self):
+        request = Mock(sn=1, data=2, replyto=3)
+        producer = Mock()
+        progress = Progress(request, producer, Throttle(interval=60))
+        progress.report()
+        progress.completed = 4
+        progress.report()
+
+        # test
+        progress.flush()
+        progress.flush()
+
+        # validation
+        self.assertEqual(producer.send.call_count, 2)
+        self.assertEqual(producer.send.call_args[1]['completed'], 4)
+
     def test_report(self):
         request = Mock(sn=1, data=2, replyto=3)
         producer = Mock()
@@ -82,28 +200,3 @@ class TestProgress(TestCase):
         # validation
         self.assertFalse(producer.send.called)
 
-
-class TestCancelled(TestCase):
-
-    @patch(MODULE + '.Tracker')
-    def test_call(self, tracker):
-        sn = '1'
-        cancelled = Cancelled(sn)
-        r = cancelled()
-        tracker.assert_called_once_with()
-        tracker.return_value.cancelled.assert_called_once_with(sn)
-        self.assertEqual(r, tracker.return_value.cancelled.return_value)
-
-    @patch(MODULE + '.Tracker')
-    def test_del(self, tracker):
-        sn = '1'
-        cancelled = Cancelled(sn)
-        cancelled.__del__()
-        tracker.return_value.remove.assert_called_once_with(sn)
-
-    @patch(MODULE + '.Tracker')
-    def test_del_key_error(self, tracker):
-        sn = '1'
-        tracker.return_value.remove.side_effect = KeyError()
-        cancelled = Cancelled(sn)
-        cancelled.__del__()
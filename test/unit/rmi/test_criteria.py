@@ -11,7 +11,7 @@
 
 from unittest import TestCase
 
-from mock import Mock
+from mock import Mock, patch
 
 from gofer.rmi.criteria import *
 
@@ -58,6 +58,14 @@ class TestMatch(TestCase):
         match = Match('')
         self.assertFalse(match(''))
 
+    def test_match_criteria(self):
+        match = Match({'id': In([1, 2]), 'age': 88})
+        self.assertTrue(match({'id': 1}))
+        self.assertTrue(match({'id': 2, 'age': 88}))
+        self.assertTrue(match({'age': 88}))
+        self.assertFalse(match({'id': 3}))
+        self.assertFalse(match({'id': 1, 'age': 18}))
+
     def test_valid(self):
         # criteria not a dict
         match = Match('')
@@ -113,8 +121,100 @@ class TestMatch(TestCase):
         self.assertFalse(_or.match(2))
 
 
+class TestCompiled(TestCase):
+
+    LOCATORS = [
+        None, 0, 1, 2, 3, 'joe', [1], {},
+        {'id': 44}, {'age': 88}, {'id': 44, 'age': 88}, {'id': 1, 'age': 18},
+        {'id': [1]}, {'name': 'joe'},
+    ]
+
+    def verify(self, criteria):
+        compiled = Compiled(criteria)
+        for locator in self.LOCATORS:
+            try:
+                expected = criteria.match(locator)
+            except TypeError:
+                continue
+            self.assertEqual(compiled.match(locator), expected, msg=repr(locator))
+
+    def test_init(self):
+        criteria = Equal(1)
+        compiled = Compiled(criteria)
+        self.assertEqual(compiled.criteria, criteria)
+        self.assertTrue(compiled(1))
+        self.assertEqual(compiled.compile(), compiled.match)
+
+    def test_compile(self):
+        self.verify(Match({'id': 44, 'age': 88}))
+        self.verify(Match({'id': In([1, 2]), 'age': 18}))
+        self.verify(Match({}))
+        self.verify(Match(88))
+        self.verify(Equal(1))
+        self.verify(Equal({'id': 44}))
+        self.verify(NotEqual(1))
+        self.verify(Greater(1))
+        self.verify(Less(2))
+        self.verify(In([1, 2, 'joe']))
+        self.verify(In([[1], 2]))
+        self.verify(In('joe'))
+        self.verify(And((Greater(0), Less(3))))
+        self.verify(And((And((Greater(0), Less(3))), NotEqual(2))))
+        self.verify(Or((Equal(1), Or((Equal(3), Equal('joe'))))))
+        self.verify(Or((Match({'id': 44}), In([1, 2]))))
+
+    def test_in_folded(self):
+        compiled = Compiled(In([1, 2]))
+        self.assertTrue(compiled(1))
+        self.assertFalse(compiled(3))
+        self.assertFalse(compiled([1]))
+
+    def test_flatten(self):
+        a, b, c = Equal(1), Equal(2), Equal(3)
+        self.assertEqual(flatten(And((And((a, b)), c))), [a, b, c])
+        operands = flatten(Or((a, And((b, c)))))
+        self.assertEqual(operands[0], a)
+        self.assertTrue(isinstance(operands[1], And))
+
+
 class TestBuilder(TestCase):
 
+    def setUp(self):
+        Builder.compiled.clear()
+
+    def tearDown(self):
+        Builder.compiled.clear()
+
+    def test_compile(self):
+        b = Builder()
+        criteria = {'match': {'id': {'in': [1, 2]}, 'age': 88}}
+        compiled = b.compile(criteria)
+        self.assertTrue(isinstance(compiled, Compiled))
+        self.assertTrue(isinstance(compiled.criteria, Match))
+        self.assertTrue(compiled({'id': 1}))
+        self.assertFalse(compiled({'id': 1, 'age': 18}))
+        # cached
+        self.assertEqual(b.compile({'match': {'age': 88, 'id': {'in': [1, 2]}}}), compiled)
+        self.assertEqual(len(Builder.compiled), 1)
+        # empty
+        self.assertEqual(b.compile({}), None)
+
+    def test_compile_not_cached(self):
+        b = Builder()
+        compiled = b.compile({'eq': object()})
+        self.assertTrue(isinstance(compiled, Compiled))
+        self.assertEqual(len(Builder.compiled), 0)
+
+    @patch('gofer.rmi.criteria.Builder.CACHE', 2)
+    def test_compile_bounded(self):
+        b = Builder()
+        first = b.compile({'eq': 1})
+        b.compile({'eq': 2})
+        b.compile({'eq': 1})
+        b.compile({'eq': 3})
+        self.assertEqual(len(Builder.compiled), 2)
+        self.assertEqual(b.compile({'eq': 1}), first)
+
     def test_build(self):
         b = Builder()
         # no criteria
@@ -149,6 +249,15 @@ class TestBuilder(TestCase):
         self.assertFalse(match({'id': 44, 'age': 88}))
         self.assertFalse(match({'age': 88}))
 
+    def test_match_in(self):
+        b = Builder()
+        match = b.build({'match': {'id': {'in': [1, 2]}, 'age': 88}})
+        self.assertTrue(isinstance(match.criteria['id'], In))
+        self.assertTrue(match({'id': 1}))
+        self.assertTrue(match({'id': 2, 'age': 88}))
+        self.assertFalse(match({'id': 3}))
+        self.assertFalse(match({'id': 1, 'age': 18}))
+
     def test_eq(self):
         b = Builder()
         eq = b.build({'eq': 1})
@@ -11,7 +11,9 @@
 
 from unittest import TestCase
 
+from gofer import collation
 from gofer.rmi.dispatcher import DispatchError, NamespaceNotFound, MemberNotFound
+from gofer.rmi.dispatcher import Dispatcher, Request, RMI
 
 
 class TestExceptions(TestCase):
@@ -20,3 +22,69 @@ class TestExceptions(TestCase):
         self.assertTrue(isinstance(DispatchError(), Exception))
         self.assertTrue(isinstance(NamespaceNotFound('google'), DispatchError))
         self.assertTrue(isinstance(MemberNotFound('google', 'search'), DispatchError))
+
+
+class Dog(object):
+
+    def __init__(self, name=''):
+        self.name = name
+
+    def bark(self, words):
+        return '{}: {}'.format(self.name, words)
+
+
+def catalog():
+    cls = collation.Class(Dog)
+    cls += collation.Method(Dog.bark)
+    return {'Dog': cls}
+
+
+def request(method='bark', cntr=None):
+    return Request(classname='Dog', method=method, cntr=cntr, args=['hello'], kwargs={})
+
+
+class TestRMI(TestCase):
+
+    def test_find_target(self):
+        target = RMI.find_target(request(cntr=(['Max'], {})), catalog())
+        self.assertTrue(isinstance(target, collation.Bound))
+        self.assertEqual(target.inst.name, 'Max')
+        self.assertEqual(target('hello'), 'Max: hello')
+
+    def test_find_target_table(self):
+        _catalog = catalog()
+        table = Dispatcher.build(_catalog)
+        target = RMI.find_target(request(), {}, table)
+        self.assertEqual(target.container, _catalog['Dog'])
+        target = RMI.find_target(request(), _catalog, {})
+        self.assertEqual(target.container, _catalog['Dog'])
+
+    def test_not_found(self):
+        _catalog = catalog()
+        table = Dispatcher.build(_catalog)
+        self.assertRaises(MemberNotFound, RMI.find_target, request('sit'), _catalog, table)
+        _request = Request(classname='Cat', method='bark', cntr=None)
+        self.assertRaises(NamespaceNotFound, RMI.find_target, _request, _catalog, table)
+
+    def test_concurrent(self):
+        _catalog = catalog()
+        table = Dispatcher.build(_catalog)
+        max = RMI.find_target(request(cntr=(['Max'], {})), _catalog, table)
+        rex = RMI.find_target(request(cntr=(['Rex'], {})), _catalog, table)
+        self.assertEqual(max('hello'), 'Max: hello')
+        self.assertEqual(rex('hello'), 'Rex: hello')
+
+
+class TestDispatcher(TestCase):
+
+    def test_table(self):
+        dispatcher = Dispatcher()
+        self.assertEqual(dispatcher.table, {})
+        _catalog = catalog()
+        dispatcher['Dog'] = _catalog['Dog']
+        self.assertEqual(list(dispatcher.table), ['Dog.bark'])
+        other = Dispatcher()
+        other += dispatcher
+        self.assertEqual(list(other.table), ['Dog.bark'])
+        other['Dog'] = Dog
+        self.assertEqual(other.table, {})
@@ -9,8 +9,261 @@
 # have received a copy of GPLv2 along with this software; if not, see
 # http://www.gnu.org/licenses/old-licenses/gpl-2.0.txt.
 
+import os
+import shutil
+import tempfile
+
 from unittest import TestCase
 
+from mock import patch
+
+from gofer.common import Singleton
+from gofer.rmi.criteria import Builder, Match, Equal, NotEqual, Greater, Less, And
+from gofer.rmi.tracker import Tracker, Index, Token
+from gofer.rmi.tracker import Canceled as Journal
+
+
+class Canceled(set):
+
+    def add_all(self, sn_list):
+        self.update(sn_list)
+
+    def delete(self, sn):
+        self.discard(sn)
+
+
+class TestToken(TestCase):
+
+    def test_call(self):
+        token = Token('1')
+        self.assertEqual(token.sn, '1')
+        self.assertFalse(token())
+        token.set()
+        self.assertTrue(token())
+
+
+class TestIndex(TestCase):
+
+    def test_add(self):
+        index = Index('id')
+        index.add('1', {'id': 10})
+        index.add('2', {'id': 10})
+        index.add('3', {'age': 20})
+        index.add('4', {'id': [1]})
+        index.add('5', 10)
+        self.assertEqual(index.values, {10: {'1', '2'}})
+        self.assertEqual(index.unindexed, {'3', '4'})
+
+    def test_remove(self):
+        index = Index('id')
+        index.add('1', {'id': 10})
+        index.add('2', {'id': 10})
+        index.add('3', {'age': 20})
+        index.add('4', {'id': [1]})
+        index.remove('1', {'id': 10})
+        index.remove('3', {'age': 20})
+        index.remove('4', {'id': [1]})
+        index.remove('5', 10)
+        self.assertEqual(index.values, {10: {'2'}})
+        self.assertEqual(index.unindexed, set())
+        index.remove('2', {'id': 10})
+        self.assertEqual(index.values, {})
+
+    def test_find(self):
+        index = Index('id')
+        index.add('1', {'id': 10})
+        index.add('2', {'id': 20})
+        index.add('3', {'age': 20})
+        self.assertEqual(index.find(10), {'1', '3'})
+        self.assertEqual(index.find(10, 20), {'1', '2', '3'})
+        self.assertEqual(index.find(30), {'3'})
+        self.assertRaises(TypeError, index.find, [10])
+
+
+class TestTracker(TestCase):
+
+    def setUp(self):
+        Singleton._inst.clear()
+        with patch('gofer.rmi.tracker.Canceled', Canceled):
+            self.tracker = Tracker()
+        self.tracker.add('1', {'task_id': 1, 'group_id': 'A'})
+        self.tracker.add('2', {'task_id': 2, 'group_id': 'A'})
+        self.tracker.add('3', {'task_id': 3, 'group_id': 'B'})
+        self.tracker.add('4', {'group_id': 'B'})
+        self.tracker.add('5', 'hello')
+
+    def tearDown(self):
+        Singleton._inst.clear()
+
+    def find(self, criteria):
+        return sorted(self.tracker.find(Builder().build(criteria)))
+
+    def test_find(self):
+        self.assertEqual(self.find({'match': {'task_id': 1}}), ['1', '4'])
+        self.assertEqual(self.find({'match': {'group_id': 'B'}}), ['3', '4'])
+        self.assertEqual(self.find({'eq': 'hello'}), ['5'])
+
+    def test_find_indexed(self):
+        criteria = [
+            {'match': {'task_id': 1}},
+            {'match': {'task_id': {'in': [1, 3]}}},
+            {'match': {'task_id': 2, 'group_id': 'B'}},
+            {'match': {'task_id': [1]}},
+            {'match': {'task_id': {'eq': 2}}},
+            {'match': {'task_id': {'neq': 1}}},
+            {'match': {'task_id': {'gt': 1}}},
+            {'match': {'task_id': {'lt': 3}}},
+            {'match': {'task_id': {'and': ({'gt': 1}, {'lt': 3})}}},
+            {'match': {'task_id': {'or': ({'eq': 1}, {'eq': 3})}}},
+            {'match': {'task_id': {'neq': 1}, 'group_id': 'A'}},
+            {'and': ({'match': {'task_id': 2}}, {'match': {'group_id': 'A'}})},
+            {'or': ({'match': {'task_id': 2}}, {'match': {'group_id': 'B'}})},
+            {'or': ({'match': {'task_id': 2}}, {'eq': 'hello'})},
+            {'eq': 'hello'},
+        ]
+        scanned = [self.find(c) for c in criteria]
+        self.tracker.index('task_id', 'group_id')
+        self.assertEqual([self.find(c) for c in criteria], scanned)
+        self.tracker.add('6', {'task_id': 1, 'group_id': 'C'})
+        self.tracker.remove('1')
+        self.assertEqual(self.find(criteria[0]), ['4', '6'])
+
+    def test_plan(self):
+        self.tracker.index('task_id')
+        self.assertEqual(self.tracker.plan(Match({'task_id': 2})), {'2', '4'})
+        self.assertEqual(self.tracker.plan(Match({'group_id': 'A'})), None)
+        self.assertEqual(self.tracker.plan(Equal('hello')), None)
+        self.assertEqual(self.tracker.plan(Match({'task_id': Equal(2)})), {'2', '4'})
+        self.assertEqual(self.tracker.plan(Match({'task_id': NotEqual(2)})), None)
+        self.assertEqual(self.tracker.plan(Match({'task_id': Greater(1)})), None)
+        self.assertEqual(
+            self.tracker.plan(Match({'task_id': And((Greater(1), Less(3)))})), None)
+        candidates = self.tracker.candidates(Match({'task_id': 2}))
+        self.assertEqual(sorted(c[0] for c in candidates), ['2', '4'])
+
+    def test_add_replaced(self):
+        self.tracker.index('task_id')
+        self.tracker.add('1', {'task_id': 5})
+        self.assertEqual(self.find({'match': {'task_id': 1}}), ['4'])
+        self.assertEqual(self.find({'match': {'task_id': 5}}), ['1', '4'])
+
+    def test_find_all(self):
+        b = Builder()
+        criteria = [b.compile({'match': {'task_id': 1}}), b.compile({'match': {'task_id': 3}})]
+        self.assertEqual(sorted(self.tracker.find_all(criteria)), ['1', '3', '4'])
+        self.tracker.index('task_id')
+        self.assertEqual(sorted(self.tracker.find_all(criteria)), ['1', '3', '4'])
+        criteria.append(b.compile({'match': {'task_id': {'gt': 1}}}))
+        self.assertEqual(sorted(self.tracker.find_all(criteria)), ['1', '2', '3', '4'])
+        criteria.append(b.compile({'eq': 'hello'}))
+        self.assertEqual(sorted(self.tracker.find_all(criteria)), ['1', '2', '3', '4', '5'])
+        self.assertEqual(self.tracker.find_all([]), [])
+
+    def test_cancel_all(self):
+        self.tracker.cancel('1')
+        cancelled = self.tracker.cancel_all(['1', '2', '2', '3', '100'])
+        self.assertEqual(cancelled, ['2', '3'])
+        self.assertTrue(self.tracker.cancelled('2'))
+        self.assertTrue(self.tracker.cancelled('3'))
+        self.assertFalse(self.tracker.cancelled('100'))
+
+    def test_token(self):
+        token = self.tracker.token('1')
+        self.assertEqual(token, self.tracker.token('1'))
+        self.assertFalse(token())
+        self.tracker.cancel('1')
+        self.assertTrue(token())
+        self.tracker.cancel_all(['2'])
+        self.assertTrue(self.tracker.token('2')())
+        self.tracker.remove('1')
+        self.assertNotEqual(self.tracker.token('1'), token)
+        self.assertFalse(self.tracker.token('1')())
+
+    def test_token_persisted(self):
+        self.tracker.cancel('1')
+        self.tracker.remove_index('1')
+        token = self.tracker.add('1', {'task_id': 1})
+        self.assertTrue(token())
+        self.assertEqual(self.tracker.token('1'), token)
+
+    def test_cancel(self):
+        self.assertEqual(self.tracker.cancel('1'), '1')
+        self.assertEqual(self.tracker.cancel('1'), None)
+        self.assertTrue(self.tracker.cancelled('1'))
+        self.assertFalse(self.tracker.cancelled('2'))
+        self.assertRaises(Exception, self.tracker.cancel, '100')
+        self.tracker.remove('1')
+        self.assertFalse(self.tracker.cancelled('1'))
+
+
+class TestCanceled(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'canceled')
+        self.patcher = patch('gofer.rmi.tracker.Canceled.PATH', self.path)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.tmp)
+
+    def journal(self):
+        with open(os.path.join(self.path, Journal.JOURNAL)) as fp:
+            return fp.read().split()
+
+    def test_init(self):
+        canceled = Journal()
+        self.assertTrue(os.path.isdir(self.path))
+        self.assertEqual(canceled.collection, set())
+        self.assertEqual(canceled.records, 0)
+        self.assertEqual(self.journal(), [])
+
+    def test_add_delete(self):
+        canceled = Journal()
+        canceled.add('1')
+        canceled.add('1')
+        canceled.add_all(['2', '3'])
+        canceled.delete('2')
+        canceled.delete('4')
+        canceled.close()
+        self.assertTrue('1' in canceled)
+        self.assertFalse('2' in canceled)
+        self.assertEqual(len(canceled), 2)
+        self.assertEqual(self.journal(), ['+1', '+2', '+3', '-2'])
+        canceled.delete_all(['1', '3'])
+        self.assertEqual(len(canceled), 0)
+
+    def test_load(self):
+        canceled = Journal()
+        canceled.add_all(['1', '2', '3'])
+        canceled.delete('2')
+        canceled.close()
+        canceled = Journal()
+        self.assertEqual(canceled.collection, {'1', '3'})
+        self.assertEqual(sorted(self.journal()), ['+1', '+3'])
+        self.assertEqual(canceled.records, 2)
+
+    def test_migrate(self):
+        os.makedirs(self.path)
+        for sn in ('1', '2'):
+            with open(os.path.join(self.path, sn), 'w') as fp:
+                fp.write(sn)
+        canceled = Journal()
+        self.assertEqual(canceled.collection, {'1', '2'})
+        self.assertEqual(sorted(os.listdir(self.path)), [Journal.JOURNAL])
+        self.assertEqual(sorted(self.journal()), ['+1', '+2'])
 
-class Test(TestCase):
-    pass
\ No newline at end of file
+    @patch('gofer.rmi.tracker.Canceled.COMPACT', 3)
+    def test_compact(self):
+        canceled = Journal()
+        canceled.add_all(['1', '2', '3'])
+        canceled.delete('1')
+        self.assertEqual(self.journal(), ['+1', '+2', '+3', '-1'])
+        canceled.delete('2')
+        self.assertEqual(self.journal(), ['+3'])
+        self.assertEqual(canceled.records, 1)
+        canceled.delete('3')
+        canceled.add('4')
+        canceled.close()
+        self.assertEqual(self.journal(), ['+3', '-3', '+4'])
@@ -13,6 +13,7 @@ import unittest
 import mock
 
 from gofer import collation
+from gofer import decorators
 from gofer import inspection
 
 
@@ -47,6 +48,21 @@ class Zebra(object):
         pass
 
 
+class Dog(object):
+
+    def bark(self):
+        pass
+
+    class Puppy(object):
+
+        def bark(self):
+            pass
+
+
+class Akita(Dog):
+    pass
+
+
 class TestCollator(unittest.TestCase):
 
     def test_collate(self):
@@ -79,6 +95,30 @@ class TestCollator(unittest.TestCase):
             ])
 
 
+    def test_qualname(self):
+        collator = collation.Collator()
+        classes, functions = collator({Dog.bark: {}, Dog.Puppy.bark: {}, fn1: {}})
+        self.assertEqual([c.impl for c in classes], [Dog, Dog.Puppy])
+        self.assertEqual([f.impl for f in functions[0]], [fn1])
+
+    def test_inherited(self):
+        collator = collation.Collator()
+        classes, _ = collator({Dog.bark: {}})
+        self.assertEqual([c.impl for c in classes], [Dog])
+        self.assertEqual(collator.methods, {})
+
+    def test_aliased(self):
+        def jog(self):
+            pass
+        mod = inspection.module(fn1)
+        collator = collation.Collator()
+        with mock.patch.object(Person, 'jog', jog, create=True):
+            classes, functions = collator({jog: {}})
+        self.assertEqual([c.impl for c in classes], [Person])
+        self.assertEqual(functions, [])
+        self.assertEqual(collator.methods[mod][jog], Person)
+
+
 class TestModule(unittest.TestCase):
 
     def test_init(self):
@@ -123,6 +163,30 @@ class TestClass(unittest.TestCase):
         cls = collation.Class(impl)
         self.assertEqual(cls.name, impl.__name__)
         self.assertEqual(cls.impl, impl)
+        self.assertEqual(cls.instances, None)
+
+    def test_construct(self):
+        cls = collation.Class(Person)
+        inst = cls.construct(parent='Jane')
+        self.assertTrue(isinstance(inst, Person))
+        self.assertEqual(inst.parent, 'Jane')
+        self.assertNotEqual(cls.construct(parent='Jane'), inst)
+        self.assertEqual(cls.inst, None)
+
+    def test_construct_cached(self):
+        @decorators.cached(size=2)
+        class Horse(object):
+            def __init__(self, name=''):
+                self.name = name
+        cls = collation.Class(Horse)
+        self.assertEqual(cls.instances.capacity, 2)
+        inst = cls.construct('Ed')
+        self.assertEqual(inst.name, 'Ed')
+        self.assertEqual(cls.construct('Ed'), inst)
+        self.assertNotEqual(cls.construct(name='Ed'), inst)
+        cls.construct('Bob')
+        self.assertNotEqual(cls.construct('Ed'), inst)
+        self.assertEqual(len(cls.instances), 2)
 
     def test_operators(self):
         impl = Person
@@ -168,6 +232,10 @@ class TestFunction(unittest.TestCase):
         self.assertLess(fn, collation.Function(fn2))
         self.assertEqual(hash(fn1), hash(fn))
 
+    def test_bind(self):
+        fn = collation.Function(fn1)
+        self.assertEqual(fn.bind(None), fn)
+
     def test_signature(self):
         fn = collation.Function(fn1)
         self.assertEqual('(name, age)', fn.signature)
@@ -184,6 +252,23 @@ class TestMethod(unittest.TestCase):
         self.assertLess(collation.Method(Person.run), method)
         self.assertEqual(hash(method), hash(Person.walk))
 
+    def test_bind(self):
+        cls = collation.Class(Person)
+        method = collation.Method(Person.walk)
+        cls += method
+        cls(parent='Jane')
+        inst = Person()
+        bound = method.bind(inst)
+        self.assertTrue(isinstance(bound, collation.Bound))
+        self.assertEqual(bound.inst, inst)
+        self.assertEqual(bound.container, cls)
+        self.assertEqual(bound.name, method.name)
+        self.assertEqual(method.inst, cls.inst)
+        self.assertNotEqual(method.inst, inst)
+        with mock.patch.object(method, 'impl') as impl:
+            method.bind(inst)(speed=20)
+            impl.assert_called_once_with(inst, speed=20)
+
     def test_signature(self):
         method = collation.Method(Person.walk)
         self.assertEqual('(self, speed=10)', method.signature)
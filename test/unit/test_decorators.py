@@ -14,9 +14,9 @@ from unittest import TestCase
 from mock import patch, Mock
 
 from gofer import NAME
-from gofer.decorators import options, remote, direct, fork, action
+from gofer.decorators import options, remote, direct, fork, worker, cached, action
 from gofer.decorators import load, unload, initializer
-from gofer.decorators import DIRECT, FORK
+from gofer.decorators import DIRECT, FORK, WORKER
 
 
 class Function(object):
@@ -100,6 +100,36 @@ class TestFork(TestCase):
                 }))
 
 
+class TestWorker(TestCase):
+
+    def test_call(self):
+        def fn(): pass
+        worker(fn)
+        opt = getattr(fn, NAME)
+        self.assertEqual(
+            str(opt),
+            str({
+                'call': {'model': WORKER}
+                }))
+
+
+class TestCached(TestCase):
+
+    def test_call(self):
+        class Thing(object):
+            pass
+        cached(Thing)
+        opt = getattr(Thing, NAME)
+        self.assertEqual(opt.cached, 100)
+
+    def test_size(self):
+        class Thing(object):
+            pass
+        cached(size=10)(Thing)
+        opt = getattr(Thing, NAME)
+        self.assertEqual(opt.cached, 10)
+
+
 class TestAction(TestCase):
 
     @patch('gofer.decorators.Actions')
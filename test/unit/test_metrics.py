@@ -13,9 +13,9 @@ from sys import getsizeof
 from unittest import TestCase
 from datetime import datetime
 
-from mock import patch
+from mock import patch, Mock
 
-from gofer.metrics import Timer, Memory
+from gofer.metrics import Timer, Memory, Usage
 from gofer.metrics import timestamp
 
 
@@ -87,6 +87,48 @@ class TestTimer(TestCase):
         self.assertTrue(t.stopped > 0)
 
 
+class TestUsage(TestCase):
+
+    def test_init(self):
+        usage = Usage()
+        self.assertEqual(
+            usage.dict(),
+            dict(
+                wall=0,
+                utime=0.0,
+                stime=0.0,
+                maxrss=0,
+                nvcsw=0,
+                nivcsw=0))
+
+    def test_init_rusage(self):
+        rusage = Mock(
+            ru_utime=1.5,
+            ru_stime=0.5,
+            ru_maxrss=1024,
+            ru_nvcsw=10,
+            ru_nivcsw=2)
+        usage = Usage(rusage, 3.0)
+        self.assertEqual(usage.wall, 3.0)
+        self.assertEqual(usage.utime, rusage.ru_utime)
+        self.assertEqual(usage.stime, rusage.ru_stime)
+        self.assertEqual(usage.maxrss, rusage.ru_maxrss)
+        self.assertEqual(usage.nvcsw, rusage.ru_nvcsw)
+        self.assertEqual(usage.nivcsw, rusage.ru_nivcsw)
+
+    def test_str(self):
+        rusage = Mock(
+            ru_utime=1.5,
+            ru_stime=0.5,
+            ru_maxrss=1024,
+            ru_nvcsw=10,
+            ru_nivcsw=2)
+        usage = Usage(rusage, 3.0)
+        self.assertEqual(
+            str(usage),
+            'wall=3.000 user=1.500 sys=0.500 maxrss=1024 kB csw=10/2')
+
+
 class TestMemory(TestCase):
 
     def test_sizeof_string(self):
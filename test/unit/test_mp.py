@@ -17,7 +17,7 @@ from unittest import TestCase
 
 from mock import Mock, patch
 
-from gofer.mp import Process, Pipe, Endpoint, Reader, Writer, PipeBroken
+from gofer.mp import Process, Pipe, Endpoint, Reader, Writer, PipeBroken, freeze
 from gofer.mp import EPOLLIN, EPOLLHUP
 
 
@@ -37,6 +37,26 @@ class Thing(object):
         return not self.__eq__(other)
 
 
+class TestFreeze(TestCase):
+
+    def tearDown(self):
+        Process.collect = True
+
+    @patch(MODULE + '.gc')
+    def test_freeze(self, gc):
+        freeze()
+        gc.collect.assert_called_once_with()
+        gc.freeze.assert_called_once_with()
+        self.assertFalse(Process.collect)
+
+    @patch(MODULE + '.gc')
+    def test_freeze_not_supported(self, gc):
+        gc.freeze.side_effect = AttributeError
+        freeze()
+        gc.collect.assert_called_once_with()
+        self.assertFalse(Process.collect)
+
+
 class TestProcess(TestCase):
 
     def test_init(self):
@@ -65,6 +85,35 @@ class TestProcess(TestCase):
         fork.assert_called_once_with()
         run.assert_called_once_with()
 
+    @patch(MODULE + '.gc')
+    @patch('os.fork')
+    @patch(MODULE + '.Process.run')
+    def test_start_child_no_collect(self, run, fork, gc):
+        fork.return_value = 0
+        p = Process(Mock())
+        p.collect = False
+
+        # test
+        p.start()
+
+        # validation
+        gc.disable.assert_called_once_with()
+        run.assert_called_once_with()
+
+    @patch(MODULE + '.gc')
+    @patch('os.fork')
+    @patch(MODULE + '.Process.run')
+    def test_start_parent_no_collect(self, run, fork, gc):
+        fork.return_value = 1234
+        p = Process(Mock())
+        p.collect = False
+
+        # test
+        p.start()
+
+        # validation
+        self.assertFalse(gc.disable.called)
+
     @patch('os.fork')
     @patch(MODULE + '.Process.run')
     def test_start_parent(self, run, fork):
@@ -104,13 +153,16 @@ class TestProcess(TestCase):
         p.terminate()
         self.assertFalse(kill.called)
 
-    @patch('os.waitpid')
+    @patch('os.wait4')
     def test_wait(self, wait):
+        wait.return_value = (1234, 0, Mock())
         p = Process(Mock())
-        p.wait()
+        retval = p.wait()
         wait.assert_called_once_with(p.pid, 0)
+        self.assertEqual(retval, (1234, 0))
+        self.assertEqual(p.rusage, wait.return_value[2])
 
-    @patch('os.waitpid')
+    @patch('os.wait4')
     def test_wait_error(self, wait):
         wait.side_effect = OSError()
         p = Process(Mock())
@@ -239,8 +291,27 @@ class TestReader(TestCase):
     def test_poll(self, epoll):
         fd = 1234
         r = Reader(fd)
-        r.poll()
-        epoll.return_value.poll.assert_called_once_with()
+        epoll.return_value.poll.return_value = [(fd, 1)]
+
+        # test
+        ready = r.poll()
+
+        # validation
+        epoll.return_value.poll.assert_called_once_with(-1)
+        self.assertTrue(ready)
+
+    @patch(MODULE + '.epoll')
+    def test_poll_timeout(self, epoll):
+        fd = 1234
+        r = Reader(fd)
+        epoll.return_value.poll.return_value = []
+
+        # test
+        ready = r.poll(0.5)
+
+        # validation
+        epoll.return_value.poll.assert_called_once_with(0.5)
+        self.assertFalse(ready)
 
 
 class TestWriter(TestCase):